@@ -0,0 +1,150 @@
+"""Benchmarks consolidating pos tagged words with the comprehension that
+rescanned every tagged word for each unique word, against the single pass
+Consolidation now makes, from a thousand to a million tagged words.
+
+Run from the repository root:
+
+    PYTHONPATH=nalapi python benchmarks/consolidation.py
+"""
+import argparse
+import random
+import time
+
+from action.abstract_action import AbstractAction
+from action.consolidation import Consolidation
+
+
+TAGS = ['NN', 'NNS', 'NNP', 'VB', 'VBD', 'VBZ', 'JJ', 'RB', 'DT', 'IN']
+
+
+def gather_tagged_words(size):
+    """Gathers the given number of tagged words, drawn so the number of
+    unique words grows with it, as it does in real texts.
+
+    :param size: The number of tagged words.
+    :type size: int
+    :return: The tagged words.
+    :rtype: list
+    """
+
+    generator = random.Random(size)
+
+    return [
+        (f'word{int(generator.paretovariate(0.8))}', generator.choice(TAGS))
+        for index
+        in range(size)
+    ]
+
+
+def consolidate_before(tagged_words):
+    """Consolidates the given tagged words as Consolidation used to.
+
+    :param tagged_words: The tagged words to consolidate.
+    :type tagged_words: list
+    :return: The tags of each word.
+    :rtype: dict
+    """
+
+    unique_items = list(dict.fromkeys([
+        first
+        for first, second
+        in tagged_words
+    ]))
+
+    consolidated_content = {
+        unique_item: list(dict.fromkeys([
+            second
+            for first, second
+            in tagged_words
+            if unique_item == first
+        ]))
+        for unique_item
+        in unique_items
+    }
+
+    return dict(sorted(
+        consolidated_content.items(),
+        key=lambda kv: len(kv[1]),
+        reverse=True))
+
+
+def measure(consolidate, tagged_words):
+    """Measures the seconds the given function takes to consolidate the
+    given tagged words.
+
+    :param consolidate: The consolidating function.
+    :type consolidate: function
+    :param tagged_words: The tagged words to consolidate.
+    :type tagged_words: list
+    :return: The consolidated words, and the seconds taken.
+    :rtype: dict, float
+    """
+
+    start = time.perf_counter()
+
+    consolidated = consolidate(tagged_words)
+
+    return consolidated, time.perf_counter() - start
+
+
+def main():
+    """The main method, prints the time consolidating takes before and
+    after for each number of tagged words.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+
+    arg_parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 100000, 1000000],
+        help='The numbers of tagged words to measure.')
+
+    arg_parser.add_argument(
+        '--before-limit',
+        type=int,
+        default=10000,
+        help='The largest number of tagged words to measure before for, ' +
+        'as it grows quadratically.')
+
+    args = arg_parser.parse_args()
+
+    consolidation = Consolidation()
+
+    print(
+        f'{"words":>8} {"unique":>8} {"before s":>10} {"after s":>10} ' +
+        f'{"after ns/word":>14}')
+
+    for size in args.sizes:
+
+        tagged_words = gather_tagged_words(size)
+
+        content = {
+            AbstractAction.ACTION: 'WordPosTagging',
+            AbstractAction.RESULT: tagged_words,
+            AbstractAction.HISTORY: []}
+
+        after, after_seconds = measure(
+            lambda tagged_words: consolidation.apply(tagged_words)[
+                AbstractAction.RESULT],
+            content)
+
+        before_column = '-'
+
+        if size <= args.before_limit:
+
+            before, before_seconds = measure(consolidate_before, tagged_words)
+
+            assert before == after
+
+            before_column = f'{before_seconds:.3f}'
+
+        print(
+            f'{size:>8} {len(after):>8} {before_column:>10} ' +
+            f'{after_seconds:>10.3f} {after_seconds / size * 1e9:>14.0f}')
+
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,127 @@
+"""Benchmarks pos tagging with a tagger built for each request, as
+nltk.pos_tag does in older NLTK releases, against the tagger
+WordPosTagging keeps loaded, at several text sizes.
+
+Run from the repository root:
+
+    PYTHONPATH=nalapi python benchmarks/pos_tagging.py
+"""
+import argparse
+import time
+
+import nltk
+
+from action.word_extraction import WordExtraction
+from action.word_pos_tagging import WordPosTagging
+
+
+SENTENCES = [
+    'Check back tomorrow; I will see if the book has arrived.',
+    'A purple pig and a green donkey flew a kite in the middle of the ' +
+    'night and ended up sunburnt.',
+    'She always speaks to him in a loud voice.',
+    'She works two jobs to make ends meet; at least, that was her reason ' +
+    'for not having time to join us.',
+    'My Mum tries to be cool by saying that she likes all the same things ' +
+    'that I do.',
+    'I am never at home on Sundays.'
+]
+
+
+def gather_text(size):
+    """Gathers a text of about the given number of characters.
+
+    :param size: The number of characters.
+    :type size: int
+    :return: The text.
+    :rtype: str
+    """
+
+    sentences = []
+
+    length = 0
+
+    while length < size:
+
+        sentence = SENTENCES[len(sentences) % len(SENTENCES)]
+
+        sentences.append(sentence)
+
+        length += len(sentence) + 1
+
+    return ' '.join(sentences)
+
+
+def measure(tag, words, duration):
+    """Measures the number of requests per second the given tagging
+    function serves.
+
+    :param tag: The tagging function.
+    :type tag: function
+    :param words: The words to tag for each request.
+    :type words: dict
+    :param duration: The number of seconds to measure for.
+    :type duration: float
+    :return: The number of requests per second.
+    :rtype: float
+    """
+
+    requests = 0
+
+    start = time.perf_counter()
+
+    while time.perf_counter() - start < duration:
+
+        tag(words)
+
+        requests += 1
+
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    """The main method, prints requests per second before and after for
+    each text size.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+
+    arg_parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[100, 1000, 10000, 100000],
+        help='The text sizes to measure, in characters.')
+
+    arg_parser.add_argument(
+        '--duration',
+        type=float,
+        default=2.0,
+        help='The number of seconds to measure each case for.')
+
+    args = arg_parser.parse_args()
+
+    word_extraction = WordExtraction()
+
+    word_pos_tagging = WordPosTagging()
+
+    print(f'{"chars":>8} {"before req/s":>14} {"after req/s":>14}')
+
+    for size in args.sizes:
+
+        words = word_extraction.apply(gather_text(size))
+
+        before = measure(
+            lambda words: nltk.tag.PerceptronTagger().tag(
+                words[WordExtraction.RESULT]),
+            words,
+            args.duration)
+
+        after = measure(word_pos_tagging.apply, words, args.duration)
+
+        print(f'{size:>8} {before:>14.1f} {after:>14.1f}')
+
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,174 @@
+"""Benchmarks encoding the response of a pos call as indented json, as
+nalapi used to, against compact json, orjson, MessagePack and gzip at
+several levels, at several text sizes.
+
+Run from the repository root:
+
+    PYTHONPATH=nalapi python benchmarks/response_formats.py
+"""
+import argparse
+import gzip
+import json
+import time
+
+from action.word_extraction import WordExtraction
+from action.word_pos_tagging import WordPosTagging
+from action.token_stream import TokenStream
+from pos_tagging import gather_text
+import response_encoding
+
+
+def encode_value(value):
+    """Encodes the TokenStream values json doesn't know about, as nalapi
+    does.
+
+    :param value: The value to encode.
+    :type value: *
+    :return: The value, as a list.
+    :rtype: list
+    """
+
+    if isinstance(value, TokenStream):
+
+        return list(value)
+
+    raise TypeError(f'{type(value).__name__} isn\'t serializable.')
+
+
+def gather_encoders():
+    """Gathers the encoders to measure, those whose module is installed.
+
+    :return: The name of each encoder, and the function encoding content
+                with it.
+    :rtype: list
+    """
+
+    encoders = [
+        (
+            'json indent=4',
+            lambda content: json.dumps(
+                content, indent=4, default=encode_value).encode('utf-8')
+        ),
+        (
+            'json compact',
+            lambda content: json.dumps(
+                content,
+                separators=(',', ':'),
+                default=encode_value).encode('utf-8')
+        )
+    ]
+
+    if response_encoding.orjson is not None:
+
+        encoders.append((
+            'orjson',
+            lambda content: response_encoding.encode(
+                content, response_encoding.JSON, encode_value)
+        ))
+
+    if response_encoding.msgpack is not None:
+
+        encoders.append((
+            'msgpack',
+            lambda content: response_encoding.encode(
+                content, response_encoding.MSGPACK, encode_value)
+        ))
+
+    return encoders
+
+
+def measure(function, value, repeat):
+    """Measures the seconds the given function takes on the given value, the
+    best of several runs.
+
+    :param function: The function.
+    :type function: function
+    :param value: The value to call it with.
+    :type value: *
+    :param repeat: The number of runs.
+    :type repeat: int
+    :return: What the function returns, and the seconds taken.
+    :rtype: *, float
+    """
+
+    best = None
+
+    for run in range(repeat):
+
+        start = time.perf_counter()
+
+        result = function(value)
+
+        seconds = time.perf_counter() - start
+
+        best = seconds if best is None else min(best, seconds)
+
+    return result, best
+
+
+def main():
+    """The main method, prints the size of the response and the time taken
+    to encode it with each encoder, then to compress the compact json with
+    each gzip level, for each text size.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+
+    arg_parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[10000, 100000, 1000000],
+        help='The text sizes to measure, in characters.')
+
+    arg_parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='The number of runs measured, the best one kept.')
+
+    args = arg_parser.parse_args()
+
+    word_extraction = WordExtraction()
+
+    word_pos_tagging = WordPosTagging()
+
+    encoders = gather_encoders()
+
+    print(f'{"chars":>8} {"encoding":<16} {"KiB":>10} {"ms":>10}')
+
+    for size in args.sizes:
+
+        text = gather_text(size)
+
+        content = word_pos_tagging.apply(word_extraction.apply(text))
+
+        content['original'] = text
+
+        compact = None
+
+        for name, encoder in encoders:
+
+            body, seconds = measure(encoder, content, args.repeat)
+
+            compact = body if name != 'json indent=4' else compact
+
+            print(
+                f'{size:>8} {name:<16} {len(body) / 2**10:>10.1f} ' +
+                f'{seconds * 1e3:>10.1f}')
+
+        for level in [1, 6, 9]:
+
+            body, seconds = measure(
+                lambda body: gzip.compress(body, compresslevel=level),
+                compact,
+                args.repeat)
+
+            print(
+                f'{size:>8} {"+ gzip " + str(level):<16} ' +
+                f'{len(body) / 2**10:>10.1f} {seconds * 1e3:>10.1f}')
+
+
+if __name__ == '__main__':
+
+    main()
@@ -0,0 +1,84 @@
+"""Benchmarks the startup time and resident memory of nalapi for several
+sets of enabled actions, each started in a fresh process.
+
+Run from the repository root:
+
+    PYTHONPATH=nalapi python benchmarks/startup.py
+"""
+import argparse
+import subprocess
+import sys
+
+
+"""Started in a fresh process, prints the seconds taken to import nalapi,
+load the given actions and warm up, then the peak resident memory in
+KiB."""
+STARTUP = '''
+import time
+started = time.perf_counter()
+import resource
+import sys
+from nalapi.nalapi import nalapi
+app = nalapi(actions=sys.argv[1].split(','))
+app.warm_up()
+print(time.perf_counter() - started)
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+ACTION_SETS = [
+    'snt,word',
+    'snt,word,pos',
+    'snt,word,pos,ne,phrs',
+    'snt,word,pos,phrs,ne,freq,unq,rev,cnsl,sntmnt'
+]
+
+
+def measure(action_set):
+    """Measures the startup of nalapi with the given actions enabled.
+
+    :param action_set: The comma separated names of the actions.
+    :type action_set: str
+    :return: The startup time in seconds, and peak resident memory in MiB.
+    :rtype: float, float
+    """
+
+    output = subprocess.run(
+        [sys.executable, '-c', STARTUP, action_set],
+        check=True,
+        capture_output=True,
+        text=True).stdout.split()
+
+    return float(output[0]), int(output[1]) / 2**10
+
+
+def main():
+    """The main method, prints the startup time and resident memory of each
+    set of actions, the best of several runs.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+
+    arg_parser.add_argument(
+        '--runs',
+        type=int,
+        default=5,
+        help='The number of runs for each set of actions.')
+
+    args = arg_parser.parse_args()
+
+    print(f'{"seconds":>8} {"MiB":>8}  actions')
+
+    for action_set in ACTION_SETS:
+
+        results = [measure(action_set) for run in range(args.runs)]
+
+        seconds = min(seconds for seconds, mib in results)
+
+        mib = min(mib for seconds, mib in results)
+
+        print(f'{seconds:>8.3f} {mib:>8.1f}  {action_set}')
+
+
+if __name__ == '__main__':
+
+    main()
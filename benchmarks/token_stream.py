@@ -0,0 +1,142 @@
+"""Benchmarks the memory taken by the words and pos tags of a text kept as
+lists of strings and tuples, against the TokenStream WordExtraction and
+WordPosTagging now produce, at several text sizes.
+
+Run from the repository root:
+
+    PYTHONPATH=nalapi python benchmarks/token_stream.py
+"""
+import argparse
+import tracemalloc
+
+import nltk
+
+from action.abstract_action import AbstractAction
+from action.word_extraction import WordExtraction
+from action.word_pos_tagging import WordPosTagging
+from pos_tagging import gather_text
+
+
+def measure(build):
+    """Measures the memory taken by what the given function builds.
+
+    :param build: The function building the value to measure.
+    :type build: function
+    :return: The value, and the number of bytes it takes.
+    :rtype: *, int
+    """
+
+    tracemalloc.start()
+
+    value = build()
+
+    size = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+
+    return value, size
+
+
+def list_words_and_tags(word_pos_tagging, text):
+    """Extracts and pos tags the words of the given text into lists of
+    strings and tuples, as WordExtraction and WordPosTagging used to.
+
+    :param word_pos_tagging: The action whose tagger tags the words.
+    :type word_pos_tagging: WordPosTagging
+    :param text: The text to extract words from.
+    :type text: str
+    :return: The words, and the pos tagged words.
+    :rtype: list, list
+    """
+
+    words = nltk.word_tokenize(text)
+
+    sentences = [[]]
+
+    for word in words:
+
+        sentences[-1].append(word)
+
+        if word in WordPosTagging.SENTENCE_ENDS:
+
+            sentences.append([])
+
+    tagged_words = [
+        tagged_word
+        for tagged_sentence
+        in word_pos_tagging.tagger.tag_sents(sentences)
+        for tagged_word
+        in tagged_sentence
+    ]
+
+    return words, tagged_words
+
+
+def stream_words_and_tags(word_extraction, word_pos_tagging, text):
+    """Extracts and pos tags the words of the given text into the
+    TokenStream each action produces.
+
+    :param word_extraction: The action extracting the words.
+    :type word_extraction: WordExtraction
+    :param word_pos_tagging: The action tagging the words.
+    :type word_pos_tagging: WordPosTagging
+    :param text: The text to extract words from.
+    :type text: str
+    :return: The words, and the pos tagged words.
+    :rtype: TokenStream, TokenStream
+    """
+
+    words = word_extraction.apply(text)
+
+    tagged_words = word_pos_tagging.apply(words)
+
+    return words[AbstractAction.RESULT], tagged_words[AbstractAction.RESULT]
+
+
+def main():
+    """The main method, prints the memory taken by the words and pos tags
+    before and after for each text size, in KiB.
+    """
+
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+
+    arg_parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[1000, 10000, 100000],
+        help='The text sizes to measure, in characters.')
+
+    args = arg_parser.parse_args()
+
+    word_extraction = WordExtraction()
+
+    word_pos_tagging = WordPosTagging()
+
+    print(f'{"chars":>8} {"lists KiB":>10} {"streams KiB":>12}')
+
+    for size in args.sizes:
+
+        text = gather_text(size)
+
+        word_pos_tagging.apply(word_extraction.apply(text))
+
+        lists, lists_size = measure(
+            lambda: list_words_and_tags(word_pos_tagging, text))
+
+        streams, streams_size = measure(
+            lambda: stream_words_and_tags(
+                word_extraction,
+                word_pos_tagging,
+                text))
+
+        assert lists == streams
+
+        print(
+            f'{size:>8} {lists_size / 2**10:>10.1f} ' +
+            f'{streams_size / 2**10:>12.1f}')
+
+
+if __name__ == '__main__':
+
+    main()
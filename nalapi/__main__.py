@@ -1,8 +1,24 @@
 """The entrypoint for starting nalapi."""
+import time
+
+# Taken first, so the startup time reported includes the imports.
+STARTED = time.perf_counter()
+
 import argparse
+import gc
 import logging
+import os
 import sys
 
+try:
+
+    import resource
+
+except ImportError:
+
+    # Not available on Windows, resident memory isn't reported there.
+    resource = None
+
 # Is there a better way to do this?
 try:
 
@@ -15,11 +31,112 @@ except ImportError as e:
     from nalapi import nalapi
 
 
+def positive_int(value):
+    """Parses a command line argument which must be a positive integer.
+
+    :param value: The argument provided by the user.
+    :type value: str
+    :return: The parsed argument.
+    :rtype: int
+    """
+
+    try:
+
+        number = int(value)
+
+    except ValueError:
+
+        number = 0
+
+    if number < 1:
+
+        raise argparse.ArgumentTypeError(
+            f'{value} isn\'t a positive integer.')
+
+    return number
+
+
+def non_negative_int(value):
+    """Parses a command line argument which must be a non-negative integer.
+
+    :param value: The argument provided by the user.
+    :type value: str
+    :return: The parsed argument.
+    :rtype: int
+    """
+
+    try:
+
+        number = int(value)
+
+    except ValueError:
+
+        number = -1
+
+    if number < 0:
+
+        raise argparse.ArgumentTypeError(
+            f'{value} isn\'t a non-negative integer.')
+
+    return number
+
+
+def process_count(value):
+    """Parses the number of worker processes, 'auto' being one per cpu.
+
+    :param value: The argument provided by the user.
+    :type value: str
+    :return: The parsed argument, None for one per cpu.
+    :rtype: int
+    """
+
+    return None if value == 'auto' else non_negative_int(value)
+
+
+def action_names(value):
+    """Parses a comma separated list of action names.
+
+    :param value: The argument provided by the user.
+    :type value: str
+    :return: The parsed argument.
+    :rtype: list
+    """
+
+    names = [name.strip() for name in value.split(',') if name.strip()]
+
+    unknown_names = [name for name in names if name not in nalapi.ACTIONS]
+
+    if not names or unknown_names:
+
+        raise argparse.ArgumentTypeError(
+            f'{value} isn\'t a list of actions among ' +
+            f'{", ".join(nalapi.ACTIONS)}.')
+
+    return names
+
+
+def gather_resident_memory():
+    """Gathers the peak resident memory of this process.
+
+    :return: The peak resident memory, in MiB, None if unknown.
+    :rtype: float
+    """
+
+    if resource is None:
+
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # In KiB on Linux, in bytes on macOS.
+    return max_rss / (2**20 if sys.platform == 'darwin' else 2**10)
+
+
 def gather_args():
     """Gathers and returns the command line arguments via argparse.
 
-    :return: The host and port provided by the user.
-    :rtype: str, int
+    :return: The arguments provided by the user.
+    :rtype: argparse.Namespace
     """
 
     logging.debug('Gathering command line args.')
@@ -47,9 +164,128 @@ def gather_args():
         default=False,
         help='Whether or not to provide verbose logging output when running nalapi.')
 
-    args = arg_parser.parse_args()
+    arg_parser.add_argument(
+        '-s',
+        '--server',
+        choices=['wsgiref', 'gunicorn'],
+        default='wsgiref',
+        help='The server to run nalapi with. wsgiref is Bottle\'s ' +
+        'single-threaded debug server, gunicorn a pre-fork pool of ' +
+        'workers sharing models loaded once. Defaults to wsgiref.')
+
+    arg_parser.add_argument(
+        '-w',
+        '--workers',
+        type=positive_int,
+        default=os.cpu_count(),
+        help='The number of worker processes the gunicorn server forks. ' +
+        'Defaults to the number of cpus.')
+
+    arg_parser.add_argument(
+        '-t',
+        '--threads',
+        type=positive_int,
+        default=1,
+        help='The number of threads each gunicorn worker serves requests ' +
+        'with. Defaults to 1.')
+
+    arg_parser.add_argument(
+        '--keep-alive',
+        type=non_negative_int,
+        default=5,
+        help='The number of seconds the gunicorn server waits for requests ' +
+        'on a keep-alive connection. Defaults to 5.')
+
+    arg_parser.add_argument(
+        '-p',
+        '--processes',
+        type=process_count,
+        default=0,
+        help='The number of worker processes each server process applies ' +
+        'actions in, so CPU-bound chains aren\'t held back by the GIL, or ' +
+        'auto for one per cpu. With gunicorn, each of its workers gets ' +
+        'its own. Defaults to 0, applying them in the thread serving ' +
+        'the request.')
+
+    arg_parser.add_argument(
+        '--max-tasks-per-child',
+        type=positive_int,
+        default=None,
+        help='The number of chains a worker process applies before being ' +
+        'replaced by a fresh one. Defaults to never replacing them.')
+
+    arg_parser.add_argument(
+        '--inline-threshold',
+        type=non_negative_int,
+        default=1000,
+        help='Texts shorter than this many characters are processed in the ' +
+        'thread serving the request, rather than in a worker process. ' +
+        'Defaults to 1000.')
+
+    arg_parser.add_argument(
+        '--shard-size',
+        type=positive_int,
+        default=None,
+        help='Texts longer than this many characters are split into shards ' +
+        'of whole sentences, processed in parallel by the worker ' +
+        'processes. Only used with --processes. Defaults to never ' +
+        'splitting them.')
+
+    arg_parser.add_argument(
+        '--cache-size',
+        type=non_negative_int,
+        default=64 * 2**20,
+        help='The number of bytes the results cached for repeated ' +
+        'payloads may take at most, in each server process. 0 disables ' +
+        'the cache. Defaults to 64 MiB.')
+
+    arg_parser.add_argument(
+        '--cache-ttl',
+        type=positive_int,
+        default=300,
+        help='The number of seconds a result stays cached. Defaults to 300.')
+
+    arg_parser.add_argument(
+        '--stage-cache-size',
+        type=non_negative_int,
+        default=32 * 2**20,
+        help='The number of bytes the intermediate stages memoized for ' +
+        'later chains on the same text, e.g. its words or pos tags, may ' +
+        'take at most, in each server process. 0 disables memoizing. ' +
+        'Defaults to 32 MiB.')
+
+    arg_parser.add_argument(
+        '--stage-cache-ttl',
+        type=positive_int,
+        default=60,
+        help='The number of seconds a stage stays memoized. Defaults to 60.')
+
+    arg_parser.add_argument(
+        '--max-body-size',
+        type=positive_int,
+        default=32 * 2**20,
+        help='The number of bytes a request body may take at most, both as ' +
+        'sent and once decompressed, or each line of a stream may take. ' +
+        'Bodies over 1 MiB are spooled to a temporary file while read. ' +
+        'Defaults to 32 MiB.')
+
+    arg_parser.add_argument(
+        '--compress-size',
+        type=non_negative_int,
+        default=1024,
+        help='Responses of at least this many bytes are compressed with ' +
+        'gzip for requests accepting it. Defaults to 1024.')
+
+    arg_parser.add_argument(
+        '-a',
+        '--actions',
+        type=action_names,
+        default=os.environ.get('NALAPI_ACTIONS') or None,
+        help='The comma separated names of the actions to enable, e.g. ' +
+        'snt,word. Only their modules and models are loaded. Defaults to ' +
+        'the NALAPI_ACTIONS environment variable, or every action.')
 
-    return args.host, args.port, args.verbose
+    return arg_parser.parse_args()
 
 
 def main():
@@ -57,17 +293,87 @@ def main():
     """
     logging.debug('Entering main method')
 
-    host, port, is_verbose = gather_args()
+    args = gather_args()
 
-    logging_level = logging.INFO if not is_verbose else logging.DEBUG
+    logging_level = logging.INFO if not args.verbose else logging.DEBUG
 
     logging.basicConfig(level=logging_level)
 
-    nalapiServer = nalapi()
+    # The debug messages logged above already configured the root logger,
+    # with the default level, which basicConfig then leaves alone.
+    logging.getLogger().setLevel(logging_level)
+
+    start = time.perf_counter()
+
+    # Constructing nalapi loads every model, ahead of any fork.
+    nalapiServer = nalapi(
+        processes=args.processes,
+        max_tasks_per_child=args.max_tasks_per_child,
+        inline_threshold=args.inline_threshold,
+        shard_size=args.shard_size,
+        cache_size=args.cache_size,
+        cache_ttl=args.cache_ttl,
+        stage_cache_size=args.stage_cache_size,
+        stage_cache_ttl=args.stage_cache_ttl,
+        actions=args.actions,
+        max_body_size=args.max_body_size,
+        compress_size=args.compress_size)
+
+    logging.info(f'Loaded the models in {time.perf_counter() - start:.3f}s')
+
+    if not nalapiServer.warm_up():
+
+        logging.error('Not ready, /ready will keep answering 503.')
+
+    resident_memory = gather_resident_memory()
+
+    logging.info(
+        f'Started in {time.perf_counter() - STARTED:.3f}s' +
+        (
+            f', using {resident_memory:.1f} MiB'
+            if resident_memory is not None
+            else ''
+        ))
+
+    logging.debug(
+        f'Starting nalapi with params: [HOST: {args.host}, PORT: {args.port}, ' +
+        f'SERVER: {args.server}]')
+
+    if args.server == 'gunicorn' and args.processes != 0:
+
+        total_processes = args.workers * (args.processes or os.cpu_count())
+
+        if total_processes > os.cpu_count():
+
+            logging.warning(
+                f'{args.workers} gunicorn workers each applying actions in ' +
+                f'their own worker processes make {total_processes} ' +
+                f'processes, for {os.cpu_count()} cpus.')
+
+    if args.server == 'gunicorn':
+
+        # Moving the loaded models out of the garbage collector's reach
+        # keeps its passes from writing to their pages, which would copy
+        # them into every worker.
+        gc.collect()
+
+        gc.freeze()
+
+        nalapiServer.run(
+            host=args.host,
+            port=args.port,
+            server=args.server,
+            workers=args.workers,
+            worker_class='gthread',
+            threads=args.threads,
+            keepalive=args.keep_alive,
+            post_fork=lambda server, worker: nalapiServer.start_workers())
+
+    else:
 
-    logging.debug('Starting nalapi with params: [HOST: {host}, PORT: {port}]')
+        nalapiServer.start_workers()
 
-    nalapiServer.run(host=host, port=port, debug=True)
+        nalapiServer.run(host=args.host, port=args.port, debug=True)
 
 
 if __name__ == "__main__":
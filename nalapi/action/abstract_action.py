@@ -1,6 +1,10 @@
 """Abstract action base class."""
 from abc import ABC
 from abc import abstractmethod
+import logging
+import time
+
+from action.token_stream import TokenStream
 
 
 class AbstractAction(ABC):
@@ -11,14 +15,60 @@ class AbstractAction(ABC):
     HISTORY = 'history'
     RESULT = 'result'
 
+    # The type of content a request starts from.
+    TEXT_TYPE = 'text'
+
+    # The types of content this action accepts, and the type it produces,
+    # so chains can be checked before anything is applied.
+    INPUT_TYPES = ()
+    OUTPUT_TYPE = None
+
+    # Whether applying this action to consecutive runs of sentences, and
+    # joining the results, gives the result of applying it to the whole text.
+    SENTENCE_LOCAL = False
+
+    # Whether the content this action produces is worth memoizing, for
+    # later chains starting with the same actions to resume from.
+    MEMOIZED = False
+
+    # The names of the request options this action reads from the context.
+    OPTIONS = ()
+
+    # Whether the results this action produces for several texts can be
+    # reduced into a single result for all of them, with reduce.
+    REDUCIBLE = False
+
+    # Whether the results this action produces can be laid out in columns,
+    # one list per field, with columns.
+    COLUMNAR = False
+
     def __init__(self, name, description):
         """Constructor"""
 
-        self.name = name
+        self.__name = name
 
-        self.description = description
+        self.__description = description
 
-        self.outcome = self.SUCCESS
+        # Loading here, rather than on first use, means applying this
+        # action never changes it, so concurrent requests can share it.
+        start = time.perf_counter()
+
+        self.load()
+
+        logging.info(
+            f'Loaded {name} in {time.perf_counter() - start:.3f}s')
+
+    @property
+    def name(self):
+        """The url path section this action is applied for. E.g. 'word'"""
+
+        return self.__name
+
+    @property
+    def description(self):
+        """A short description of this action."""
+
+        return self.__description
 
     @abstractmethod
     def validate_content(self, content):
@@ -55,17 +105,140 @@ class AbstractAction(ABC):
 
         return content[self.RESULT] if isinstance(content, dict) else content
 
+    @staticmethod
+    def split_into_sentences(result):
+        """Determines whether the given result holds a list of tokens for
+        each sentence, as produced from the output of SentenceExtraction,
+        rather than a single list of tokens.
+
+        :param result: The result to review.
+        :type result: list
+        :return: True if the result holds a list of tokens for each sentence.
+        :rtype: bool
+        """
+
+        return bool(result) and isinstance(result[0], (list, TokenStream))
+
+    @classmethod
+    def flatten(cls, result):
+        """Flattens the given result into a single list of tokens, if it
+        holds a list of tokens for each sentence.
+
+        :param result: The result to flatten.
+        :type result: list
+        :return: The tokens, in order.
+        :rtype: list or TokenStream
+        """
+
+        if cls.split_into_sentences(result):
+
+            if all(isinstance(sentence, TokenStream) for sentence in result):
+
+                return TokenStream.concatenate(result)
+
+            return [token for sentence in result for token in sentence]
+
+        return result
+
+    def load(self):
+        """Loads any model this action relies on, once, when the action is
+        constructed, so it is shared by every request (and every forked
+        worker). Loading defined by sub-class, if needed.
+        """
+
+        pass
+
     @abstractmethod
-    def apply(self, content):
+    def apply(self, content, context=None):
         """Applies this action to the given content.
         Action defined by sub-class.
 
         :param content: The content to apply this action to.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         """
 
         pass
 
+    def partial_options(self, options):
+        """Gathers the options to apply this action with to each of several
+        texts, for their results to be reduced with the given options.
+        Changes defined by sub-class, if needed.
+
+        :param options: The options the request set, by name.
+        :type options: dict
+        :return: The options for each text, by name.
+        :rtype: dict
+        """
+
+        return options
+
+    def reduce(self, results, context=None):
+        """Reduces the given results, produced by this action for several
+        texts, into a single result for all of them.
+        Reduction defined by sub-class, if REDUCIBLE.
+
+        :param results: The results produced for each text, with the
+                    options of partial_options, consumed one at a time.
+        :type results: iterable
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
+        :return: A dict containing this action's name and the result.
+        :rtype: dict
+        :raises ValueError: If this action isn't REDUCIBLE.
+        """
+
+        raise ValueError(f'{self.name} results can\'t be aggregated.')
+
+    def columns(self, result, offsets=False):
+        """Lays out the given result, produced by this action, in columns,
+        one list per field, rather than a pair for each token.
+        Layout defined by sub-class, if COLUMNAR.
+
+        :param result: The result to lay out.
+        :type result: *
+        :param offsets: Whether the offsets in the text each token starts
+                    and ends at are laid out too, where they are known.
+        :type offsets: bool
+        :return: Each column, by name.
+        :rtype: dict
+        :raises ValueError: If this action isn't COLUMNAR.
+        """
+
+        raise ValueError(f'{self.name} results can\'t be laid out in columns.')
+
+    @staticmethod
+    def tabulate(pairs):
+        """Lays out the given (token, tag) pairs in columns, the tags
+        being indexes into a list of tag names.
+
+        :param pairs: The pairs to lay out.
+        :type pairs: iterable
+        :return: The tokens, tags and tag names, by column name.
+        :rtype: dict
+        """
+
+        tokens = []
+
+        tags = []
+
+        indexes = {}
+
+        for token, tag in pairs:
+
+            tokens.append(token)
+
+            tags.append(indexes.setdefault(tag, len(indexes)))
+
+        return {
+            TokenStream.TOKENS: tokens,
+            TokenStream.TAGS: tags,
+            TokenStream.TAG_NAMES: list(indexes)
+        }
+
     @classmethod
     def produced(cls, content):
         """Determines whether the given content was produced by this action.
@@ -82,24 +255,34 @@ class AbstractAction(ABC):
             content[cls.ACTION] == cls.__name__
         )
 
-    def record_outcome(self, new_content, old_content):
+    def record_outcome(self, new_content, old_content, context):
         """Records the outcome of applying this action to the old_content.
 
+        The outcome is kept in the request's context rather than in this
+        action, so a single instance can serve concurrent requests.
+
         :param new_content: The content produced by applying this action; the history to append to.
         :type new_content: dict
         :param old_content: The old content this action was applied to.
         :type old_content: dict
+        :param context: The context of the request this action was applied for.
+        :type context: ExecutionContext
         """
 
-        if isinstance(new_content, dict):
+        if isinstance(old_content, dict):
+
+            history = list(old_content.get(self.HISTORY, []))
+
+        else:
 
-            if isinstance(old_content, dict):
+            history = list(context.history)
+
+        history.append([self.name, context.outcome])
+
+        if isinstance(new_content, dict):
 
-                new_content[self.HISTORY] = old_content[self.HISTORY]
+            new_content[self.HISTORY] = history
 
-            new_content[self.HISTORY].append([self.name, self.outcome])
+        context.history = history
 
-        # Reset outcome since this instance is being used
-        # for future processing in nalapi.
-        # FIXME I really don't like this.
-        self.outcome = self.SUCCESS
+        context.outcome = self.SUCCESS
@@ -2,12 +2,27 @@
 import logging
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
 from action.word_pos_tagging import WordPosTagging
 from action.named_entity_extraction import NamedEntityExtraction
 
 
 class Consolidation(AbstractAction):
 
+    INPUT_TYPES = (
+        NamedEntityExtraction.OUTPUT_TYPE,
+        WordPosTagging.OUTPUT_TYPE
+    )
+    OUTPUT_TYPE = 'consolidated'
+
+    COUNTS = 'counts'
+
+    OPTIONS = (COUNTS,)
+
+    REDUCIBLE = True
+
+    COLUMNAR = True
+
     def __init__(self):
         """Constructor"""
 
@@ -32,52 +47,195 @@ class Consolidation(AbstractAction):
             )
         )
 
-    def apply(self, content):
+    def prepare_content(self, content):
+        """Prepares the content for consolidation.
+
+        :param content: The content to prepare.
+        :type content: dict
+        :return: The prepared content, in this case a list of items, those
+                    given for each sentence being flattened.
+        :rtype: list
+        """
+
+        return self.flatten(super().prepare_content(content))
+
+    @staticmethod
+    def group(items):
+        """Groups the second value of each of the given pairs by their first
+        value, in a single pass.
+
+        :param items: The pairs to group, e.g. (word, tag).
+        :type items: list
+        :return: The number of times each second value was paired with each
+                    first value, the first values with the most distinct
+                    second values first, otherwise in first-seen order.
+        :rtype: dict
+        """
+
+        groups = {}
+
+        for first, second in items:
+
+            counts = groups.get(first)
+
+            if counts is None:
+
+                counts = groups[first] = {}
+
+            counts[second] = counts.get(second, 0) + 1
+
+        return Consolidation.order(groups)
+
+    @staticmethod
+    def order(groups):
+        """Orders the given groups, those with the most distinct values
+        first.
+
+        :param groups: The values of each group.
+        :type groups: dict
+        :return: The groups, ties kept in the order they were given in, as
+                    sorting is stable.
+        :rtype: dict
+        """
+
+        return dict(sorted(
+            groups.items(),
+            key=lambda group: len(group[1]),
+            reverse=True))
+
+    def gather_values(self, groups, context):
+        """Gathers the values of the given groups the request asked for,
+        their counts or a list of them.
+
+        :param groups: The number of times each value was seen in each
+                    group.
+        :type groups: dict
+        :param context: The context of the request this action is applied
+                    for.
+        :type context: ExecutionContext
+        :return: The groups, with the values asked for.
+        :rtype: dict
+        """
+
+        if context.options.get(self.COUNTS):
+
+            return groups
+
+        return {key: list(values) for key, values in groups.items()}
+
+    def columns(self, result, offsets=False):
+        """Lays out the given groups in columns, a row for each value of
+        each group: the keys, e.g. words, the index of each value, e.g. a
+        tag, in the tag names, and each value's count if counted.
+
+        :param result: The values of each group, or their counts.
+        :type result: dict
+        :param offsets: Ignored, groups have no offsets.
+        :type offsets: bool
+        :return: Each column, by name.
+        :rtype: dict
+        """
+
+        columns = self.tabulate(
+            (key, value)
+            for key, values in result.items()
+            for value in values)
+
+        if any(isinstance(values, dict) for values in result.values()):
+
+            columns[self.COUNTS] = [
+                count
+                for values in result.values()
+                for count in values.values()
+            ]
+
+        return columns
+
+    def partial_options(self, options):
+        """Gathers the options to consolidate each of several texts with,
+        always counting values, for the counts of all of them to add up.
+
+        :param options: The options the request set, by name.
+        :type options: dict
+        :return: The options for each text, by name.
+        :rtype: dict
+        """
+
+        return dict(options, **{self.COUNTS: True})
+
+    def reduce(self, results, context=None):
+        """Reduces the content consolidated for several texts into that of
+        all of them, adding up the counts of each value.
+
+        :param results: The counted values of each group, for each text.
+        :type results: iterable
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
+        :return: A dict containing this action's name and the consolidated
+                    content.
+        :rtype: dict
+        """
+
+        if context is None:
+
+            context = ExecutionContext()
+
+        groups = {}
+
+        for result in results:
+
+            for key, counts in result.items():
+
+                group = groups.get(key)
+
+                if group is None:
+
+                    group = groups[key] = {}
+
+                for value, count in counts.items():
+
+                    group[value] = group.get(value, 0) + count
+
+        return {
+            AbstractAction.ACTION: self.__class__.__name__,
+            AbstractAction.RESULT: self.gather_values(
+                self.order(groups),
+                context),
+            AbstractAction.HISTORY: []}
+
+    def apply(self, content, context=None):
         """Applies the consolidation action to the given content.
 
         :param content: The content to consolidate.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and the consolidated
-                    content as a dict, or the provided content if this action
-                    was invalid.
+                    content as a dict, of the number of times each value was
+                    seen if the request asked for counts, or the provided
+                    content if this action was invalid.
         :rtype: dict
         """
 
         logging.info('Consolidating Content.')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         consolidated_content = []
 
         if self.validate_content(content):
 
             prepared_content = self.prepare_content(content)
 
-            unique_items = list(set([
-                first
-                for first, second
-                in prepared_content
-            ]))
-
-            consolidated_content = {
-                unique_item: list(set([
-                    second
-                    for first, second
-                    in prepared_content
-                    if unique_item == first
-                ]))
-                for unique_item
-                in unique_items
-            }
-
-            # Sorting dict based on length of values list
-            tmp = {}
-
-            for key, value in sorted(
-                consolidated_content.items(), key=lambda kv: len(
-                    kv[1]), reverse=True):
-
-                tmp[key] = value
+            consolidated_content = self.group(prepared_content)
 
-            consolidated_content = tmp
+            consolidated_content = self.gather_values(
+                consolidated_content,
+                context)
 
             consolidated_content = {
                 AbstractAction.ACTION: self.__class__.__name__,
@@ -90,8 +248,8 @@ class Consolidation(AbstractAction):
 
             consolidated_content = content
 
-            self.outcome = self.FAILURE
+            context.outcome = self.FAILURE
 
-        self.record_outcome(consolidated_content, content)
+        self.record_outcome(consolidated_content, content, context)
 
         return consolidated_content
@@ -2,11 +2,15 @@
 import logging
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
 from action.consolidation import Consolidation
 
 
 class ContentReversal(AbstractAction):
 
+    INPUT_TYPES = (Consolidation.OUTPUT_TYPE,)
+    OUTPUT_TYPE = 'reversed'
+
     def __init__(self):
         """Constructor"""
 
@@ -26,51 +30,91 @@ class ContentReversal(AbstractAction):
             Consolidation.produced(content)
         )
 
-    def apply(self, content):
+    @staticmethod
+    def counted(consolidated_content):
+        """Determines whether the given consolidated content holds the
+        number of times each value was seen, rather than a list of values.
+
+        :param consolidated_content: The consolidated content to review.
+        :type consolidated_content: dict
+        :return: True if the values are counted.
+        :rtype: bool
+        """
+
+        return any(
+            isinstance(values, dict)
+            for values
+            in consolidated_content.values())
+
+    @staticmethod
+    def invert(consolidated_content):
+        """Builds the inverted index of the given consolidated content, the
+        keys each value was found under, in a single pass.
+
+        :param consolidated_content: The values of each key, as a list or
+                    as the number of times each was seen.
+        :type consolidated_content: dict
+        :return: The number of times each value was seen under each key,
+                    the values found under the most keys first, otherwise
+                    in first-seen order.
+        :rtype: dict
+        """
+
+        inverted_content = {}
+
+        for key, values in consolidated_content.items():
+
+            if not isinstance(values, dict):
+
+                values = dict.fromkeys(values, 1)
+
+            for value, count in values.items():
+
+                keys = inverted_content.get(value)
+
+                if keys is None:
+
+                    keys = inverted_content[value] = {}
+
+                keys[key] = count
+
+        return Consolidation.order(inverted_content)
+
+    def apply(self, content, context=None):
         """Applies the reversal action to the given content.
 
         :param content: The content to reverse.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and the reversed content,
-                    or the provided content if this action was invalid.
+                    counted if the consolidated content was, or the provided
+                    content if this action was invalid.
         :rtype: dict
         """
 
         logging.info('Reversing Content.')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         reversed_content = []
 
         if self.validate_content(content):
 
             prepared_content = self.prepare_content(content)
 
-            unique_items = set()
-
-            for values in prepared_content.values():
-
-                unique_items.update(set(values))
-
-            reversed_content = {
-                unique_item: list(set([
-                    key
-                    for key, values
-                    in prepared_content.items()
-                    if unique_item in values
-                ]))
-                for unique_item
-                in unique_items
-            }
-
-            # Sorting dict based on length of values list
-            tmp = {}
-
-            for key, value in sorted(
-                reversed_content.items(), key=lambda kv: len(
-                    kv[1]), reverse=True):
+            reversed_content = self.invert(prepared_content)
 
-                tmp[key] = value
+            if not self.counted(prepared_content):
 
-            reversed_content = tmp
+                reversed_content = {
+                    value: list(keys)
+                    for value, keys
+                    in reversed_content.items()
+                }
 
             reversed_content = {
                 AbstractAction.ACTION: self.__class__.__name__,
@@ -81,10 +125,10 @@ class ContentReversal(AbstractAction):
 
             logging.warning('Content wasn\'t valid for reversal.')
 
-            self.outcome = self.FAILURE
+            context.outcome = self.FAILURE
 
             reversed_content = content
 
-        self.record_outcome(reversed_content, content)
+        self.record_outcome(reversed_content, content, context)
 
         return reversed_content
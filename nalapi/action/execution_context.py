@@ -0,0 +1,46 @@
+"""Per-request state of applying a chain of actions."""
+from action.abstract_action import AbstractAction
+
+
+class ExecutionContext:
+
+    OK = 200
+    CONFLICT = 409
+    ERROR = 500
+
+    def __init__(self, options=None):
+        """Constructor
+
+        :param options: The options the request set for its actions, by
+                    name.
+        :type options: dict
+        """
+
+        """The options the request set for its actions, by name."""
+        self.options = options if options is not None else {}
+
+        """The outcome of the action currently being applied."""
+        self.outcome = AbstractAction.SUCCESS
+
+        """The [action name, outcome] pairs of the actions applied so far."""
+        self.history = []
+
+        """The http status the request should be answered with."""
+        self.status = self.OK
+
+        """The (content, history) after each memoized action applied, when
+        memoizing, for later requests to resume from."""
+        self.stages = []
+
+    def succeeded(self):
+        """Determines whether every action applied so far succeeded.
+
+        :return: True if no action failed.
+        :rtype: bool
+        """
+
+        return all(
+            outcome == AbstractAction.SUCCESS
+            for action, outcome
+            in self.history
+        )
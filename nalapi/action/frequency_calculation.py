@@ -2,7 +2,11 @@
 from collections import Counter
 import logging
 
+import nltk
+
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
+from action.space_saving import SpaceSaving
 from action.word_extraction import WordExtraction
 from action.named_entity_extraction import NamedEntityExtraction
 from action.phrase_extraction import PhraseExtraction
@@ -10,6 +14,23 @@ from action.phrase_extraction import PhraseExtraction
 
 class FrequencyCalculation(AbstractAction):
 
+    INPUT_TYPES = (
+        NamedEntityExtraction.OUTPUT_TYPE,
+        PhraseExtraction.OUTPUT_TYPE,
+        WordExtraction.OUTPUT_TYPE
+    )
+    OUTPUT_TYPE = 'frequencies'
+
+    K = 'k'
+    NGRAMS = 'ngrams'
+    LOWERCASE = 'lowercase'
+    STOPWORDS = 'stopwords'
+    APPROXIMATE = 'approximate'
+
+    OPTIONS = (K, NGRAMS, LOWERCASE, STOPWORDS, APPROXIMATE)
+
+    REDUCIBLE = True
+
     def __init__(self):
         """Constructor"""
 
@@ -39,7 +60,9 @@ class FrequencyCalculation(AbstractAction):
 
         :param content: The content to prepare.
         :type content: dict
-        :return: The prepared content, in this case a list of strings.
+        :return: The prepared content, in this case a list of strings for
+                    each sentence, the whole content being a single
+                    sentence if it wasn't given for each sentence.
         :rtype: list
         """
 
@@ -53,13 +76,213 @@ class FrequencyCalculation(AbstractAction):
                 in prepared_content
             ]
 
-        return prepared_content
+        if self.split_into_sentences(prepared_content):
+
+            return prepared_content
+
+        return [prepared_content]
+
+    def load(self):
+        """Loads the english stopwords of NLTK, if installed, for requests
+        asking to leave stopwords out.
+        """
+
+        try:
+
+            self.stopwords = frozenset(
+                nltk.corpus.stopwords.words('english'))
+
+        except LookupError:
+
+            logging.warning(
+                'NLTK stopwords not found, requests can only give theirs.')
+
+            self.stopwords = None
+
+    def gather_count(self, context, name, default=None):
+        """Gathers the count the request set for the given option.
+
+        :param context: The context of the request this action is applied
+                    for.
+        :type context: ExecutionContext
+        :param name: The name of the option.
+        :type name: str
+        :param default: The count if the request set none.
+        :type default: int
+        :return: The count.
+        :rtype: int
+        :raises ValueError: If the option isn't a positive integer.
+        """
+
+        count = context.options.get(name)
+
+        if count is None:
+
+            return default
+
+        if isinstance(count, bool) or not isinstance(count, int) or count < 1:
+
+            raise ValueError(f'{name} must be a positive integer.')
+
+        return count
+
+    def gather_stopwords(self, context):
+        """Gathers the stopwords the request asked to leave out, as a list
+        of its own, or NLTK's english ones if true.
+
+        :param context: The context of the request this action is applied
+                    for.
+        :type context: ExecutionContext
+        :return: The stopwords, lowercase.
+        :rtype: frozenset
+        :raises ValueError: If the option is neither, or NLTK's stopwords
+                    aren't installed.
+        """
+
+        stopwords = context.options.get(self.STOPWORDS)
+
+        if not stopwords:
+
+            return frozenset()
+
+        if stopwords is True:
+
+            if self.stopwords is None:
+
+                raise ValueError('NLTK stopwords aren\'t installed.')
+
+            return self.stopwords
+
+        if (
+                not isinstance(stopwords, list) or
+                not all(isinstance(word, str) for word in stopwords)):
+
+            raise ValueError(f'{self.STOPWORDS} must be true or a list.')
+
+        return frozenset(word.lower() for word in stopwords)
+
+    def gather_items(self, sentences, context, ngrams):
+        """Gathers the items to count in the given sentences, normalized as
+        the request asked, one at a time.
+
+        :param sentences: The items of each sentence.
+        :type sentences: list
+        :param context: The context of the request this action is applied
+                    for.
+        :type context: ExecutionContext
+        :param ngrams: The number of consecutive items counted together,
+                    never across sentences.
+        :type ngrams: int
+        :return: The items, joined by a space if counted together.
+        :rtype: generator
+        """
+
+        lowercase = bool(context.options.get(self.LOWERCASE))
+
+        stopwords = self.gather_stopwords(context)
+
+        for sentence in sentences:
+
+            items = sentence
+
+            if lowercase:
 
-    def apply(self, content):
+                items = (item.lower() for item in items)
+
+            if stopwords:
+
+                items = (
+                    item
+                    for item
+                    in items
+                    if item.lower() not in stopwords)
+
+            if ngrams == 1:
+
+                yield from items
+
+            else:
+
+                yield from (
+                    ' '.join(ngram)
+                    for ngram
+                    in nltk.ngrams(items, ngrams))
+
+    def gather_counter(self, context):
+        """Gathers the counter the request asked for.
+
+        :param context: The context of the request this action is applied
+                    for.
+        :type context: ExecutionContext
+        :return: A SpaceSaving counter if the request settles for
+                    approximate counts, a Counter otherwise.
+        :rtype: Counter or SpaceSaving
+        """
+
+        capacity = self.gather_count(context, self.APPROXIMATE)
+
+        if capacity is not None:
+
+            return SpaceSaving(capacity)
+
+        return Counter()
+
+    def partial_options(self, options):
+        """Gathers the options to calculate the frequencies of each of
+        several texts with, leaving k out, as the top k items of each text
+        aren't those of all of them.
+
+        :param options: The options the request set, by name.
+        :type options: dict
+        :return: The options for each text, by name.
+        :rtype: dict
+        """
+
+        return {
+            name: value
+            for name, value
+            in options.items()
+            if name != self.K
+        }
+
+    def reduce(self, results, context=None):
+        """Reduces the frequencies calculated for several texts into those
+        of all of them, keeping a single counter rather than every result.
+
+        :param results: The frequencies of each text.
+        :type results: iterable
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
+        :return: A dict containing this action's name and the frequencies.
+        :rtype: dict
+        """
+
+        if context is None:
+
+            context = ExecutionContext()
+
+        k = self.gather_count(context, self.K)
+
+        counter = self.gather_counter(context)
+
+        for result in results:
+
+            counter.update(result)
+
+        return {
+            AbstractAction.ACTION: self.__class__.__name__,
+            AbstractAction.RESULT: dict(counter.most_common(k)),
+            AbstractAction.HISTORY: []}
+
+    def apply(self, content, context=None):
         """Applies the frequency calculation action to the given content.
 
         :param content: The content to calculate a frequency for.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and the frequency
                     calculation, or the provided content if this action
                     was invalid.
@@ -68,28 +291,61 @@ class FrequencyCalculation(AbstractAction):
 
         logging.info('Extracting Frequencies')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         frequencies = {}
 
         if self.validate_content(content):
 
             prepared_content = self.prepare_content(content)
 
-            frequencies = dict(Counter(prepared_content).most_common())
+            try:
+
+                k = self.gather_count(context, self.K)
+
+                ngrams = self.gather_count(context, self.NGRAMS, 1)
+
+                if ngrams > 1 and not WordExtraction.produced(content):
+
+                    raise ValueError(f'{self.NGRAMS} only applies to words.')
+
+                items = self.gather_items(prepared_content, context, ngrams)
+
+                # Counted in bounded memory, as the items come, if the
+                # request settles for approximate counts.
+                counter = self.gather_counter(context)
+
+                counter.update(items)
+
+                # Only the top k are selected, rather than sorting them all.
+                frequencies = dict(counter.most_common(k))
+
+                frequencies = {
+                    AbstractAction.ACTION: self.__class__.__name__,
+                    AbstractAction.RESULT: frequencies,
+                    AbstractAction.HISTORY: []}
+
+            except Exception as e:
+
+                logging.error('Error while trying to calculate frequencies!')
+
+                logging.error(e)
+
+                context.outcome = self.FAILURE
 
-            frequencies = {
-                AbstractAction.ACTION: self.__class__.__name__,
-                AbstractAction.RESULT: frequencies,
-                AbstractAction.HISTORY: []}
+                frequencies = content
 
         else:
 
             logging.warning(
                 'Content wasn\'t valid for extracting frequencies.')
 
-            self.content = self.FAILURE
+            context.outcome = self.FAILURE
 
             frequencies = content
 
-        self.record_outcome(frequencies, content)
+        self.record_outcome(frequencies, content, context)
 
         return frequencies
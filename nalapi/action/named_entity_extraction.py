@@ -4,11 +4,19 @@ import logging
 import nltk
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
 from action.word_pos_tagging import WordPosTagging
 
 
 class NamedEntityExtraction(AbstractAction):
 
+    INPUT_TYPES = (WordPosTagging.OUTPUT_TYPE,)
+    OUTPUT_TYPE = 'named_entities'
+
+    SENTENCE_LOCAL = True
+
+    COLUMNAR = True
+
     def __init__(self):
         """Constructor"""
 
@@ -28,11 +36,58 @@ class NamedEntityExtraction(AbstractAction):
             WordPosTagging.produced(content)
         )
 
-    def apply(self, content):
+    def prepare_content(self, content):
+        """Prepares the content for named entity extraction.
+
+        :param content: The content to prepare.
+        :type content: dict
+        :return: The prepared content, in this case the pos-tagged words
+                    of each sentence, the whole text being a single
+                    sentence if the words weren't given for each sentence.
+        :rtype: list
+        """
+
+        tagged_words = super().prepare_content(content)
+
+        if self.split_into_sentences(tagged_words):
+
+            return tagged_words
+
+        return [tagged_words]
+
+    def load(self):
+        """Loads the named entity chunker once, instead of letting
+        nltk.ne_chunk rebuild it for every request.
+        """
+
+        self.chunker = nltk.chunk.ne_chunker()
+
+    def columns(self, result, offsets=False):
+        """Lays out the given named entities in columns: the entities, and
+        the index of each one's label in the tag names. The offsets of
+        entities aren't kept, so none are laid out.
+
+        :param result: The label and words of each named entity.
+        :type result: list
+        :param offsets: Ignored.
+        :type offsets: bool
+        :return: Each column, by name.
+        :rtype: dict
+        """
+
+        return self.tabulate(
+            (entity, label)
+            for label, entity
+            in result)
+
+    def apply(self, content, context=None):
         """Applies the named entity extraction action to the given content.
 
         :param content: The content to extract named entities from.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and the named entities,
                     or the provided content if this action was invalid.
         :rtype: dict
@@ -40,6 +95,10 @@ class NamedEntityExtraction(AbstractAction):
 
         logging.info('Extracting Named Entities')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         named_entities = []
 
         if self.validate_content(content):
@@ -48,15 +107,19 @@ class NamedEntityExtraction(AbstractAction):
 
             try:
 
-                chunks = nltk.ne_chunk(prepared_content)
+                for sentence in prepared_content:
+
+                    # Materialized, as the chunker looks at each word
+                    # several times.
+                    chunks = self.chunker.parse(list(sentence))
 
-                for chunk in chunks:
+                    for chunk in chunks:
 
-                    if hasattr(chunk, 'label'):
+                        if hasattr(chunk, 'label'):
 
-                        named_entities.append(
-                            (chunk.label(),
-                                ' '.join(c[0] for c in chunk)))
+                            named_entities.append(
+                                (chunk.label(),
+                                    ' '.join(c[0] for c in chunk)))
 
                 named_entities = {
                     AbstractAction.ACTION: self.__class__.__name__,
@@ -70,7 +133,7 @@ class NamedEntityExtraction(AbstractAction):
 
                 logging.error(e)
 
-                self.outcome = self.FAILURE
+                context.outcome = self.FAILURE
 
                 named_entities = content
 
@@ -79,10 +142,10 @@ class NamedEntityExtraction(AbstractAction):
             logging.warning(
                 'Content wasn\'t valid for extracting named entities.')
 
-            self.outcome = self.FAILURE
+            context.outcome = self.FAILURE
 
             named_entities = content
 
-        self.record_outcome(named_entities, content)
+        self.record_outcome(named_entities, content, context)
 
         return named_entities
@@ -1,14 +1,58 @@
 """Extracts phrases from content."""
+import functools
 import logging
 
 import nltk
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
 from action.word_pos_tagging import WordPosTagging
 
 
+@functools.lru_cache(maxsize=64)
+def compile_grammar(grammar):
+    """Compiles the given chunk grammar, once for as long as it stays among
+    the most recently used ones.
+
+    :param grammar: The chunk grammar to compile.
+    :type grammar: str
+    :return: The chunk parser for the grammar.
+    :rtype: nltk.RegexpParser
+    """
+
+    return nltk.RegexpParser(grammar)
+
+
 class PhraseExtraction(AbstractAction):
 
+    INPUT_TYPES = (WordPosTagging.OUTPUT_TYPE,)
+    OUTPUT_TYPE = 'phrases'
+
+    GRAMMAR = 'grammar'
+
+    OPTIONS = (GRAMMAR,)
+
+    """The grammars a request may choose by name, along with the labels of
+    the chunks returned as phrases."""
+    GRAMMARS = {
+        # https://stackoverflow.com/a/33816257
+        'default': (
+            r"""
+            NP: {<DT|JJ|NN.*>+}       # Chunk sequences of DT, JJ, NN
+            PP: {<IN><NP>}            # Chunk prepositions followed by NP
+            VP: {<VB.*><NP|PP|S>+$}   # Chunk rightmost verbs and
+                                      # arguments/adjuncts
+            S:  {<NP><VP>}            # Chunk NP, VP
+            """,
+            ('NP', 'PP', 'VP')),
+        'np': (
+            r"""
+            NP: {<DT|PRP\$>?<JJ.*>*<NN.*>+}  # Chunk determiner, adjectives
+                                            # and nouns
+            """,
+            ('NP',))
+    }
+
     def __init__(self):
         """Constructor"""
 
@@ -28,11 +72,53 @@ class PhraseExtraction(AbstractAction):
             WordPosTagging.produced(content)
         )
 
-    def apply(self, content):
+    def prepare_content(self, content):
+        """Prepares the content for phrase extraction.
+
+        :param content: The content to prepare.
+        :type content: dict
+        :return: The prepared content, in this case the pos-tagged words
+                    of each sentence, the whole text being a single
+                    sentence if the words weren't given for each sentence.
+        :rtype: list
+        """
+
+        tagged_words = super().prepare_content(content)
+
+        if self.split_into_sentences(tagged_words):
+
+            return tagged_words
+
+        return [tagged_words]
+
+    def gather_grammar(self, context):
+        """Gathers the grammar the request chose, by name or as its own
+        grammar, the default one otherwise.
+
+        :param context: The context of the request this action is applied
+                    for.
+        :type context: ExecutionContext
+        :return: The grammar, along with the labels of the chunks returned as
+                    phrases, every label if None.
+        :rtype: str, tuple
+        """
+
+        grammar = context.options.get(self.GRAMMAR, 'default')
+
+        if grammar in self.GRAMMARS:
+
+            return self.GRAMMARS[grammar]
+
+        return grammar, None
+
+    def apply(self, content, context=None):
         """Applies the phrase extraction action to the given content.
 
         :param content: The content to extract phrases from.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and the phrases, or the
                     provided content if this action was invalid.
         :rtype: dict
@@ -40,6 +126,10 @@ class PhraseExtraction(AbstractAction):
 
         logging.info('Extracting Phrases')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         phrases = []
 
         if self.validate_content(content):
@@ -48,29 +138,25 @@ class PhraseExtraction(AbstractAction):
 
             try:
 
-                grammar = r"""
-                  NP: {<DT|JJ|NN.*>+}       # Chunk sequences of DT, JJ, NN
-                  PP: {<IN><NP>}            # Chunk prepositions followed by NP
-                  VP: {<VB.*><NP|PP|S>+$}   # Chunk rightmost verbs and
-                                            # arguments/adjuncts
-                  S:  {<NP><VP>}            # Chunk NP, VP
-                  """
+                grammar, labels = self.gather_grammar(context)
+
+                regexp_parser = compile_grammar(grammar)
 
-                # https://stackoverflow.com/a/33816257
-                regexp_parser = nltk.RegexpParser(grammar)
+                for sentence in prepared_content:
 
-                parsed_data = regexp_parser.parse(prepared_content)
+                    parsed_data = regexp_parser.parse(list(sentence))
 
-                for subtree in parsed_data.subtrees():
+                    for subtree in parsed_data.subtrees(
+                            lambda subtree: subtree is not parsed_data):
 
-                    if subtree.label() in ['NP', 'PP', 'VP']:
+                        if labels is None or subtree.label() in labels:
 
-                        phrases.append(
-                            ' '.join(
-                                word
-                                for word, tag
-                                in subtree.leaves()
-                            ))
+                            phrases.append(
+                                ' '.join(
+                                    word
+                                    for word, tag
+                                    in subtree.leaves()
+                                ))
 
                 phrases = {
                     AbstractAction.ACTION: self.__class__.__name__,
@@ -84,7 +170,7 @@ class PhraseExtraction(AbstractAction):
 
                 logging.error(e)
 
-                self.outcome = self.FAILURE
+                context.outcome = self.FAILURE
 
                 phrases = content
 
@@ -92,10 +178,10 @@ class PhraseExtraction(AbstractAction):
 
             logging.warning('Content wasn\'t valid for extracting phrases.')
 
-            self.outcome = self.FAILURE
+            context.outcome = self.FAILURE
 
             phrases = content
 
-        self.record_outcome(phrases, content)
+        self.record_outcome(phrases, content, context)
 
         return phrases
@@ -4,10 +4,19 @@ import logging
 import nltk
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
+from action.token_stream import TokenStream
 
 
 class SentenceExtraction(AbstractAction):
 
+    INPUT_TYPES = (AbstractAction.TEXT_TYPE,)
+    OUTPUT_TYPE = 'sentences'
+
+    SENTENCE_LOCAL = True
+
+    MEMOIZED = True
+
     def __init__(self):
         """Constructor"""
 
@@ -24,11 +33,21 @@ class SentenceExtraction(AbstractAction):
 
         return super().validate_content(content) and isinstance(content, str)
 
-    def apply(self, content):
+    def load(self):
+        """Loads the punkt sentence tokenizer, which NLTK keeps cached once
+        loaded.
+        """
+
+        nltk.sent_tokenize('')
+
+    def apply(self, content, context=None):
         """Applies the sentence extraction action to the given content.
 
         :param content: The content to extract sentences from.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and the sentences, or
                     the provided content if this action was invalid.
         :rtype: dict
@@ -36,6 +55,10 @@ class SentenceExtraction(AbstractAction):
 
         logging.info('Extracting Sentences')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         sentences = []
 
         if self.validate_content(content):
@@ -44,7 +67,11 @@ class SentenceExtraction(AbstractAction):
 
             try:
 
-                sentences = nltk.sent_tokenize(prepared_content)
+                # Kept as offsets into the text, rather than as copies of
+                # its sentences.
+                sentences = TokenStream.align(
+                    prepared_content,
+                    nltk.sent_tokenize(prepared_content))
 
                 sentences = {
                     AbstractAction.ACTION: self.__class__.__name__,
@@ -58,7 +85,7 @@ class SentenceExtraction(AbstractAction):
 
                 logging.error(e)
 
-                self.outcome = self.FAILURE
+                context.outcome = self.FAILURE
 
                 sentences = content
 
@@ -66,10 +93,10 @@ class SentenceExtraction(AbstractAction):
 
             logging.warning('Content wasn\'t valid for extracting sentences.')
 
-            self.outcome = self.FAILURE
+            context.outcome = self.FAILURE
 
             sentences = content
 
-        self.record_outcome(sentences, content)
+        self.record_outcome(sentences, content, context)
 
         return sentences
@@ -4,11 +4,18 @@ import logging
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
 from action.sentence_extraction import SentenceExtraction
 
 
 class SentimentCalculation(AbstractAction):
 
+    INPUT_TYPES = (AbstractAction.TEXT_TYPE, SentenceExtraction.OUTPUT_TYPE)
+    OUTPUT_TYPE = 'sentiment'
+
+    SENTENCES = 'sentences'
+    DOCUMENT = 'document'
+
     def __init__(self):
         """Constructor"""
 
@@ -32,45 +39,48 @@ class SentimentCalculation(AbstractAction):
             )
         )
 
-    def prepare_content(self, content):
-        """Prepares the content for sentiment calculation.
-
-        :param content: The content to prepare.
-        :type content: dict
-        :return: The prepared content, in this case a string.
-        :rtype: str
+    def load(self):
+        """Loads the VADER lexicon once, instead of re-reading it from disk
+        for every request.
         """
 
-        prepared_content = super().prepare_content(content)
-
-        if SentenceExtraction.produced(content):
-
-            prepared_content = ' '.join(prepared_content)
+        self.analyzer = SentimentIntensityAnalyzer()
 
-        return prepared_content
-
-    def apply(self, content):
+    def apply(self, content, context=None):
         """Applies the sentiment calculation action to the given content.
 
         :param content: The content to calculate a sentiment for.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and a dict with the
-                    scores, or the provided content if this action was
-                    invalid.
+                    scores, per sentence and for the whole document if the
+                    content was produced by SentenceExtraction, or the
+                    provided content if this action was invalid.
         :rtype: dict
         """
 
         logging.info('Calculating Sentiment')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         sentiment = []
 
         if self.validate_content(content):
 
             prepared_content = self.prepare_content(content)
 
-            sia = SentimentIntensityAnalyzer()
+            if SentenceExtraction.produced(content):
 
-            sentiment = sia.polarity_scores(prepared_content)
+                sentiment = self.calculate_sentence_sentiments(
+                    prepared_content)
+
+            else:
+
+                sentiment = self.analyzer.polarity_scores(prepared_content)
 
             sentiment = {
                 AbstractAction.ACTION: self.__class__.__name__,
@@ -81,8 +91,48 @@ class SentimentCalculation(AbstractAction):
 
             logging.warning('Content wasn\'t valid for sentiment calculation.')
 
+            context.outcome = self.FAILURE
+
             sentiment = content
 
-        self.record_outcome(sentiment, content)
+        self.record_outcome(sentiment, content, context)
 
         return sentiment
+
+    def calculate_sentence_sentiments(self, sentences):
+        """Calculates the sentiment of each of the given sentences, along
+        with the sentiment of the whole document, the average of the
+        sentences' scores weighted by their length.
+
+        :param sentences: The sentences to calculate sentiments for.
+        :type sentences: list
+        :return: The scores of each sentence, and of the document.
+        :rtype: dict
+        """
+
+        sentence_scores = [
+            self.analyzer.polarity_scores(sentence)
+            for sentence
+            in sentences
+        ]
+
+        total_length = sum(len(sentence) for sentence in sentences)
+
+        document_scores = dict.fromkeys(self.analyzer.polarity_scores(''), 0.0)
+
+        for scores, sentence in zip(sentence_scores, sentences):
+
+            for score_name, score in scores.items():
+
+                document_scores[score_name] = (
+                    document_scores[score_name] +
+                    score * len(sentence) / total_length)
+
+        return {
+            self.SENTENCES: sentence_scores,
+            self.DOCUMENT: {
+                score_name: round(score, 4)
+                for score_name, score
+                in document_scores.items()
+            }
+        }
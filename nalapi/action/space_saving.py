@@ -0,0 +1,139 @@
+"""Counts the most frequent items of a stream in bounded memory."""
+from collections.abc import Mapping
+
+
+class SpaceSaving:
+
+    def __init__(self, capacity):
+        """Constructor
+
+        :param capacity: The number of items counted at most. Any item
+                    seen more than total / capacity times is among them.
+        :type capacity: int
+        """
+
+        self.__capacity = capacity
+
+        """The estimated count of each item counted."""
+        self.__counts = {}
+
+        """The items with each count, in the order they reached it, so the
+        item replaced when full is always the same one."""
+        self.__buckets = {}
+
+        self.__min_count = 0
+
+    def update(self, items):
+        """Counts the given items, as Counter.update does.
+
+        :param items: The items to count, or the number of times to count
+                    each of them.
+        :type items: iterable or Mapping
+        """
+
+        if isinstance(items, Mapping):
+
+            for item, count in items.items():
+
+                self.add(item, count)
+
+            return
+
+        for item in items:
+
+            self.add(item)
+
+    def add(self, item, count=1):
+        """Counts the given item, the given number of times. Once full, an
+        item not counted yet replaces one of those counted the least, taking
+        over its count, so counts may be overestimated by at most that
+        count.
+
+        :param item: The item to count.
+        :type item: *
+        :param count: The number of times to count it, e.g. when merging
+                    counts made elsewhere.
+        :type count: int
+        """
+
+        current = self.__counts.get(item)
+
+        if current is None:
+
+            if len(self.__counts) < self.__capacity:
+
+                current = 0
+
+            else:
+
+                current = self.__min_count
+
+                replaced = next(iter(self.__buckets[current]))
+
+                del self.__counts[replaced]
+
+                self.__unbucket(replaced, current)
+
+        else:
+
+            self.__unbucket(item, current)
+
+        current += count
+
+        self.__counts[item] = current
+
+        self.__buckets.setdefault(current, {})[item] = None
+
+        if self.__min_count not in self.__buckets:
+
+            # Counted once at a time, no count lies between the least one
+            # and this one, so there is no need to look for it.
+            self.__min_count = (
+                current
+                if count == 1
+                else min(self.__buckets))
+
+        elif current < self.__min_count:
+
+            self.__min_count = current
+
+    def __unbucket(self, item, count):
+        """Removes the given item from the bucket of the given count.
+
+        :param item: The item to remove.
+        :type item: *
+        :param count: The count the item had.
+        :type count: int
+        """
+
+        bucket = self.__buckets[count]
+
+        del bucket[item]
+
+        if not bucket:
+
+            del self.__buckets[count]
+
+    def most_common(self, n=None):
+        """Lists the items counted the most, with their estimated counts.
+
+        :param n: The number of items to list, all of them if None.
+        :type n: int
+        :return: The items and their counts, the most counted first, ties
+                    in the order they reached their count.
+        :rtype: list
+        """
+
+        most_common = []
+
+        for count in sorted(self.__buckets, reverse=True):
+
+            for item in self.__buckets[count]:
+
+                if n is not None and len(most_common) >= n:
+
+                    return most_common
+
+                most_common.append((item, count))
+
+        return most_common
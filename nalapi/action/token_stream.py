@@ -0,0 +1,408 @@
+"""Tokens kept as character offsets into the text they were found in."""
+from array import array
+from collections.abc import Sequence
+import re
+
+
+class TokenStream(Sequence):
+
+    # The tokens word_tokenize writes in place of a double quote.
+    QUOTES = frozenset(['``', "''"])
+
+    # The number of characters past the whitespace after the previous token
+    # a token is looked for in, beyond its own length. A token not found
+    # there is left where the previous one ended, rather than searched for
+    # through the rest of the text.
+    SEARCH_WINDOW = 16
+
+    WHITESPACE = re.compile(r'\s*')
+
+    # The names of the columns tokens are laid out in.
+    TOKENS = 'tokens'
+    TAGS = 'tags'
+    TAG_NAMES = 'tag_names'
+    STARTS = 'starts'
+    ENDS = 'ends'
+
+    def __init__(
+            self,
+            text,
+            starts=None,
+            ends=None,
+            tags=None,
+            tag_names=None,
+            replacements=None):
+        """Constructor
+
+        :param text: The text the tokens were found in.
+        :type text: str
+        :param starts: The offset in the text each token starts at.
+        :type starts: array.array
+        :param ends: The offset in the text each token ends at.
+        :type ends: array.array
+        :param tags: The index in tag_names of each token's tag, if tagged.
+        :type tags: array.array
+        :param tag_names: The tags the tokens are tagged with.
+        :type tag_names: list
+        :param replacements: The tokens that differ from the text they were
+                    found at, by index, e.g. '``' for a double quote.
+        :type replacements: dict
+        """
+
+        self.__text = text
+
+        self.__starts = starts if starts is not None else array('q')
+
+        self.__ends = ends if ends is not None else array('q')
+
+        self.__tags = tags
+
+        self.__tag_names = tag_names
+
+        self.__replacements = replacements or {}
+
+    @classmethod
+    def align(cls, text, tokens, start=0):
+        """Finds the given tokens in the given text, in order.
+
+        :param text: The text the tokens were found in.
+        :type text: str
+        :param tokens: The tokens to find.
+        :type tokens: list
+        :param start: The offset in the text to start searching from.
+        :type start: int
+        :return: The tokens, as offsets into the text.
+        :rtype: TokenStream
+        """
+
+        starts = array('q')
+
+        ends = array('q')
+
+        replacements = {}
+
+        offset = start
+
+        for index, token in enumerate(tokens):
+
+            search_start = cls.WHITESPACE.match(text, offset).end()
+
+            search_end = search_start + len(token) + cls.SEARCH_WINDOW
+
+            if token in cls.QUOTES:
+
+                token_start, token_end = cls.__find_quote(
+                    text, search_start, search_end)
+
+            else:
+
+                token_start = text.find(token, search_start, search_end)
+
+                token_end = token_start + len(token)
+
+            if token_start < 0:
+
+                # Kept in place, as an empty span, rather than losing it.
+                token_start = token_end = offset
+
+            if text[token_start:token_end] != token:
+
+                replacements[index] = token
+
+            starts.append(token_start)
+
+            ends.append(token_end)
+
+            offset = token_end
+
+        return cls(text, starts, ends, replacements=replacements)
+
+    @staticmethod
+    def __find_quote(text, offset, end):
+        """Finds the next double quote in the given text, in any of the ways
+        word_tokenize writes one.
+
+        :param text: The text to search.
+        :type text: str
+        :param offset: The offset to start searching from.
+        :type offset: int
+        :param end: The offset to stop searching at.
+        :type end: int
+        :return: The offsets the quote starts and ends at, -1 if none.
+        :rtype: int, int
+        """
+
+        found = [
+            (text.find(quote, offset, end), len(quote))
+            for quote in ['"', '``', "''"]
+        ]
+
+        found = [(start, length) for start, length in found if start >= 0]
+
+        if not found:
+
+            return -1, -1
+
+        start, length = min(found)
+
+        return start, start + length
+
+    @classmethod
+    def concatenate(cls, streams):
+        """Concatenates the given streams, found in the same text, into one.
+
+        :param streams: The streams to concatenate, in order.
+        :type streams: list
+        :return: The stream of all their tokens.
+        :rtype: TokenStream
+        """
+
+        if not streams:
+
+            return cls('')
+
+        starts = array('q')
+
+        ends = array('q')
+
+        tag_names = None
+
+        tags = None
+
+        replacements = {}
+
+        if streams[0].tagged:
+
+            tag_names = []
+
+            tags = array('H')
+
+        for stream in streams:
+
+            for index, token in stream.__replacements.items():
+
+                replacements[len(starts) + index] = token
+
+            starts.extend(stream.__starts)
+
+            ends.extend(stream.__ends)
+
+            if tags is not None:
+
+                indexes = cls.__index_tags(stream.__tag_names, tag_names)
+
+                tags.extend(indexes[tag] for tag in stream.__tags)
+
+        return cls(streams[0].__text, starts, ends, tags, tag_names, replacements)
+
+    @staticmethod
+    def __index_tags(names, tag_names):
+        """Indexes the given tags in tag_names, adding those it lacks.
+
+        :param names: The tags to index.
+        :type names: list
+        :param tag_names: The tags indexed so far.
+        :type tag_names: list
+        :return: The index in tag_names of each of the given tags, in order.
+        :rtype: list
+        """
+
+        indexes = []
+
+        for name in names:
+
+            if name not in tag_names:
+
+                tag_names.append(name)
+
+            indexes.append(tag_names.index(name))
+
+        return indexes
+
+    @property
+    def text(self):
+        """The text the tokens were found in."""
+
+        return self.__text
+
+    @property
+    def tagged(self):
+        """Whether the tokens are tagged."""
+
+        return self.__tags is not None
+
+    def spans(self):
+        """Gathers the offsets in the text each token starts and ends at.
+
+        :return: The start and end of each token, in order.
+        :rtype: list
+        """
+
+        return list(zip(self.__starts, self.__ends))
+
+    def columns(self, offsets=False):
+        """Lays out these tokens in columns, one list per field, the tags
+        being indexes into a list of tag names.
+
+        :param offsets: Whether the offsets in the text each token starts
+                    and ends at are laid out too.
+        :type offsets: bool
+        :return: The tokens, and the tags and tag names if tagged, and the
+                    starts and ends if asked for, by column name.
+        :rtype: dict
+        """
+
+        columns = {
+            self.TOKENS: [self.__word(index) for index in range(len(self))]
+        }
+
+        if self.__tags is not None:
+
+            columns[self.TAGS] = self.__tags.tolist()
+
+            columns[self.TAG_NAMES] = list(self.__tag_names)
+
+        if offsets:
+
+            columns[self.STARTS] = self.__starts.tolist()
+
+            columns[self.ENDS] = self.__ends.tolist()
+
+        return columns
+
+    def tag(self, tags):
+        """Tags these tokens with the given tags.
+
+        :param tags: The tag of each token, in order.
+        :type tags: list
+        :return: The tagged tokens, found at the same offsets.
+        :rtype: TokenStream
+        """
+
+        tag_names = list(dict.fromkeys(tags))
+
+        indexes = {name: index for index, name in enumerate(tag_names)}
+
+        return TokenStream(
+            self.__text,
+            self.__starts,
+            self.__ends,
+            array('H', [indexes[tag] for tag in tags]),
+            tag_names,
+            self.__replacements)
+
+    def rebase(self, text, offset):
+        """Moves these tokens, found in a part of the given text starting at
+        the given offset, into the whole text.
+
+        :param text: The whole text.
+        :type text: str
+        :param offset: The offset the part starts at in the whole text.
+        :type offset: int
+        :return: The tokens, as offsets into the whole text.
+        :rtype: TokenStream
+        """
+
+        return TokenStream(
+            text,
+            array('q', [start + offset for start in self.__starts]),
+            array('q', [end + offset for end in self.__ends]),
+            self.__tags,
+            self.__tag_names,
+            self.__replacements)
+
+    def __word(self, index):
+        """Materializes the token at the given index, without its tag.
+
+        :param index: The index of the token, from 0.
+        :type index: int
+        :return: The token.
+        :rtype: str
+        """
+
+        token = self.__replacements.get(index)
+
+        if token is None:
+
+            token = self.__text[self.__starts[index]:self.__ends[index]]
+
+        return token
+
+    def __token(self, index):
+        """Materializes the token at the given index.
+
+        :param index: The index of the token, from 0.
+        :type index: int
+        :return: The token, along with its tag if tagged.
+        :rtype: str or tuple
+        """
+
+        token = self.__word(index)
+
+        if self.__tags is not None:
+
+            return token, self.__tag_names[self.__tags[index]]
+
+        return token
+
+    def __len__(self):
+        """The number of tokens."""
+
+        return len(self.__starts)
+
+    def __getitem__(self, index):
+        """Materializes the token at the given index, or a stream of the
+        tokens in the given slice, still pointing into the same text.
+        """
+
+        if isinstance(index, slice):
+
+            start, stop, step = index.indices(len(self))
+
+            indexes = range(start, stop, step)
+
+            return TokenStream(
+                self.__text,
+                self.__starts[index],
+                self.__ends[index],
+                self.__tags[index] if self.__tags is not None else None,
+                self.__tag_names,
+                {
+                    position: self.__replacements[old_index]
+                    for position, old_index
+                    in enumerate(indexes)
+                    if old_index in self.__replacements
+                })
+
+        if index < 0:
+
+            index += len(self)
+
+        if not 0 <= index < len(self):
+
+            raise IndexError('TokenStream index out of range')
+
+        return self.__token(index)
+
+    def __iter__(self):
+        """Materializes the tokens, in order."""
+
+        for index in range(len(self)):
+
+            yield self.__token(index)
+
+    def __eq__(self, other):
+        """Compares the tokens, as a list of them would be compared."""
+
+        if isinstance(other, (TokenStream, list, tuple)):
+
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        """A representation of the tokens, as a list of them."""
+
+        return f'TokenStream({list(self)!r})'
@@ -2,6 +2,7 @@
 import logging
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
 from action.word_extraction import WordExtraction
 from action.word_pos_tagging import WordPosTagging
 from action.named_entity_extraction import NamedEntityExtraction
@@ -10,6 +11,16 @@ from action.phrase_extraction import PhraseExtraction
 
 class UniqueFiltering(AbstractAction):
 
+    INPUT_TYPES = (
+        WordPosTagging.OUTPUT_TYPE,
+        NamedEntityExtraction.OUTPUT_TYPE,
+        WordExtraction.OUTPUT_TYPE,
+        PhraseExtraction.OUTPUT_TYPE
+    )
+    OUTPUT_TYPE = 'unique_items'
+
+    REDUCIBLE = True
+
     def __init__(self):
         """Constructor"""
 
@@ -36,11 +47,50 @@ class UniqueFiltering(AbstractAction):
             )
         )
 
-    def apply(self, content):
+    def prepare_content(self, content):
+        """Prepares the content for unique filtering.
+
+        :param content: The content to prepare.
+        :type content: dict
+        :return: The prepared content, in this case a list of items, those
+                    given for each sentence being flattened.
+        :rtype: list
+        """
+
+        return self.flatten(super().prepare_content(content))
+
+    def reduce(self, results, context=None):
+        """Reduces the unique items of several texts into those of all of
+        them, in the order they first appear.
+
+        :param results: The unique items of each text.
+        :type results: iterable
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
+        :return: A dict containing this action's name and the unique items.
+        :rtype: dict
+        """
+
+        unique_items = {}
+
+        for result in results:
+
+            unique_items.update(dict.fromkeys(result))
+
+        return {
+            AbstractAction.ACTION: self.__class__.__name__,
+            AbstractAction.RESULT: list(unique_items),
+            AbstractAction.HISTORY: []}
+
+    def apply(self, content, context=None):
         """Applies the Unique Filtering action to the given content.
 
         :param content: The content to remove duplicates from.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and the unique items, or
                     the provided content if this action was invalid.
         :rtype: dict
@@ -48,13 +98,19 @@ class UniqueFiltering(AbstractAction):
 
         logging.info('Filtering out non-unique items.')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         unique_items = []
 
         if self.validate_content(content):
 
             prepared_content = self.prepare_content(content)
 
-            unique_items = list(set(prepared_content))
+            # Kept in the order they first appear, so the result is the same
+            # from one run, or process, to the next.
+            unique_items = list(dict.fromkeys(prepared_content))
 
             unique_items = {
                 AbstractAction.ACTION: self.__class__.__name__,
@@ -68,8 +124,8 @@ class UniqueFiltering(AbstractAction):
 
             unique_items = content
 
-            self.outcome = self.FAILURE
+            context.outcome = self.FAILURE
 
-        self.record_outcome(unique_items, content)
+        self.record_outcome(unique_items, content, context)
 
         return unique_items
@@ -4,11 +4,20 @@ import logging
 import nltk
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
 from action.sentence_extraction import SentenceExtraction
+from action.token_stream import TokenStream
 
 
 class WordExtraction(AbstractAction):
 
+    INPUT_TYPES = (AbstractAction.TEXT_TYPE, SentenceExtraction.OUTPUT_TYPE)
+    OUTPUT_TYPE = 'words'
+
+    SENTENCE_LOCAL = True
+
+    MEMOIZED = True
+
     def __init__(self):
         """Constructor"""
 
@@ -37,30 +46,70 @@ class WordExtraction(AbstractAction):
 
         :param content: The content to prepare.
         :type content: dict or str
-        :return: The prepared content, in this case a string.
-        :rtype: str
+        :return: The prepared content, in this case a string, or the
+                    sentences SentenceExtraction produced.
+        :rtype: str or list
         """
 
-        prepared_content = super().prepare_content(content)
+        return super().prepare_content(content)
 
-        if SentenceExtraction.produced(content):
+    def load(self):
+        """Loads the punkt sentence tokenizer word_tokenize relies on, which
+        NLTK keeps cached once loaded.
+        """
 
-            prepared_content = ' '.join(prepared_content)
+        nltk.word_tokenize('')
 
-        return prepared_content
+    def extract_sentence_words(self, sentences):
+        """Extracts the words of each of the given sentences, found at the
+        offsets of the sentence in the text if known.
+
+        :param sentences: The sentences to extract words from.
+        :type sentences: TokenStream or list
+        :return: The words of each sentence, in order.
+        :rtype: list
+        """
 
-    def apply(self, content):
+        if isinstance(sentences, TokenStream):
+
+            return [
+                TokenStream.align(
+                    sentences.text,
+                    nltk.tokenize.word_tokenize(sentence, preserve_line=True),
+                    start)
+                for sentence, (start, end)
+                in zip(sentences, sentences.spans())
+            ]
+
+        return [
+            TokenStream.align(
+                sentence,
+                nltk.tokenize.word_tokenize(sentence, preserve_line=True))
+            for sentence
+            in sentences
+        ]
+
+    def apply(self, content, context=None):
         """Applies the word extraction action to the given content.
 
         :param content: The content to extract words from.
         :type content: dict or str
-        :return: A dict containing this action's name and the words, or the
-                    provided content if this action was invalid.
-        :rtype: list
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
+        :return: A dict containing this action's name and the words, a list of
+                    them for each sentence if the content was produced by
+                    SentenceExtraction, or the provided content if this
+                    action was invalid.
+        :rtype: dict
         """
 
         logging.info('Extracting Words')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         words = []
 
         if self.validate_content(content):
@@ -69,7 +118,19 @@ class WordExtraction(AbstractAction):
 
             try:
 
-                words = nltk.tokenize.word_tokenize(prepared_content)
+                if SentenceExtraction.produced(content):
+
+                    # Each sentence is tokenized on its own, rather than
+                    # letting word_tokenize split the text into sentences
+                    # again, and its words kept together for later actions
+                    # to process sentence by sentence.
+                    words = self.extract_sentence_words(prepared_content)
+
+                else:
+
+                    words = TokenStream.align(
+                        prepared_content,
+                        nltk.tokenize.word_tokenize(prepared_content))
 
                 words = {
                     AbstractAction.ACTION: self.__class__.__name__,
@@ -83,7 +144,7 @@ class WordExtraction(AbstractAction):
 
                 logging.error(e)
 
-                self.outcome = self.FAILURE
+                context.outcome = self.FAILURE
 
                 words = content
 
@@ -91,10 +152,10 @@ class WordExtraction(AbstractAction):
 
             logging.warning('Content wasn\'t valid for extracting words.')
 
-            self.outcome = self.FAILURE
+            context.outcome = self.FAILURE
 
             words = content
 
-        self.record_outcome(words, content)
+        self.record_outcome(words, content, context)
 
         return words
@@ -4,11 +4,28 @@ import logging
 import nltk
 
 from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
+from action.token_stream import TokenStream
 from action.word_extraction import WordExtraction
 
 
 class WordPosTagging(AbstractAction):
 
+    INPUT_TYPES = (WordExtraction.OUTPUT_TYPE,)
+    OUTPUT_TYPE = 'tagged_words'
+
+    SENTENCE_LOCAL = True
+
+    MEMOIZED = True
+
+    COLUMNAR = True
+
+    # The column giving the index of the sentence of each word.
+    SENTENCES = 'sentences'
+
+    # The tokens word_tokenize ends a sentence with.
+    SENTENCE_ENDS = frozenset(['.', '!', '?'])
+
     def __init__(self):
         """Constructor"""
 
@@ -28,18 +45,109 @@ class WordPosTagging(AbstractAction):
             WordExtraction.produced(content)
         )
 
-    def apply(self, content):
+    def prepare_content(self, content):
+        """Prepares the content for pos tagging.
+
+        :param content: The content to prepare.
+        :type content: dict
+        :return: The prepared content, in this case the words split into
+                    sentences.
+        :rtype: list
+        """
+
+        words = super().prepare_content(content)
+
+        if self.split_into_sentences(words):
+
+            return words
+
+        sentences = []
+
+        start = 0
+
+        for index, word in enumerate(words):
+
+            if word in self.SENTENCE_ENDS:
+
+                sentences.append(words[start:index + 1])
+
+                start = index + 1
+
+        if start < len(words):
+
+            sentences.append(words[start:])
+
+        return sentences
+
+    def load(self):
+        """Loads the perceptron tagger once, instead of letting nltk.pos_tag
+        rebuild it for every request.
+        """
+
+        self.tagger = nltk.tag.PerceptronTagger()
+
+    def columns(self, result, offsets=False):
+        """Lays out the given pos-tagged words in columns: the words, the
+        index of each one's tag in the tag names, and the index of each
+        one's sentence if tagged for each sentence.
+
+        :param result: The pos-tagged words, or those of each sentence.
+        :type result: TokenStream or list
+        :param offsets: Whether the offsets in the text each word starts
+                    and ends at are laid out too.
+        :type offsets: bool
+        :return: Each column, by name.
+        :rtype: dict
+        """
+
+        sentences = None
+
+        if self.split_into_sentences(result):
+
+            sentences = [
+                index
+                for index, sentence in enumerate(result)
+                for word in range(len(sentence))
+            ]
+
+            result = self.flatten(result)
+
+        if isinstance(result, TokenStream):
+
+            columns = result.columns(offsets)
+
+        else:
+
+            # Words not kept as offsets, e.g. resumed from an older stage.
+            columns = self.tabulate(result)
+
+        if sentences is not None:
+
+            columns[self.SENTENCES] = sentences
+
+        return columns
+
+    def apply(self, content, context=None):
         """Applies the word pos tagging action to the given content.
 
         :param content: The content to pos tag.
         :type content: dict
+        :param context: The context of the request this action is applied
+                    for, a new one if None.
+        :type context: ExecutionContext
         :return: A dict containing this action's name and the pos-tagged words,
-                    or the provided content if this action was invalid.
+                    a list of them for each sentence if the words were given
+                    for each sentence, or the provided content if this
+                    action was invalid.
         :rtype: dict
         """
 
         logging.info('POS Tagging Words')
 
+        if context is None:
+
+            context = ExecutionContext()
+
         tagged_words = []
 
         if self.validate_content(content):
@@ -48,7 +156,29 @@ class WordPosTagging(AbstractAction):
 
             try:
 
-                tagged_words = nltk.pos_tag(prepared_content)
+                # Tagged as a batch of sentences, as nltk.pos_tag_sents
+                # does, so each sentence is tagged in its own context.
+                tagged_sentences = self.tagger.tag_sents([
+                    list(sentence)
+                    for sentence
+                    in prepared_content
+                ])
+
+                # The tags are kept alongside the offsets of the words,
+                # rather than in a tuple with a copy of each word.
+                tagged_words = [
+                    sentence.tag([tag for word, tag in tagged_sentence])
+                    if isinstance(sentence, TokenStream)
+                    else list(tagged_sentence)
+                    for sentence, tagged_sentence
+                    in zip(prepared_content, tagged_sentences)
+                ]
+
+                # Words given for each sentence are tagged for each
+                # sentence too, for later actions to process the same way.
+                if not self.split_into_sentences(content[self.RESULT]):
+
+                    tagged_words = self.flatten(tagged_words)
 
                 tagged_words = {
                     AbstractAction.ACTION: self.__class__.__name__,
@@ -61,7 +191,7 @@ class WordPosTagging(AbstractAction):
 
                 logging.error(e)
 
-                self.outcome = self.FAILURE
+                context.outcome = self.FAILURE
 
                 tagged_words = content
 
@@ -71,8 +201,8 @@ class WordPosTagging(AbstractAction):
 
             tagged_words = content
 
-            self.outcome = self.FAILURE
+            context.outcome = self.FAILURE
 
-        self.record_outcome(tagged_words, content)
+        self.record_outcome(tagged_words, content, context)
 
         return tagged_words
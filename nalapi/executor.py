@@ -0,0 +1,1044 @@
+"""Executors applying chains of actions to texts, either inline or in a warm
+pool of worker processes.
+"""
+import copy
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import multiprocessing
+import os
+import threading
+
+from action.abstract_action import AbstractAction
+from action.execution_context import ExecutionContext
+from action.token_stream import TokenStream
+
+
+def apply_actions(
+        text,
+        actions,
+        options=None,
+        content=None,
+        context=None,
+        memoize=False):
+    """Applies the given actions to the given text.
+
+    :param text: The text to apply the actions to.
+    :type text: str
+    :param actions: The actions to apply to the text.
+    :type actions: list
+    :param options: The options the request set for the actions, by name.
+    :type options: dict
+    :param content: The content to apply the actions to, when resuming from
+                content already produced from the text, the text if None.
+    :type content: dict
+    :param context: The context the content was produced in, a new one if
+                None.
+    :type context: ExecutionContext
+    :param memoize: Whether to record the content produced by memoized
+                actions in the context's stages.
+    :type memoize: bool
+    :return: The final content produced, and the context it was produced in.
+    :rtype: dict, ExecutionContext
+    """
+
+    if context is None:
+
+        context = ExecutionContext(options)
+
+    if content is None:
+
+        content = text
+
+    for index, action in enumerate(actions):
+
+        try:
+
+            logging.debug(f'Processing via {action.name}')
+
+            content = action.apply(content, context)
+
+            if (
+                    memoize and
+                    action.MEMOIZED and
+                    index < len(actions) - 1 and
+                    context.succeeded()):
+
+                # Copied, as a later action failing sets the history of the
+                # content it was given.
+                context.stages.append((dict(content), list(context.history)))
+
+        except Exception as e:
+
+            logging.error(
+                'Error while trying to process result of type' +
+                f'{type(content)} via {action}!')
+
+            logging.error(e)
+
+            context.status = ExecutionContext.ERROR
+
+            break
+
+    if context.status == ExecutionContext.OK and not context.succeeded():
+
+        context.status = ExecutionContext.CONFLICT
+
+    return content, context
+
+
+def resume_actions(text, actions, options=None, start=None, memoize=False):
+    """Applies the given actions to the given text, resuming from a stage
+    memoized for it.
+
+    :param text: The text to apply the actions to.
+    :type text: str
+    :param actions: The actions to apply to the text, including the ones
+                already applied to reach the stage.
+    :type actions: list
+    :param options: The options the request set for the actions, by name.
+    :type options: dict
+    :param start: The content and history of the stage to resume from, from
+                the text if None.
+    :type start: dict, list
+    :param memoize: Whether to record the content produced by memoized
+                actions in the context's stages.
+    :type memoize: bool
+    :return: The final content produced, and the context it was produced in.
+    :rtype: dict, ExecutionContext
+    """
+
+    context = ExecutionContext(options)
+
+    content = None
+
+    if start is not None:
+
+        content, history = start
+
+        context.history = list(history)
+
+        actions = actions[len(history):]
+
+    return apply_actions(text, actions, options, content, context, memoize)
+
+
+def apply_chains(text, chains, options=None):
+    """Applies each of the given chains of actions to the given text, the
+    actions of a prefix shared by several chains only once.
+
+    :param text: The text to apply the chains to.
+    :type text: str
+    :param chains: The chains of actions to apply to the text.
+    :type chains: list
+    :param options: The options the request set for the actions, by name.
+    :type options: dict
+    :return: The final content produced by each chain, and the context it
+                was produced in, in the order of the chains.
+    :rtype: list
+    """
+
+    results = [None] * len(chains)
+
+    _apply_branch(
+        text,
+        chains,
+        range(len(chains)),
+        text,
+        ExecutionContext(options),
+        results)
+
+    return results
+
+
+def _apply_branch(text, chains, indexes, content, context, results):
+    """Applies the rest of the given chains, which all start with the actions
+    that produced the given content, branching where they differ.
+
+    :param text: The text the chains are applied to.
+    :type text: str
+    :param chains: The chains of actions applied to the text.
+    :type chains: list
+    :param indexes: The indexes of the chains of this branch.
+    :type indexes: list
+    :param content: The content produced by the actions of this branch.
+    :type content: dict
+    :param context: The context the content was produced in.
+    :type context: ExecutionContext
+    :param results: The result of each chain, set as chains finish.
+    :type results: list
+    """
+
+    depth = len(context.history)
+
+    branches = {}
+
+    for index in indexes:
+
+        if len(chains[index]) == depth or (
+                context.status == ExecutionContext.ERROR):
+
+            # Each chain gets its own copy, as they are finished separately.
+            results[index] = (
+                dict(content) if isinstance(content, dict) else content,
+                copy.copy(context))
+
+        else:
+
+            branches.setdefault(chains[index][depth], []).append(index)
+
+    for action, branch_indexes in branches.items():
+
+        branch_context = copy.copy(context)
+
+        branch_context.history = list(context.history)
+
+        branch_content, branch_context = apply_actions(
+            text,
+            [action],
+            content=(dict(content) if isinstance(content, dict) else content),
+            context=branch_context)
+
+        _apply_branch(
+            text,
+            chains,
+            branch_indexes,
+            branch_content,
+            branch_context,
+            results)
+
+
+def merge_shards(contents, text=None, offsets=None):
+    """Merges the contents produced for consecutive shards of a text into
+    the content the same actions produce for the whole text.
+
+    :param contents: The contents produced for each shard, in order.
+    :type contents: list
+    :param text: The whole text, for the tokens found in each shard to
+                point into it.
+    :type text: str
+    :param offsets: The offset each shard starts at in the whole text.
+    :type offsets: list
+    :return: The merged content.
+    :rtype: dict
+    """
+
+    results = [content[AbstractAction.RESULT] for content in contents]
+
+    if text is not None:
+
+        results = [
+            _rebase_result(result, text, offset)
+            for result, offset
+            in zip(results, offsets)
+        ]
+
+    if all(isinstance(result, TokenStream) for result in results):
+
+        result = TokenStream.concatenate(results)
+
+    else:
+
+        result = [item for result in results for item in result]
+
+    return {
+        AbstractAction.ACTION: contents[0][AbstractAction.ACTION],
+        AbstractAction.RESULT: result,
+        AbstractAction.HISTORY: list(contents[0][AbstractAction.HISTORY])
+    }
+
+
+def _rebase_result(result, text, offset):
+    """Moves the tokens of a result produced for a shard of the given text
+    into the whole text.
+
+    :param result: The result produced for the shard.
+    :type result: list or TokenStream
+    :param text: The whole text.
+    :type text: str
+    :param offset: The offset the shard starts at in the whole text.
+    :type offset: int
+    :return: The result, its tokens pointing into the whole text.
+    :rtype: list or TokenStream
+    """
+
+    if isinstance(result, TokenStream):
+
+        return result.rebase(text, offset)
+
+    return [
+        item.rebase(text, offset) if isinstance(item, TokenStream) else item
+        for item
+        in result
+    ]
+
+
+class InlineExecutor:
+
+    def run(self, text, actions, options=None):
+        """Applies the given actions to the given text in the calling thread.
+
+        :param text: The text to apply the actions to.
+        :type text: str
+        :param actions: The actions to apply to the text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The final content produced, and the context it was produced
+                    in.
+        :rtype: dict, ExecutionContext
+        """
+
+        return apply_actions(text, actions, options)
+
+    def map(self, texts, actions, options=None, starts=None, memoize=False):
+        """Applies the given actions to each of the given texts in the
+        calling thread, one after the other.
+
+        :param texts: The texts to apply the actions to.
+        :type texts: list
+        :param actions: The actions to apply to each text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :param starts: The stage to resume from for each text, as taken by
+                    resume_actions, from the texts if None.
+        :type starts: list
+        :param memoize: Whether to record the content produced by memoized
+                    actions in the contexts' stages.
+        :type memoize: bool
+        :return: The final content produced for each text, and the context
+                    it was produced in, in the order of the texts.
+        :rtype: list
+        """
+
+        if starts is None:
+
+            starts = [None] * len(texts)
+
+        return [
+            resume_actions(text, actions, options, start, memoize)
+            for text, start
+            in zip(texts, starts)
+        ]
+
+    def map_chains(self, texts, chains, options=None):
+        """Applies each of the given chains of actions to each of the given
+        texts in the calling thread, one after the other.
+
+        :param texts: The texts to apply the chains to.
+        :type texts: list
+        :param chains: The chains of actions to apply to each text.
+        :type chains: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The results of apply_chains for each text, in the order of
+                    the texts.
+        :rtype: list
+        """
+
+        return [apply_chains(text, chains, options) for text in texts]
+
+    def start(self):
+        """Starts this executor, nothing to start here."""
+
+        pass
+
+    def close(self):
+        """Releases the resources held by this executor, none here."""
+
+        pass
+
+
+"""The actions of a pool worker process, by name."""
+_worker_actions = {}
+
+
+def _init_worker(actions):
+    """Initializes a pool worker process with the given actions.
+
+    The worker is forked from a parent which already loaded the models of
+    the actions, so it shares them instead of loading its own copy.
+
+    :param actions: The actions the worker applies.
+    :type actions: list
+    """
+
+    for action in actions:
+
+        _worker_actions[action.name] = action
+
+
+def _ping_worker():
+    """Does nothing in a pool worker process, but makes the pool start it.
+
+    :return: The id of the worker process.
+    :rtype: int
+    """
+
+    return os.getpid()
+
+
+def _apply_in_worker(text, action_names, options, start, memoize):
+    """Applies the named actions to the given text in a pool worker process.
+
+    :param text: The text to apply the actions to.
+    :type text: str
+    :param action_names: The names of the actions to apply to the text.
+    :type action_names: list
+    :param options: The options the request set for the actions, by name.
+    :type options: dict
+    :param start: The stage to resume from, as taken by resume_actions.
+    :type start: dict, list
+    :param memoize: Whether to record the content produced by memoized
+                actions in the context's stages.
+    :type memoize: bool
+    :return: The final content produced, and the context it was produced in.
+    :rtype: dict, ExecutionContext
+    """
+
+    return resume_actions(
+        text,
+        [_worker_actions[name] for name in action_names],
+        options,
+        start,
+        memoize)
+
+
+def _apply_chains_in_worker(text, chain_names, options):
+    """Applies each of the named chains of actions to the given text in a
+    pool worker process.
+
+    :param text: The text to apply the chains to.
+    :type text: str
+    :param chain_names: The names of the actions of each chain.
+    :type chain_names: list
+    :param options: The options the request set for the actions, by name.
+    :type options: dict
+    :return: The results of apply_chains.
+    :rtype: list
+    """
+
+    return apply_chains(
+        text,
+        [
+            [_worker_actions[name] for name in action_names]
+            for action_names
+            in chain_names
+        ],
+        options)
+
+
+class PoolExecutor:
+
+    def __init__(
+            self,
+            actions,
+            processes=None,
+            max_tasks_per_child=None,
+            inline_threshold=1000,
+            shard_size=None):
+        """Constructor
+
+        :param actions: The actions the worker processes may apply, their
+                    models loaded in this process so forked workers share
+                    them.
+        :type actions: list
+        :param processes: The number of worker processes, the number of cpus
+                    if None.
+        :type processes: int
+        :param max_tasks_per_child: The number of chains a worker process
+                    applies, on average, before the pool is replaced by a
+                    fresh one; never replaced if None.
+        :type max_tasks_per_child: int
+        :param inline_threshold: Texts shorter than this many characters
+                    are processed inline, sending them to a worker would
+                    cost more than processing them.
+        :type inline_threshold: int
+        :param shard_size: Texts longer than this many characters are split
+                    at sentence boundaries into shards of about this size,
+                    processed in parallel through the sentence-local
+                    actions at the start of a chain; never split if None.
+        :type shard_size: int
+        """
+
+        self.__actions = actions
+
+        self.__shard_size = shard_size
+
+        self.__sentence_extraction = None
+
+        if shard_size is not None:
+
+            # Imported only when sharding, as it imports nltk.
+            from action.sentence_extraction import SentenceExtraction
+
+            self.__sentence_extraction = SentenceExtraction()
+
+        self.__processes = processes or os.cpu_count()
+
+        self.__max_tasks_per_child = max_tasks_per_child
+
+        self.__inline_threshold = inline_threshold
+
+        self.__pool = None
+
+        self.__pool_pid = None
+
+        self.__pool_tasks = 0
+
+        # Reentrant, so a task is submitted to the pool while holding it,
+        # before another thread may replace and shut down that pool.
+        self.__pool_lock = threading.RLock()
+
+    @property
+    def started(self):
+        """Whether the worker processes of this executor were started in the
+        current process.
+        """
+
+        return self.__pool is not None and self.__pool_pid == os.getpid()
+
+    def run(self, text, actions, options=None):
+        """Applies the given actions to the given text in a worker process,
+        or inline if the text is short.
+
+        :param text: The text to apply the actions to.
+        :type text: str
+        :param actions: The actions to apply to the text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The final content produced, and the context it was produced
+                    in.
+        :rtype: dict, ExecutionContext
+        """
+
+        return self.map([text], actions, options)[0]
+
+    def map(self, texts, actions, options=None, starts=None, memoize=False):
+        """Applies the given actions to each of the given texts, spreading
+        them across the worker processes. Short texts are processed inline
+        while the workers process the others.
+
+        :param texts: The texts to apply the actions to.
+        :type texts: list
+        :param actions: The actions to apply to each text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :param starts: The stage to resume from for each text, as taken by
+                    resume_actions, from the texts if None.
+        :type starts: list
+        :param memoize: Whether to record the content produced by memoized
+                    actions in the contexts' stages.
+        :type memoize: bool
+        :return: The final content produced for each text, and the context
+                    it was produced in, in the order of the texts.
+        :rtype: list
+        """
+
+        # Everything is submitted before waiting on anything, so the texts
+        # are processed in parallel.
+        if starts is None:
+
+            starts = [None] * len(texts)
+
+        jobs = [
+            self.__submit_job(text, actions, options, start, memoize)
+            for text, start
+            in zip(texts, starts)
+        ]
+
+        return [
+            self.__gather_job(text, actions, options, start, memoize, job)
+            for text, start, job
+            in zip(texts, starts, jobs)
+        ]
+
+    def map_chains(self, texts, chains, options=None):
+        """Applies each of the given chains of actions to each of the given
+        texts, spreading the texts across the worker processes. Short texts
+        are processed inline while the workers process the others.
+
+        :param texts: The texts to apply the chains to.
+        :type texts: list
+        :param chains: The chains of actions to apply to each text.
+        :type chains: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The results of apply_chains for each text, in the order of
+                    the texts.
+        :rtype: list
+        """
+
+        chain_names = [
+            [action.name for action in actions]
+            for actions
+            in chains
+        ]
+
+        submissions = [
+            None
+            if self.__stays_inline(text)
+            else self.__submit_task(
+                _apply_chains_in_worker, text, chain_names, options)
+            for text
+            in texts
+        ]
+
+        results = []
+
+        for text, submission in zip(texts, submissions):
+
+            if submission is None:
+
+                results.append(apply_chains(text, chains, options))
+
+                continue
+
+            text_results = self.__wait(*submission)
+
+            if text_results is None:
+
+                text_results = []
+
+                for actions in chains:
+
+                    context = ExecutionContext(options)
+
+                    context.status = ExecutionContext.ERROR
+
+                    text_results.append((text, context))
+
+            results.append(text_results)
+
+        return results
+
+    def start(self):
+        """Starts the worker processes ahead of the first request, so they
+        are warm when it comes. A pool only forks its workers once given
+        tasks, so each is given one and waited for, before any thread
+        serving requests exists.
+        """
+
+        pool = self.__gather_pool()
+
+        futures = [
+            pool.submit(_ping_worker)
+            for index
+            in range(self.__processes)
+        ]
+
+        for future in futures:
+
+            future.result()
+
+    def close(self):
+        """Terminates the worker processes, if any were started."""
+
+        with self.__pool_lock:
+
+            if self.started:
+
+                self.__pool.shutdown(wait=True)
+
+            self.__pool = None
+
+    def __gather_pool(self, for_task=False):
+        """Gathers the pool of worker processes, starting it on first use.
+
+        The pool is started lazily, and again in each forked server worker,
+        since a pool can't be shared across a fork. Once its workers applied
+        max_tasks_per_child chains on average, it is replaced by a fresh
+        pool, forked from this still warm process.
+
+        :param for_task: Whether the pool is gathered to submit a chain to,
+                    counting towards max_tasks_per_child.
+        :type for_task: bool
+        :return: The pool of worker processes.
+        :rtype: concurrent.futures.ProcessPoolExecutor
+        """
+
+        with self.__pool_lock:
+
+            if (
+                    self.started and
+                    self.__max_tasks_per_child is not None and
+                    self.__pool_tasks >=
+                    self.__max_tasks_per_child * self.__processes):
+
+                logging.debug('Replacing the worker process pool.')
+
+                # Chains already submitted still complete.
+                self.__pool.shutdown(wait=False)
+
+                self.__pool = None
+
+            if not self.started:
+
+                logging.debug('Starting the worker process pool.')
+
+                # Forking, whatever the platform default, is what lets
+                # workers share the parent's models instead of each
+                # unpickling a copy of them.
+                self.__pool = ProcessPoolExecutor(
+                    max_workers=self.__processes,
+                    mp_context=multiprocessing.get_context('fork'),
+                    initializer=_init_worker,
+                    initargs=(self.__actions,))
+
+                self.__pool_pid = os.getpid()
+
+                self.__pool_tasks = 0
+
+            if for_task:
+
+                self.__pool_tasks += 1
+
+            return self.__pool
+
+    def __stays_inline(self, text):
+        """Determines whether the given text is processed inline, sending it
+        to a worker would cost more than processing it.
+
+        :param text: The text to process.
+        :type text: str
+        :return: True if the text is processed inline.
+        :rtype: bool
+        """
+
+        return (
+            not isinstance(text, str) or
+            len(text) < self.__inline_threshold
+        )
+
+    def __submit_job(self, text, actions, options, start, memoize):
+        """Submits the given actions to apply to the given text to the worker
+        processes, in shards if the text is long enough.
+
+        :param text: The text to apply the actions to.
+        :type text: str
+        :param actions: The actions to apply to the text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :param start: The stage to resume from, as taken by resume_actions.
+        :type start: dict, list
+        :param memoize: Whether to record the content produced by memoized
+                    actions in the context's stages.
+        :type memoize: bool
+        :return: None if the text stays inline, otherwise the number of
+                    actions submitted, the offset each shard starts at in
+                    the text and the submission of each shard.
+        :rtype: int, list, list
+        """
+
+        if self.__stays_inline(text):
+
+            return None
+
+        prefix_length = 0
+
+        while (
+                prefix_length < len(actions) and
+                actions[prefix_length].SENTENCE_LOCAL):
+
+            prefix_length += 1
+
+        shards = [(0, text)]
+
+        if (
+                self.__shard_size is not None and
+                start is None and
+                prefix_length > 0 and
+                len(text) > self.__shard_size):
+
+            shards = self.__gather_shards(text)
+
+        action_names = [action.name for action in actions]
+
+        if len(shards) == 1:
+
+            return len(actions), [0], [
+                self.__submit(text, action_names, options, start, memoize)
+            ]
+
+        return prefix_length, [offset for offset, shard in shards], [
+            self.__submit(
+                shard,
+                action_names[:prefix_length],
+                options,
+                memoize=memoize)
+            for offset, shard
+            in shards
+        ]
+
+    def __gather_job(self, text, actions, options, start, memoize, job):
+        """Gathers the result of a job submitted to the worker processes,
+        merging the results of its shards and applying the rest of the chain
+        to them.
+
+        :param text: The text the actions were applied to.
+        :type text: str
+        :param actions: The actions to apply to the text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :param start: The stage to resume from, as taken by resume_actions.
+        :type start: dict, list
+        :param memoize: Whether to record the content produced by memoized
+                    actions in the context's stages.
+        :type memoize: bool
+        :param job: The job submitted, as returned by __submit_job.
+        :type job: int, list, list
+        :return: The final content produced, and the context it was produced
+                    in.
+        :rtype: dict, ExecutionContext
+        """
+
+        if job is None:
+
+            return resume_actions(text, actions, options, start, memoize)
+
+        prefix_length, offsets, submissions = job
+
+        results = [
+            self.__gather_result(submission)
+            for submission
+            in submissions
+        ]
+
+        if len(results) == 1:
+
+            return results[0]
+
+        for content, context in results:
+
+            if context.status == ExecutionContext.ERROR:
+
+                return content, context
+
+        if not all(
+                context.status == ExecutionContext.OK
+                for content, context
+                in results):
+
+            # Rare enough to simply apply the whole chain as a single text,
+            # so the outcome is exactly the one a serial run gives.
+            logging.warning(
+                'A shard failed, applying the actions to the whole text.')
+
+            return resume_actions(text, actions, options, memoize=memoize)
+
+        content = merge_shards(
+            [content for content, context in results],
+            text,
+            offsets)
+
+        context = ExecutionContext(options)
+
+        context.history = list(results[0][1].history)
+
+        # Each stage of a shard is only part of the text's.
+        for shard_stages in zip(*[
+                shard_context.stages
+                for shard_content, shard_context
+                in results]):
+
+            context.stages.append((
+                merge_shards(
+                    [
+                        stage_content
+                        for stage_content, stage_history
+                        in shard_stages
+                    ],
+                    text,
+                    offsets),
+                shard_stages[0][1]))
+
+        if (
+                memoize and
+                prefix_length < len(actions) and
+                actions[prefix_length - 1].MEMOIZED):
+
+            context.stages.append((dict(content), list(context.history)))
+
+        return apply_actions(
+            text,
+            actions[prefix_length:],
+            options,
+            content,
+            context,
+            memoize)
+
+    def __gather_shards(self, text):
+        """Splits the given text at sentence boundaries into shards of about
+        shard_size characters.
+
+        :param text: The text to split.
+        :type text: str
+        :return: The offset each shard starts at in the text, and the shard,
+                    in order.
+        :rtype: list
+        """
+
+        sentences = self.__sentence_extraction.apply(text)[
+            AbstractAction.RESULT]
+
+        shards = []
+
+        shard_start = None
+
+        for sentence_start, sentence_end in sentences.spans():
+
+            if shard_start is None:
+
+                shard_start = sentence_start
+
+            if sentence_end - shard_start >= self.__shard_size:
+
+                shards.append((shard_start, text[shard_start:sentence_end]))
+
+                shard_start = None
+
+        if shard_start is not None:
+
+            shards.append((shard_start, text[shard_start:sentence_end]))
+
+        return shards or [(0, text)]
+
+    def __submit(self, text, action_names, options, start=None, memoize=False):
+        """Submits the named actions to apply to the given text to a worker
+        process.
+
+        :param text: The text to apply the actions to.
+        :type text: str
+        :param action_names: The names of the actions to apply to the text.
+        :type action_names: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :param start: The stage to resume from, as taken by resume_actions.
+        :type start: dict, list
+        :param memoize: Whether to record the content produced by memoized
+                    actions in the context's stages.
+        :type memoize: bool
+        :return: The text, the pool it was submitted to and the future
+                    result.
+        :rtype: str, concurrent.futures.ProcessPoolExecutor, concurrent.futures.Future
+        """
+
+        pool, future = self.__submit_task(
+            _apply_in_worker,
+            text,
+            action_names,
+            options,
+            start,
+            memoize)
+
+        return text, pool, future
+
+    def __submit_task(self, function, *args):
+        """Submits a call of the given function to a worker process.
+
+        :param function: The function to call.
+        :type function: function
+        :param args: The arguments to call it with.
+        :type args: list
+        :return: The pool it was submitted to and the future result.
+        :rtype: concurrent.futures.ProcessPoolExecutor, concurrent.futures.Future
+        """
+
+        with self.__pool_lock:
+
+            pool = self.__gather_pool(for_task=True)
+
+            try:
+
+                future = pool.submit(function, *args)
+
+            except BrokenProcessPool as e:
+
+                future = Future()
+
+                future.set_exception(e)
+
+        return pool, future
+
+    def __gather_result(self, submission):
+        """Gathers the result of applying actions to a text in a worker
+        process.
+
+        :param submission: The text, the pool the actions were submitted to
+                    and the future result.
+        :type submission: str, concurrent.futures.ProcessPoolExecutor, concurrent.futures.Future
+        :return: The final content produced, and the context it was produced
+                    in.
+        :rtype: dict, ExecutionContext
+        """
+
+        text, pool, future = submission
+
+        result = self.__wait(pool, future)
+
+        if result is None:
+
+            context = ExecutionContext()
+
+            context.status = ExecutionContext.ERROR
+
+            result = text, context
+
+        return result
+
+    def __wait(self, pool, future):
+        """Waits for the result of a task submitted to a worker process.
+
+        :param pool: The pool the task was submitted to.
+        :type pool: concurrent.futures.ProcessPoolExecutor
+        :param future: The future result.
+        :type future: concurrent.futures.Future
+        :return: The result, None if the worker process died.
+        :rtype: *
+        """
+
+        try:
+
+            return future.result()
+
+        except BrokenProcessPool as e:
+
+            # A worker died mid-task, e.g. killed for running out of memory.
+            logging.error('A worker process died while applying actions!')
+
+            logging.error(e)
+
+            self.__discard_pool(pool)
+
+            return None
+
+    def __discard_pool(self, pool):
+        """Discards the given broken pool, a fresh one is started for the
+        next chain.
+
+        :param pool: The broken pool.
+        :type pool: concurrent.futures.ProcessPoolExecutor
+        """
+
+        with self.__pool_lock:
+
+            if self.__pool is pool:
+
+                self.__pool = None
+
+        pool.shutdown(wait=False)
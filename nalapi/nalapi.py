@@ -1,64 +1,350 @@
 """Accepts REST requests via Bottle for processing text, returns the results
 as json responses.
 """
+import importlib
 import json
 import logging
+import threading
+import time
 
 from bottle import Bottle
+from bottle import HTTPError
 from bottle import request
 from bottle import response
 
 from action.abstract_action import AbstractAction
-from action.sentence_extraction import SentenceExtraction
-from action.word_extraction import WordExtraction
-from action.word_pos_tagging import WordPosTagging
-from action.phrase_extraction import PhraseExtraction
-from action.named_entity_extraction import NamedEntityExtraction
-from action.frequency_calculation import FrequencyCalculation
-from action.unique_filtering import UniqueFiltering
-from action.content_reversal import ContentReversal
-from action.consolidation import Consolidation
-from action.sentiment_calculation import SentimentCalculation
+from action.execution_context import ExecutionContext
+from action.token_stream import TokenStream
+from executor import InlineExecutor
+from executor import PoolExecutor
+from executor import apply_chains
+from pipeline import InvalidPipeline
+from pipeline import PipelineCompiler
+from request_body import InvalidBody
+from request_body import gather_decompressor
+from request_body import read_body
+from request_body import read_lines
+from response_encoding import GZIP
+from response_encoding import accepts_gzip
+from response_encoding import compress
+from response_encoding import encode
+from response_encoding import negotiate
+from result_cache import ResultCache
 
 
 class nalapi(Bottle):
 
     TEXT = 'text'
+    STATUS = 'status'
+    CHAINS = 'chains'
+    ORIGINAL = 'original'
+    AGGREGATE = 'aggregate'
+    PRETTY = 'pretty'
+    COLUMNS = 'columns'
+    OFFSETS = 'offsets'
+    FIELDS = 'fields'
+    FAILED = 'failed'
+    ERROR = 'error'
     CONTENT_TYPE = 'Content-Type'
-
-    def __init__(self):
+    CONTENT_ENCODING = 'Content-Encoding'
+    ACCEPT = 'Accept'
+    ACCEPT_ENCODING = 'Accept-Encoding'
+    VARY = 'Vary'
+    JSON = 'application/json'
+    PLAIN_TEXT = 'text/plain'
+    NDJSON = 'application/x-ndjson'
+    MULTI_STATUS = 207
+    BAD_REQUEST = 400
+    SERVICE_UNAVAILABLE = 503
+
+    """The module and class of the action to take when a given url path
+    section is encountered. Only the modules of enabled actions are
+    imported, along with their dependencies."""
+    ACTIONS = {
+        'snt': ('action.sentence_extraction', 'SentenceExtraction'),
+        'word': ('action.word_extraction', 'WordExtraction'),
+        'pos': ('action.word_pos_tagging', 'WordPosTagging'),
+        'phrs': ('action.phrase_extraction', 'PhraseExtraction'),
+        'ne': ('action.named_entity_extraction', 'NamedEntityExtraction'),
+        'freq': ('action.frequency_calculation', 'FrequencyCalculation'),
+        'unq': ('action.unique_filtering', 'UniqueFiltering'),
+        'rev': ('action.content_reversal', 'ContentReversal'),
+        'cnsl': ('action.consolidation', 'Consolidation'),
+        'sntmnt': ('action.sentiment_calculation', 'SentimentCalculation')
+    }
+
+    # The fields of the content returned for a text a request may choose
+    # from, all of them by default.
+    FIELD_NAMES = (
+        AbstractAction.ACTION,
+        AbstractAction.RESULT,
+        AbstractAction.HISTORY,
+        ORIGINAL
+    )
+
+    # The number of texts processed at once when aggregating, enough to
+    # keep the workers busy without keeping every result in memory.
+    AGGREGATE_CHUNK_SIZE = 64
+
+    # The number of streamed documents processed at once with worker
+    # processes, enough to keep them busy while results are written as
+    # they come.
+    STREAM_CHUNK_SIZE = 16
+
+    # Where the payload of a request is kept once read, so its body is only
+    # read and parsed once.
+    PAYLOAD = 'nalapi.payload'
+
+    # A tiny text, and chains applying every action to it, run once at
+    # startup so the first requests don't pay for anything left lazy.
+    WARM_UP_TEXT = 'Mr. Smith went to Paris. He loved it!'
+    WARM_UP_CHAINS = [
+        'word/pos/ne/freq',
+        'word/pos/phrs/unq',
+        'word/pos/cnsl/rev',
+        'snt/sntmnt'
+    ]
+
+    def __init__(
+            self,
+            processes=0,
+            max_tasks_per_child=None,
+            inline_threshold=1000,
+            shard_size=None,
+            cache_size=64 * 2**20,
+            cache_ttl=300,
+            stage_cache_size=32 * 2**20,
+            stage_cache_ttl=60,
+            actions=None,
+            max_body_size=32 * 2**20,
+            compress_size=1024):
         """Constructor
+
+        :param processes: The number of worker processes to apply actions
+                    in, one per cpu if None, or 0 to apply them in the
+                    thread serving the request.
+        :type processes: int
+        :param max_tasks_per_child: The number of chains a worker process
+                    applies, on average, before the worker processes are
+                    replaced, never replaced if None.
+        :type max_tasks_per_child: int
+        :param inline_threshold: Texts shorter than this many characters are
+                    processed in the thread serving the request even when
+                    worker processes are used.
+        :type inline_threshold: int
+        :param shard_size: Texts longer than this many characters are split
+                    into shards of whole sentences, processed in parallel by
+                    the worker processes; never split if None.
+        :type shard_size: int
+        :param cache_size: The number of bytes the results cached for
+                    repeated payloads may take at most, nothing cached if 0.
+        :type cache_size: int
+        :param cache_ttl: The number of seconds a result stays cached,
+                    forever if None.
+        :type cache_ttl: float
+        :param stage_cache_size: The number of bytes the intermediate
+                    stages memoized for later chains on the same text, e.g.
+                    its words or pos tags, may take at most, nothing
+                    memoized if 0.
+        :type stage_cache_size: int
+        :param stage_cache_ttl: The number of seconds a stage stays
+                    memoized, forever if None.
+        :type stage_cache_ttl: float
+        :param actions: The names of the actions to enable, every action if
+                    None.
+        :type actions: list
+        :param max_body_size: The number of bytes a request body may take at
+                    most, both as sent and once decompressed. Larger bodies
+                    are answered with a 413. For a stream, each line may
+                    take this many bytes, however long the stream.
+        :type max_body_size: int
+        :param compress_size: Responses of at least this many bytes are
+                    compressed with gzip, for requests accepting it; never
+                    compressed if None.
+        :type compress_size: int
+        :raises ValueError: If an action name is unknown.
         """
 
         super(nalapi, self).__init__()
 
         logging.debug('Starting nalapi')
 
-        """The actions to take when a given url path section is encountered."""
+        if actions is None:
+
+            actions = list(self.ACTIONS)
+
+        unknown_actions = set(actions) - set(self.ACTIONS)
+
+        if unknown_actions:
+
+            raise ValueError(
+                f'Unknown actions: {", ".join(sorted(unknown_actions))}')
+
+        """The actions to take when a given url path section is encountered.
+        Each loads its models as it is constructed."""
         self.__actions = [
-            SentenceExtraction(),
-            WordExtraction(),
-            WordPosTagging(),
-            PhraseExtraction(),
-            NamedEntityExtraction(),
-            FrequencyCalculation(),
-            UniqueFiltering(),
-            ContentReversal(),
-            Consolidation(),
-            SentimentCalculation()
+            self.__load_action(name)
+            for name
+            in self.ACTIONS
+            if name in actions
         ]
 
+        if processes == 0:
+
+            self.__executor = InlineExecutor()
+
+        else:
+
+            self.__executor = PoolExecutor(
+                self.__actions,
+                processes=processes,
+                max_tasks_per_child=max_tasks_per_child,
+                inline_threshold=inline_threshold,
+                shard_size=shard_size)
+
+        self.__result_cache = ResultCache(cache_size, cache_ttl)
+
+        self.__stage_cache = ResultCache(stage_cache_size, stage_cache_ttl)
+
+        self.__max_body_size = max_body_size
+
+        self.__compress_size = compress_size
+
         self.__url_shortcuts = {
             'ne': 'word/pos/ne',
             'phrs': 'word/pos/phrs',
             'pos': 'word/pos'
         }
 
+        self.__pipelines = PipelineCompiler(
+            self.__actions, self.__url_shortcuts)
+
+        # An event, as Bottle doesn't let attributes of an app be set twice.
+        self.__ready = threading.Event()
+
         self.route('/help', callback=self.help)
 
+        self.route('/cache', callback=self.cache)
+
+        self.route('/ready', callback=self.ready)
+
+        self.route('/chains', callback=self.process_chains)
+
+        self.route(
+            '/stream/:url#.+#',
+            method=['GET', 'POST'],
+            callback=self.process_stream)
+
         """Ensures all other url paths are redirected to self.process"""
         self.route('/:url#.+#', callback=self.process)
 
+    def __load_action(self, name):
+        """Imports the module of the named action, and constructs it.
+
+        :param name: The name of the action.
+        :type name: str
+        :return: The action.
+        :rtype: AbstractAction sub-class
+        """
+
+        module_name, class_name = self.ACTIONS[name]
+
+        return getattr(importlib.import_module(module_name), class_name)()
+
+    def warm_up(self):
+        """Applies the warm up chains to the warm up text, so anything the
+        actions still load lazily is loaded before the first request, then
+        reports this app as ready.
+
+        Meant to be called once, before any fork, so the forked processes
+        are warm as well.
+
+        :return: True if every warm up chain was applied without error.
+        :rtype: bool
+        """
+
+        start = time.perf_counter()
+
+        chains = []
+
+        for chain in self.WARM_UP_CHAINS:
+
+            url_parts = chain.split('/')
+
+            # The longest start of the chain whose actions are all enabled.
+            while url_parts:
+
+                try:
+
+                    actions = self.__gather_actions('/'.join(url_parts))
+
+                except InvalidPipeline:
+
+                    url_parts.pop()
+
+                    continue
+
+                if actions not in chains:
+
+                    chains.append(actions)
+
+                break
+
+        results = apply_chains(self.WARM_UP_TEXT, chains)
+
+        for actions, (content, context) in zip(chains, results):
+
+            if context.status == ExecutionContext.ERROR:
+
+                logging.error(
+                    'Warming up ' +
+                    '/'.join(action.name for action in actions) +
+                    ' failed!')
+
+                return False
+
+        logging.info(f'Warmed up in {time.perf_counter() - start:.3f}s')
+
+        self.__ready.set()
+
+        return True
+
+    def ready(self):
+        """Reports whether this app is warmed up, ready for requests.
+
+        :return: The response, with a 200 status once warmed up, 503 until
+                    then.
+        :rtype: str
+        """
+
+        if not self.__ready.is_set():
+
+            response.status = self.SERVICE_UNAVAILABLE
+
+            return 'Warming up.'
+
+        return 'Ready.'
+
+    def start_workers(self):
+        """Starts the worker processes actions are applied in, if any. The
+        actions loaded their models when constructed, so the workers
+        forked from this process share them.
+
+        Meant to be called in each serving process, after any fork, so the
+        workers are warm by the first request.
+        """
+
+        self.__executor.start()
+
+    def close(self):
+        """Closes the app, terminating the worker processes actions are
+        applied in, if any.
+        """
+
+        self.__executor.close()
+
+        super(nalapi, self).close()
+
     def help(self):
         """Provides helpful info for using nalapi.
 
@@ -85,6 +371,20 @@ Not all endpoints are usable on their own, more info on which are/aren't along w
 https://nlp-api.readthedocs.io/en/latest/usage.html
         '''
 
+    def cache(self):
+        """Reports statistics about the results cached for repeated
+        payloads, and the stages memoized for later chains.
+
+        :return: The number of hits, misses, entries and bytes cached, and
+                    the maximum number of bytes, of each cache.
+        :rtype: dict
+        """
+
+        return {
+            'results': self.__result_cache.stats(),
+            'stages': self.__stage_cache.stats()
+        }
+
     def process(self, url):
         """Processes an incoming REST request.
 
@@ -98,56 +398,435 @@ https://nlp-api.readthedocs.io/en/latest/usage.html
 
         url = url.lower()
 
-        return_msg = ''
-
         text = self.__gather_text()
 
-        actions = self.__gather_actions(url)
+        try:
 
-        if text and actions:
+            actions = self.__gather_actions(url)
 
-            # This might not be a great idea. The text may be VERY long.
-            logging.debug(f'Processing {text} via {actions}')
+        except InvalidPipeline as e:
 
-            if isinstance(text, list):
+            logging.warning(f'Invalid url path: {e}')
 
-                content = [
-                    self.__apply_actions(item, actions)
-                    for item
-                    in text
-                ]
+            return self.__respond_bad_request(e)
 
-            else:
+        options = self.__gather_options(actions)
+
+        try:
+
+            layout = self.__gather_layout()
 
-                content = self.__apply_actions(text, actions)
+        except ValueError as e:
 
-            if response.status_code == 200:
+            logging.warning(f'Invalid fields: {e}')
 
-                test_content = content[0] if isinstance(
-                    content, list) else content
+            return self.__respond_bad_request(e)
 
-                if len(
-                        test_content[AbstractAction.HISTORY]) != [
-                        outcome for action,
-                        outcome in test_content[AbstractAction.HISTORY]].count(
-                        AbstractAction.SUCCESS):
+        if not text:
 
-                    response.status = 409
+            return self.__respond_bad_request()
 
-                response.headers[self.CONTENT_TYPE] = 'application/json'
+        if isinstance(text, list) and self.__gather_aggregate():
 
-                return_msg = json.dumps(content, indent=4)
+            if not actions[-1].REDUCIBLE:
+
+                return self.__respond_bad_request(
+                    f'{actions[-1].name} results can\'t be aggregated.')
+
+            content, status = self.__aggregate(text, actions, options)
+
+            return self.__respond(
+                self.__lay_out(content, None, actions[-1], layout),
+                status)
+
+        # This might not be a great idea. The text may be VERY long.
+        logging.debug(f'Processing {text} via {actions}')
+
+        if isinstance(text, list):
+
+            results = self.__apply_actions(text, actions, options)
+
+            content = [
+                self.__gather_item_content(
+                    item, item_content, context, actions[-1], layout)
+                for item, (item_content, context)
+                in zip(text, results)
+            ]
+
+            # Each item carries its own status, the batch is only a
+            # success if every item is.
+            if all(
+                    context.status == ExecutionContext.OK
+                    for item_content, context
+                    in results):
+
+                status = ExecutionContext.OK
 
             else:
 
-                return_msg = 'Error while processing text with path.'
+                status = self.MULTI_STATUS
+
+        else:
+
+            content, context = self.__apply_actions(
+                [text], actions, options)[0]
+
+            content = self.__lay_out(content, text, actions[-1], layout)
+
+            status = context.status
+
+        return self.__respond(content, status)
+
+    def process_chains(self):
+        """Processes an incoming REST request applying several chains of
+        actions to the same text, e.g. word/pos/ne/freq and snt/sntmnt.
+        Actions shared by the start of several chains are applied once.
+
+        :return: The response, the content produced by each chain keyed by
+                    the chain.
+        :rtype: str
+        """
+
+        logging.info('Processing chains')
+
+        text = self.__gather_text()
+
+        try:
+
+            paths, chains = self.__gather_chains()
+
+        except (KeyError, TypeError, ValueError) as e:
+
+            logging.warning(f'Invalid chains: {e}')
+
+            return self.__respond_bad_request(e)
+
+        options = self.__gather_options([
+            action
+            for actions in chains
+            for action in actions
+        ])
+
+        try:
+
+            layout = self.__gather_layout()
+
+        except ValueError as e:
+
+            logging.warning(f'Invalid fields: {e}')
+
+            return self.__respond_bad_request(e)
+
+        if not text:
+
+            return self.__respond_bad_request()
+
+        texts = text if isinstance(text, list) else [text]
+
+        contents = []
+
+        statuses = []
+
+        for item, item_results in zip(
+                texts,
+                self.__apply_chains(texts, chains, options)):
+
+            item_content, item_status = self.__gather_chains_content(
+                item, paths, chains, item_results, layout)
+
+            contents.append(item_content)
+
+            statuses.append(item_status)
+
+        if isinstance(text, list):
+
+            for item_content, item_status in zip(contents, statuses):
+
+                item_content[self.STATUS] = item_status
+
+            content = contents
+
+            status = ExecutionContext.OK
+
+            if any(
+                    item_status != ExecutionContext.OK
+                    for item_status
+                    in statuses):
+
+                status = self.MULTI_STATUS
 
         else:
 
-            response.status = 400
+            content = contents[0]
+
+            status = statuses[0]
+
+        return self.__respond(content, status)
+
+    def process_stream(self, url):
+        """Processes an incoming REST request whose body holds a json
+        document on each line, each with a text and any options for the
+        actions, as a batch streamed in and out: a json line is written for
+        each document as soon as its chunk of documents is processed.
+
+        :param url: The url used when making the request, after /stream.
+        :type url: str
+        :return: The response, the result of each document on its own line,
+                    in order.
+        :rtype: generator or str
+        """
+
+        logging.info(f'Processing stream: {url}')
+
+        try:
+
+            actions = self.__gather_actions(url.lower())
+
+        except InvalidPipeline as e:
+
+            logging.warning(f'Invalid url path: {e}')
+
+            return self.__respond_bad_request(e)
+
+        lines = self.__read_lines()
+
+        response.headers[self.CONTENT_TYPE] = self.NDJSON
+
+        return self.__stream_results(lines, actions)
+
+    def __stream_results(self, lines, actions):
+        """Applies the given actions to the document on each of the given
+        lines, a chunk of documents at a time.
+
+        :param lines: The lines of json documents.
+        :type lines: iterable
+        :param actions: The actions to apply to each document's text.
+        :type actions: list
+        :return: The json line of each document's result.
+        :rtype: generator
+        """
+
+        chunk_size = self.STREAM_CHUNK_SIZE
+
+        if isinstance(self.__executor, InlineExecutor):
+
+            # Nothing to process in parallel, each result is written as
+            # soon as it is known.
+            chunk_size = 1
+
+        chunk = []
+
+        try:
+
+            for line in lines:
+
+                if isinstance(line, InvalidBody):
+
+                    logging.warning(f'Invalid document: {line}')
+
+                    yield from self.__stream_chunk(chunk, actions)
+
+                    chunk = []
+
+                    yield self.__encode_line(
+                        {self.STATUS: line.status, self.ERROR: str(line)})
+
+                    continue
+
+                if not line.strip():
+
+                    continue
+
+                try:
+
+                    text, options, layout = self.__gather_document(
+                        line, actions)
+
+                except ValueError as e:
+
+                    logging.warning(f'Invalid document: {e}')
+
+                    yield from self.__stream_chunk(chunk, actions)
+
+                    chunk = []
+
+                    yield self.__encode_line(
+                        {self.STATUS: self.BAD_REQUEST, self.ERROR: str(e)})
+
+                    continue
+
+                # Documents are processed together only if they share
+                # options.
+                if chunk and (
+                        len(chunk) == chunk_size or
+                        options != chunk[0][1]):
+
+                    yield from self.__stream_chunk(chunk, actions)
+
+                    chunk = []
+
+                chunk.append((text, options, layout))
+
+        except InvalidBody as e:
+
+            # The status is already sent, the documents read so far are
+            # answered and the rest of the body is reported on its own line.
+            logging.warning(f'Invalid body: {e}')
+
+            yield from self.__stream_chunk(chunk, actions)
+
+            chunk = []
+
+            yield self.__encode_line(
+                {self.STATUS: e.status, self.ERROR: str(e)})
+
+        yield from self.__stream_chunk(chunk, actions)
+
+    def __stream_chunk(self, chunk, actions):
+        """Applies the given actions to the text of each of the given
+        documents.
+
+        :param chunk: The text, options and layout of each document.
+        :type chunk: list
+        :param actions: The actions to apply to each text.
+        :type actions: list
+        :return: The json line of each document's result.
+        :rtype: generator
+        """
+
+        if not chunk:
+
+            return
+
+        texts = [text for text, options, layout in chunk]
+
+        results = self.__apply_actions(texts, actions, chunk[0][1])
+
+        for (text, options, layout), (content, context) in zip(chunk, results):
+
+            yield self.__encode_line(self.__gather_item_content(
+                text, content, context, actions[-1], layout))
+
+    def __encode_line(self, content):
+        """Encodes the given content as a line of json.
+
+        :param content: The content to encode.
+        :type content: dict
+        :return: The line.
+        :rtype: bytes
+        """
+
+        return encode(content, self.JSON, self.__encode) + b'\n'
+
+    def __gather_document(self, line, actions):
+        """Gathers the text of the json document on the given line, either
+        a string or an object with a text, and the options it sets for the
+        given actions.
+
+        :param line: The line.
+        :type line: bytes
+        :param actions: The actions to gather options for.
+        :type actions: list
+        :return: The text, the options set, by name, and the layout asked
+                    for, as __gather_layout gives it.
+        :rtype: str, dict, tuple
+        :raises ValueError: If the line doesn't hold such a document.
+        """
+
+        document = json.loads(line)
+
+        if isinstance(document, str):
+
+            document = {self.TEXT: document}
+
+        if not isinstance(document, dict) or not document.get(self.TEXT):
+
+            raise ValueError('Each line must be a json text, or an object ' +
+                             'with a text.')
+
+        options = {
+            option: document[option]
+            for action in actions
+            for option in action.OPTIONS
+            if option in document
+        }
+
+        return document[self.TEXT], options, self.__gather_layout(document)
+
+    def __respond(self, content, status):
+        """Gathers the response for the given content.
+
+        :param content: The content to respond with.
+        :type content: dict or list
+        :param status: The http status to respond with.
+        :type status: int
+        :return: The response, in the format the request accepts,
+                    compressed if large enough.
+        :rtype: str or bytes
+        """
+
+        # The status is only set here, once the whole request is processed.
+        response.status = status
+
+        if status == ExecutionContext.ERROR:
+
+            return 'Error while processing text with path.'
+
+        media_type = negotiate(request.headers.get(self.ACCEPT))
+
+        payload = self.__gather_payload()
+
+        pretty = isinstance(payload, dict) and payload.get(self.PRETTY) is True
+
+        body = encode(content, media_type, self.__encode, pretty=pretty)
+
+        response.headers[self.CONTENT_TYPE] = media_type
 
-            return_msg = f'''
+        response.headers[self.VARY] = f'{self.ACCEPT}, {self.ACCEPT_ENCODING}'
+
+        if (
+                self.__compress_size is not None and
+                len(body) >= self.__compress_size and
+                accepts_gzip(request.headers.get(self.ACCEPT_ENCODING))):
+
+            body = compress(body)
+
+            response.headers[self.CONTENT_ENCODING] = GZIP
+
+        return body
+
+    @staticmethod
+    def __encode(value):
+        """Encodes the values json doesn't know about, materializing the
+        tokens of a TokenStream only now.
+
+        :param value: The value to encode.
+        :type value: *
+        :return: The value, as one json knows about.
+        :rtype: list
+        :raises TypeError: If the value can't be encoded.
+        """
+
+        if isinstance(value, TokenStream):
+
+            return list(value)
+
+        raise TypeError(f'{type(value).__name__} isn\'t serializable.')
+
+    def __respond_bad_request(self, reason=''):
+        """Gathers the response to a request without a text or valid actions.
+
+        :param reason: Why the request is bad, if known.
+        :type reason: str
+        :return: The response.
+        :rtype: str
+        """
+
+        response.status = self.BAD_REQUEST
+
+        return f'''
 Bad Request
+{reason}
 
 Possible options are:
 
@@ -157,7 +836,434 @@ indent=4)}
 Use /help for add'l info.
             '''
 
-        return return_msg
+    def __apply_actions(self, texts, actions, options):
+        """Applies the given actions to each of the given texts, reusing the
+        results cached for texts seen before.
+
+        :param texts: The texts to apply the actions to.
+        :type texts: list
+        :param actions: The actions to apply to each text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The final content produced for each text, and the context
+                    it was produced in, in the order of the texts.
+        :rtype: list
+        """
+
+        keys = [
+            ResultCache.key(text, actions, options)
+            for text
+            in texts
+        ]
+
+        results = [
+            self.__result_cache.get(key) if key is not None else None
+            for key
+            in keys
+        ]
+
+        missing = [
+            index
+            for index, result
+            in enumerate(results)
+            if result is None
+        ]
+
+        if missing:
+
+            missing_results = self.__executor.map(
+                [texts[index] for index in missing],
+                actions,
+                options,
+                starts=[
+                    self.__gather_stage(texts[index], actions, options)
+                    for index
+                    in missing
+                ],
+                memoize=self.__stage_cache.enabled)
+
+            for index, result in zip(missing, missing_results):
+
+                self.__memoize_stages(texts[index], actions, options, result[1])
+
+                results[index] = result
+
+                # Errors may not happen again, e.g. a worker killed for
+                # running out of memory.
+                if result[1].status != ExecutionContext.ERROR:
+
+                    self.__result_cache.put(keys[index], result)
+
+        return results
+
+    def __aggregate(self, texts, actions, options):
+        """Applies the given actions to each of the given texts, and reduces
+        their results into a single result for all of them.
+
+        :param texts: The texts to apply the actions to.
+        :type texts: list
+        :param actions: The actions to apply to each text, the last one
+                    reducible.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The content reduced, along with the index of each text the
+                    actions failed for, and the http status.
+        :rtype: dict, int
+        """
+
+        action = actions[-1]
+
+        failed = []
+
+        try:
+
+            content = action.reduce(
+                self.__gather_partial_results(
+                    texts,
+                    actions,
+                    action.partial_options(options),
+                    failed),
+                ExecutionContext(options))
+
+        except Exception as e:
+
+            logging.error('Error while trying to aggregate results!')
+
+            logging.error(e)
+
+            return {
+                AbstractAction.HISTORY: [
+                    [action.name, AbstractAction.FAILURE]
+                ]
+            }, ExecutionContext.CONFLICT
+
+        content[AbstractAction.HISTORY] = [
+            [action.name, AbstractAction.SUCCESS]
+            for action
+            in actions
+        ]
+
+        content[self.FAILED] = failed
+
+        # The texts that failed are left out, reported like a batch's.
+        return content, self.MULTI_STATUS if failed else ExecutionContext.OK
+
+    def __gather_partial_results(self, texts, actions, options, failed):
+        """Applies the given actions to the given texts, a chunk of them at a
+        time, yielding the result of each text as it comes so only a chunk
+        of results is kept at once.
+
+        :param texts: The texts to apply the actions to.
+        :type texts: list
+        :param actions: The actions to apply to each text.
+        :type actions: list
+        :param options: The options to apply the actions with, by name.
+        :type options: dict
+        :param failed: The list to add the index of each text the actions
+                    failed for to.
+        :type failed: list
+        :return: The result of each text the actions succeeded for.
+        :rtype: generator
+        """
+
+        for start in range(0, len(texts), self.AGGREGATE_CHUNK_SIZE):
+
+            results = self.__apply_actions(
+                texts[start:start + self.AGGREGATE_CHUNK_SIZE],
+                actions,
+                options)
+
+            for index, (content, context) in enumerate(results, start):
+
+                if context.status == ExecutionContext.OK:
+
+                    yield content[AbstractAction.RESULT]
+
+                else:
+
+                    failed.append(index)
+
+    def __apply_chains(self, texts, chains, options):
+        """Applies each of the given chains of actions to each of the given
+        texts, reusing the results cached for texts seen before.
+
+        :param texts: The texts to apply the chains to.
+        :type texts: list
+        :param chains: The chains of actions to apply to each text.
+        :type chains: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The final content produced by each chain, and the context
+                    it was produced in, for each text, in order.
+        :rtype: list
+        """
+
+        keys = [
+            [ResultCache.key(text, actions, options) for actions in chains]
+            for text
+            in texts
+        ]
+
+        results = []
+
+        for text_keys in keys:
+
+            text_results = [
+                self.__result_cache.get(key) if key is not None else None
+                for key
+                in text_keys
+            ]
+
+            results.append(text_results if None not in text_results else None)
+
+        # A text missing any chain has all of them applied again, the
+        # shared prefixes making that little more than the missing ones.
+        missing = [
+            index
+            for index, text_results
+            in enumerate(results)
+            if text_results is None
+        ]
+
+        if missing:
+
+            missing_results = self.__executor.map_chains(
+                [texts[index] for index in missing],
+                chains,
+                options)
+
+            for index, text_results in zip(missing, missing_results):
+
+                results[index] = text_results
+
+                for key, result in zip(keys[index], text_results):
+
+                    if result[1].status != ExecutionContext.ERROR:
+
+                        self.__result_cache.put(key, result)
+
+        return results
+
+    def __gather_stage(self, text, actions, options):
+        """Gathers the latest stage of the given chain memoized for the given
+        text, if any.
+
+        :param text: The text the actions are applied to.
+        :type text: str
+        :param actions: The actions to apply to the text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The content and history of the stage, as taken by
+                    resume_actions, None if no stage is memoized.
+        :rtype: dict, list
+        """
+
+        if self.__stage_cache.enabled and isinstance(text, str):
+
+            for length in range(len(actions) - 1, 0, -1):
+
+                if actions[length - 1].MEMOIZED:
+
+                    stage = self.__stage_cache.get(
+                        self.__gather_stage_key(text, actions[:length], options))
+
+                    if stage is not None:
+
+                        return stage
+
+        return None
+
+    def __memoize_stages(self, text, actions, options, context):
+        """Memoizes the stages recorded in the given context, for later
+        chains on the same text to resume from.
+
+        :param text: The text the actions were applied to.
+        :type text: str
+        :param actions: The actions applied to the text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :param context: The context the actions were applied in.
+        :type context: ExecutionContext
+        """
+
+        for content, history in context.stages:
+
+            self.__stage_cache.put(
+                self.__gather_stage_key(text, actions[:len(history)], options),
+                (content, history))
+
+        # Not needed anymore, nor worth caching along with the result.
+        context.stages = []
+
+    def __gather_stage_key(self, text, actions, options):
+        """Gathers the key the stage reached by applying the given actions to
+        the given text is memoized under. Only the options those actions
+        read are part of it, so chains setting other options share it.
+
+        :param text: The text the actions are applied to.
+        :type text: str
+        :param actions: The actions applied to reach the stage.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The key.
+        :rtype: tuple
+        """
+
+        return ResultCache.key(
+            text,
+            actions,
+            {
+                option: value
+                for option, value in options.items()
+                if any(option in action.OPTIONS for action in actions)
+            })
+
+    def __gather_chains_content(self, item, paths, chains, results, layout):
+        """Gathers the content returned for a text several chains were
+        applied to, along with its status.
+
+        :param item: The text.
+        :type item: str
+        :param paths: The url path of each chain.
+        :type paths: list
+        :param chains: The actions of each chain.
+        :type chains: list
+        :param results: The content produced by each chain, and the context
+                    it was produced in.
+        :type results: list
+        :param layout: The layout asked for, as __gather_layout gives it.
+        :type layout: tuple
+        :return: The content to return for the text, and its status.
+        :rtype: dict, int
+        """
+
+        chains_content = {}
+
+        for path, actions, (content, context) in zip(paths, chains, results):
+
+            # The text is returned once for all the chains.
+            chains_content[path] = self.__gather_item_content(
+                None, content, context, actions[-1], layout)
+
+        if all(
+                context.status == ExecutionContext.OK
+                for content, context
+                in results):
+
+            status = ExecutionContext.OK
+
+        elif all(
+                context.status == ExecutionContext.ERROR
+                for content, context
+                in results):
+
+            status = ExecutionContext.ERROR
+
+        else:
+
+            status = self.MULTI_STATUS
+
+        content = {self.CHAINS: chains_content}
+
+        if self.ORIGINAL in layout[0]:
+
+            content[self.ORIGINAL] = item
+
+        return content, status
+
+    def __lay_out(self, content, item, action, layout):
+        """Lays out the content produced for the given text the way the
+        layout asks: only the fields asked for, the text among them, and
+        the result in columns if asked for and produced by the given action,
+        which can.
+
+        :param content: The content produced for the text.
+        :type content: dict
+        :param item: The text, None if it isn't returned with the content.
+        :type item: str
+        :param action: The last action applied to the text.
+        :type action: AbstractAction sub-class
+        :param layout: The layout asked for, as __gather_layout gives it.
+        :type layout: tuple
+        :return: A copy of the content laid out, leaving any cached content
+                    as it was.
+        :rtype: dict
+        """
+
+        if not isinstance(content, dict):
+
+            return content
+
+        fields, columns, offsets = layout
+
+        laid_out = {
+            field: value
+            for field, value in content.items()
+            if field in fields or field not in self.FIELD_NAMES
+        }
+
+        if item is not None and self.ORIGINAL in fields:
+
+            laid_out[self.ORIGINAL] = item
+
+        if (
+                columns and
+                AbstractAction.RESULT in laid_out and
+                action.COLUMNAR and
+                action.produced(content)):
+
+            laid_out[AbstractAction.RESULT] = action.columns(
+                content[AbstractAction.RESULT],
+                offsets=offsets)
+
+        return laid_out
+
+    def __gather_item_content(
+            self,
+            item,
+            item_content,
+            context,
+            action,
+            layout):
+        """Gathers the content returned for an item of a batch request,
+        along with the status of that item.
+
+        :param item: The text of the item, None if it isn't returned with
+                    the content.
+        :type item: str
+        :param item_content: The content produced for the item.
+        :type item_content: dict
+        :param context: The context the content was produced in.
+        :type context: ExecutionContext
+        :param action: The last action applied to the item.
+        :type action: AbstractAction sub-class
+        :param layout: The layout asked for, as __gather_layout gives it.
+        :type layout: tuple
+        :return: The content to return for the item.
+        :rtype: dict
+        """
+
+        if not isinstance(item_content, dict):
+
+            # No action could process the item, still report its history.
+            item_content = {AbstractAction.HISTORY: context.history}
+
+        item_content = self.__lay_out(item_content, item, action, layout)
+
+        item_content[self.STATUS] = context.status
+
+        return item_content
 
     def __gather_text(self):
         """Gathers the text from the request.
@@ -172,15 +1278,9 @@ Use /help for add'l info.
 
         try:
 
-            if request.headers[self.CONTENT_TYPE] == 'application/json':
-
-                text = request.json[self.TEXT]
-
-            else:
-
-                raise ValueError('Content-Type isn\'t application/json.')
+            text = self.__gather_payload()[self.TEXT]
 
-        except KeyError as e:
+        except (KeyError, TypeError) as e:
 
             logging.error('Error while trying to gather text from request!')
 
@@ -188,103 +1288,256 @@ Use /help for add'l info.
 
         return text
 
-    def __gather_actions(self, url):
-        """Gathers the actions corresponding to each url section.
+    def __gather_payload(self):
+        """Gathers the payload of the request, its body being read and
+        parsed the first time only: the json document it holds, or for a
+        text/plain body, its text.
 
-        :param url: The url used when making the request.
-        :type url: str
-        :return: The actions corresponding to each url section.
-        :rtype: list
+        :return: The payload, the text under text for a text/plain body,
+                    None if the body is neither.
+        :rtype: *
+        :raises HTTPError: If the body can't be read, or can't be parsed.
         """
 
-        logging.debug('Gathering actions')
+        if self.PAYLOAD not in request.environ:
 
-        url_parts = url.split('/')
+            request.environ[self.PAYLOAD] = self.__parse_payload()
 
-        # If the url starts with one of the shortcuts,
-        # We need to replace it with the expanded version.
-        if url_parts[0] in self.__url_shortcuts.keys():
+        return request.environ[self.PAYLOAD]
 
-            tmp = self.__url_shortcuts[url_parts[0]].split('/')
+    def __parse_payload(self):
+        """Reads and parses the payload of the request.
 
-            tmp.extend(url_parts[1:])
+        :return: The payload, None if the body is neither json nor text.
+        :rtype: *
+        :raises HTTPError: If the body can't be read, or can't be parsed.
+        """
 
-            url_parts = tmp
+        content_type, *parameters = request.content_type.lower().split(';')
 
-        actions = [
-            self.__gather_action_for_path(url_part)
-            for url_part
-            in url_parts
-        ]
+        content_type = content_type.strip()
 
-        actions = [action for action in actions if action is not None]
+        if content_type not in [self.JSON, self.PLAIN_TEXT]:
 
-        """All url path sections must be valid."""
-        if len(actions) != len(url_parts):
+            return None
 
-            actions = []
+        with self.__read_body() as body:
 
-            logging.warning('Not all url path sections were valid!')
+            if content_type == self.JSON:
 
-        return actions
+                try:
 
-    def __gather_action_for_path(self, path_item):
-        """Gathers an action object for the given path string.
+                    return json.load(body)
 
-        :param path_item: The path string to find an action for. E.g. 'word'
-        :type path_item: str
-        :return: The action associated with the given path, or None if one isn't found.
-        :rtype: AbstractAction sub-class
+                except ValueError:
+
+                    raise HTTPError(self.BAD_REQUEST, 'Invalid JSON')
+
+            charset = 'utf-8'
+
+            for parameter in parameters:
+
+                name, _, value = parameter.partition('=')
+
+                if name.strip() == 'charset':
+
+                    charset = value.strip().strip('"')
+
+            try:
+
+                return {self.TEXT: body.read().decode(charset)}
+
+            except (LookupError, UnicodeDecodeError):
+
+                raise HTTPError(
+                    self.BAD_REQUEST, f'The text isn\'t valid {charset}.')
+
+    def __read_body(self):
+        """Reads the body of the request, decompressed, spooling a large
+        one to a temporary file rather than holding it in memory.
+
+        :return: The body, read from its start.
+        :rtype: SpooledTemporaryFile
+        :raises HTTPError: If the body is too large, or can't be
+                    decompressed.
         """
 
-        action = None
+        stream, length = self.__gather_input()
 
-        for a in self.__actions:
+        try:
 
-            if path_item == a.name:
+            return read_body(
+                stream,
+                length,
+                request.headers.get(self.CONTENT_ENCODING),
+                self.__max_body_size)
 
-                action = a
+        except InvalidBody as e:
 
-                break
+            logging.warning(f'Invalid body: {e}')
 
-        return action
+            raise HTTPError(e.status, str(e))
 
-    def __apply_actions(self, text, actions):
-        """Applies the given actions to the given text.
+    def __read_lines(self):
+        """Reads the body of the request a line at a time, decompressed, as
+        the response asks for them, so only the line being read is held in
+        memory.
 
-        :param text: The text to apply the actions to.
-        :type text: str
-        :param actions: The actions to apply to the text.
+        :return: Each line of the body, or the InvalidBody a line over the
+                    max body size is refused with.
+        :rtype: generator
+        :raises HTTPError: If the body's encoding isn't supported.
+        """
+
+        stream, length = self.__gather_input()
+
+        try:
+
+            decompressor = gather_decompressor(
+                request.headers.get(self.CONTENT_ENCODING))
+
+        except InvalidBody as e:
+
+            logging.warning(f'Invalid body: {e}')
+
+            raise HTTPError(e.status, str(e))
+
+        # The size limit applies to each document rather than to the
+        # stream, whose length isn't bounded.
+        return read_lines(
+            stream, length, decompressor, self.__max_body_size)
+
+    def __gather_input(self):
+        """Gathers the stream the body of the request is read from, and the
+        number of bytes to read from it.
+
+        :return: The stream, and the number of bytes, None to read it to
+                    its end.
+        :rtype: file-like object, int
+        """
+
+        stream = request.environ.get('wsgi.input')
+
+        if request.chunked:
+
+            if request.environ.get('wsgi.input_terminated'):
+
+                # The server already decoded the chunks, and ends the input
+                # with the body.
+                return stream, None
+
+            # Bottle decodes the chunks, spooling them as it does.
+            return request.body, None
+
+        return stream, max(0, request.content_length) if stream else 0
+
+    def __gather_aggregate(self):
+        """Gathers whether the request asks for the results of its texts to
+        be aggregated into one.
+
+        :return: True if the results are aggregated.
+        :rtype: bool
+        """
+
+        payload = self.__gather_payload()
+
+        return (
+            isinstance(payload, dict) and
+            payload.get(self.AGGREGATE) is True)
+
+    def __gather_layout(self, document=None):
+        """Gathers how the request, or the given streamed document, asks
+        for results to be laid out.
+
+        :param document: The streamed document, the request's payload if
+                    None.
+        :type document: dict
+        :return: The fields returned, whether results are laid out in
+                    columns, and whether their offsets are too.
+        :rtype: tuple
+        :raises ValueError: If fields isn't a list of field names.
+        """
+
+        if document is None:
+
+            document = self.__gather_payload()
+
+        if not isinstance(document, dict):
+
+            return self.FIELD_NAMES, False, False
+
+        fields = document.get(self.FIELDS, list(self.FIELD_NAMES))
+
+        if not (
+                isinstance(fields, list) and
+                all(field in self.FIELD_NAMES for field in fields)):
+
+            raise ValueError(
+                'fields isn\'t a list of fields among ' +
+                f'{", ".join(self.FIELD_NAMES)}.')
+
+        return (
+            fields,
+            document.get(self.COLUMNS) is True,
+            document.get(self.OFFSETS) is True)
+
+    def __gather_options(self, actions):
+        """Gathers the options the request sets for the given actions.
+
+        :param actions: The actions to gather options for.
         :type actions: list
-        :return: The final content produced.
+        :return: The options set, by name.
         :rtype: dict
         """
-        content = text
 
-        for action in actions:
+        options = {}
 
-            try:
+        payload = self.__gather_payload()
 
-                logging.debug(f'Processing via {action.name}')
+        if isinstance(payload, dict):
 
-                content = action.apply(content)
+            options = {
+                option: payload[option]
+                for action in actions
+                for option in action.OPTIONS
+                if option in payload
+            }
 
-                response.status = 200
+        return options
 
-            except Exception as e:
+    def __gather_chains(self):
+        """Gathers the chains of actions the request lists.
 
-                logging.error(
-                    'Error while trying to process result of type' +
-                    f'{type(content)} via {action}!')
+        :return: The url path of each chain, and its actions.
+        :rtype: list, list
+        :raises ValueError: If chains isn't a list of valid url paths.
+        """
 
-                logging.error(e)
+        paths = self.__gather_payload()[self.CHAINS]
 
-                response.status = 500
+        if not (
+                isinstance(paths, list) and
+                paths and
+                all(isinstance(path, str) for path in paths)):
 
-                break
+            raise ValueError('chains isn\'t a list of url paths.')
+
+        chains = [self.__gather_actions(path.lower()) for path in paths]
+
+        return paths, chains
+
+    def __gather_actions(self, url):
+        """Gathers the actions corresponding to each url section, from the
+        pipeline compiled for the url.
 
-        if isinstance(content, dict):
+        :param url: The url used when making the request.
+        :type url: str
+        :return: The actions corresponding to each url section.
+        :rtype: list
+        :raises InvalidPipeline: If a section names no action, or names an
+                    action that doesn't accept what precedes it.
+        """
 
-            content['original'] = text
+        logging.debug('Gathering actions')
 
-        return content
+        return self.__pipelines.compile(url).actions
@@ -0,0 +1,97 @@
+"""Compiles url paths into pipelines of actions, checked before anything is
+applied.
+"""
+import functools
+
+from action.abstract_action import AbstractAction
+
+
+class InvalidPipeline(ValueError):
+    """Raised when a url path can't be compiled into a pipeline."""
+
+
+class Pipeline:
+
+    def __init__(self, actions):
+        """Constructor
+
+        :param actions: The actions applied, in order, each accepting the
+                    type of content the previous one produces.
+        :type actions: tuple
+        """
+
+        self.__actions = actions
+
+    @property
+    def actions(self):
+        """The actions applied, in order."""
+
+        return list(self.__actions)
+
+
+class PipelineCompiler:
+
+    def __init__(self, actions, url_shortcuts, cache_size=256):
+        """Constructor
+
+        :param actions: The actions url path sections may name.
+        :type actions: list
+        :param url_shortcuts: The url paths a leading section expands to,
+                    e.g. 'pos': 'word/pos'.
+        :type url_shortcuts: dict
+        :param cache_size: The number of compiled pipelines kept, the least
+                    recently used being compiled again.
+        :type cache_size: int
+        """
+
+        self.__actions = {action.name: action for action in actions}
+
+        self.__url_shortcuts = url_shortcuts
+
+        self.compile = functools.lru_cache(maxsize=cache_size)(self.__compile)
+
+    def __compile(self, url):
+        """Compiles the given url path into a pipeline, checking each action
+        accepts the type of content the previous one produces.
+
+        :param url: The url path, e.g. 'word/pos/ne'.
+        :type url: str
+        :return: The pipeline.
+        :rtype: Pipeline
+        :raises InvalidPipeline: If a section names no action, or names an
+                    action that doesn't accept what precedes it.
+        """
+
+        url_parts = url.split('/')
+
+        # If the url starts with one of the shortcuts,
+        # We need to replace it with the expanded version.
+        if url_parts[0] in self.__url_shortcuts:
+
+            url_parts = (
+                self.__url_shortcuts[url_parts[0]].split('/') +
+                url_parts[1:])
+
+        actions = []
+
+        content_type = AbstractAction.TEXT_TYPE
+
+        for url_part in url_parts:
+
+            if url_part not in self.__actions:
+
+                raise InvalidPipeline(f'{url_part} isn\'t an action.')
+
+            action = self.__actions[url_part]
+
+            if content_type not in action.INPUT_TYPES:
+
+                raise InvalidPipeline(
+                    f'{action.name} takes {", ".join(action.INPUT_TYPES)}, ' +
+                    f'not {content_type}.')
+
+            actions.append(action)
+
+            content_type = action.OUTPUT_TYPE
+
+        return Pipeline(tuple(actions))
@@ -0,0 +1,320 @@
+"""Reads request bodies of bounded size, decompressing them as they are read,
+without holding large ones in memory.
+"""
+import zlib
+from tempfile import SpooledTemporaryFile
+
+
+class InvalidBody(ValueError):
+    """Raised when a request body can't be read."""
+
+    def __init__(self, message, status):
+        """Constructor
+
+        :param message: Why the body can't be read.
+        :type message: str
+        :param status: The http status to answer with.
+        :type status: int
+        """
+
+        super(InvalidBody, self).__init__(message)
+
+        self.status = status
+
+
+BAD_REQUEST = 400
+PAYLOAD_TOO_LARGE = 413
+UNSUPPORTED_MEDIA_TYPE = 415
+
+"""The zlib window bits each content encoding is decompressed with, None
+for a body that isn't compressed."""
+ENCODINGS = {
+    '': None,
+    'identity': None,
+    'gzip': 16 + zlib.MAX_WBITS,
+    'x-gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS
+}
+
+# The number of bytes read, or decompressed, at once.
+CHUNK_SIZE = 64 * 2**10
+
+
+def gather_decompressor(encoding):
+    """Gathers the decompressor of a body sent with the given encoding.
+
+    :param encoding: The Content-Encoding of the body, e.g. 'gzip'.
+    :type encoding: str
+    :return: The decompressor, None if the body isn't compressed.
+    :rtype: zlib.Decompress
+    :raises InvalidBody: If the encoding isn't supported.
+    """
+
+    encoding = (encoding or '').strip().lower()
+
+    if encoding not in ENCODINGS:
+
+        raise InvalidBody(
+            f'Content-Encoding {encoding} isn\'t supported, use one of ' +
+            f'{", ".join(encoding for encoding in ENCODINGS if encoding)}.',
+            UNSUPPORTED_MEDIA_TYPE)
+
+    wbits = ENCODINGS[encoding]
+
+    return zlib.decompressobj(wbits) if wbits is not None else None
+
+
+def read_body(
+        stream,
+        length,
+        encoding,
+        max_size,
+        memory_size=2**20):
+    """Reads the given body, decompressing it as it is read. Bodies larger
+    than the given memory size are spooled to a temporary file.
+
+    :param stream: The wsgi input the body is read from.
+    :type stream: file-like object
+    :param length: The number of bytes to read, as the Content-Length
+                header gives it, or None to read until the end of the stream,
+                e.g. for a chunked body the server already decoded.
+    :type length: int
+    :param encoding: The Content-Encoding of the body, e.g. 'gzip'.
+    :type encoding: str
+    :param max_size: The number of bytes the body may take at most, both as
+                sent and once decompressed.
+    :type max_size: int
+    :param memory_size: The number of bytes kept in memory at most before
+                the body is spooled to a temporary file.
+    :type memory_size: int
+    :return: The decompressed body, read from its start.
+    :rtype: SpooledTemporaryFile
+    :raises InvalidBody: If the body is too large, its encoding isn't
+                supported, or it can't be decompressed.
+    """
+
+    decompressor = gather_decompressor(encoding)
+
+    if length is not None and length > max_size:
+
+        raise _too_large(max_size)
+
+    body = SpooledTemporaryFile(max_size=memory_size)
+
+    read_size = 0
+
+    size = 0
+
+    try:
+
+        for data in _read(stream, length):
+
+            read_size += len(data)
+
+            if read_size > max_size:
+
+                raise _too_large(max_size)
+
+            for chunk in _decompress(decompressor, data):
+
+                size += len(chunk)
+
+                if size > max_size:
+
+                    raise _too_large(max_size)
+
+                body.write(chunk)
+
+        _check_complete(decompressor, read_size)
+
+    except zlib.error as e:
+
+        body.close()
+
+        raise InvalidBody(
+            f'The body can\'t be decompressed: {e}', BAD_REQUEST)
+
+    except InvalidBody:
+
+        body.close()
+
+        raise
+
+    body.seek(0)
+
+    return body
+
+
+def read_lines(stream, length, decompressor, max_line_size=None):
+    """Reads the given body a line at a time, decompressing it as it is
+    read, so only the line being read is held in memory.
+
+    :param stream: The wsgi input the body is read from.
+    :type stream: file-like object
+    :param length: The number of bytes to read, or None to read until the
+                end of the stream.
+    :type length: int
+    :param decompressor: The decompressor, as gather_decompressor gives it.
+    :type decompressor: zlib.Decompress
+    :param max_line_size: The number of bytes a line may take at most once
+                decompressed, None for no limit. The rest of a larger line
+                is skipped as it is read, rather than held.
+    :type max_line_size: int
+    :return: Each line, without its line break, or the InvalidBody a line
+                too large is refused with.
+    :rtype: generator
+    :raises InvalidBody: Once the lines before it were read, if the body
+                can't be decompressed.
+    """
+
+    line = bytearray()
+
+    too_large = False
+
+    read_size = 0
+
+    try:
+
+        for data in _read(stream, length):
+
+            read_size += len(data)
+
+            for chunk in _decompress(decompressor, data):
+
+                start = 0
+
+                end = chunk.find(b'\n')
+
+                while True:
+
+                    if not too_large:
+
+                        line += chunk[start:end if end >= 0 else len(chunk)]
+
+                        if (
+                                max_line_size is not None and
+                                len(line) > max_line_size):
+
+                            too_large = True
+
+                            line = bytearray()
+
+                    if end < 0:
+
+                        break
+
+                    yield (
+                        _too_large(max_line_size, 'line')
+                        if too_large
+                        else bytes(line))
+
+                    line = bytearray()
+
+                    too_large = False
+
+                    start = end + 1
+
+                    end = chunk.find(b'\n', start)
+
+        _check_complete(decompressor, read_size)
+
+    except zlib.error as e:
+
+        raise InvalidBody(
+            f'The body can\'t be decompressed: {e}', BAD_REQUEST)
+
+    if too_large:
+
+        yield _too_large(max_line_size, 'line')
+
+    elif line:
+
+        yield bytes(line)
+
+
+def _read(stream, length):
+    """Reads the given body as it is sent, a chunk at a time.
+
+    :param stream: The wsgi input the body is read from.
+    :type stream: file-like object
+    :param length: The number of bytes to read, or None to read until the
+                end of the stream.
+    :type length: int
+    :return: The chunks read.
+    :rtype: generator
+    """
+
+    read_size = 0
+
+    while length is None or read_size < length:
+
+        data = stream.read(
+            CHUNK_SIZE
+            if length is None
+            else min(CHUNK_SIZE, length - read_size))
+
+        if not data:
+
+            return
+
+        read_size += len(data)
+
+        yield data
+
+
+def _check_complete(decompressor, read_size):
+    """Checks a compressed body was read to its end.
+
+    :param decompressor: The decompressor, None if the body isn't
+                compressed.
+    :type decompressor: zlib.Decompress
+    :param read_size: The number of bytes read.
+    :type read_size: int
+    :raises InvalidBody: If the body is truncated.
+    """
+
+    if read_size and decompressor is not None and not decompressor.eof:
+
+        raise InvalidBody('The body is truncated.', BAD_REQUEST)
+
+
+def _decompress(decompressor, data):
+    """Decompresses the given data, a chunk at a time, so a small body
+    decompressing to a huge one is caught before it is all in memory.
+
+    :param decompressor: The decompressor, None if the data isn't
+                compressed.
+    :type decompressor: zlib.Decompress
+    :param data: The data read.
+    :type data: bytes
+    :return: The decompressed chunks.
+    :rtype: generator
+    """
+
+    if decompressor is None:
+
+        yield data
+
+        return
+
+    while data and not decompressor.eof:
+
+        yield decompressor.decompress(data, CHUNK_SIZE)
+
+        data = decompressor.unconsumed_tail
+
+
+def _too_large(max_size, part='body'):
+    """Gathers the error raised for a body, or a part of it, larger than the
+    given size.
+
+    :param max_size: The number of bytes the body may take at most.
+    :type max_size: int
+    :param part: What is too large, e.g. 'line'.
+    :type part: str
+    :return: The error.
+    :rtype: InvalidBody
+    """
+
+    return InvalidBody(
+        f'The {part} is larger than {max_size} bytes.', PAYLOAD_TOO_LARGE)
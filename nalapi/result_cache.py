@@ -0,0 +1,181 @@
+"""Caches the results of applying chains of actions to texts, so repeated
+payloads aren't processed again.
+"""
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import pickle
+import threading
+import time
+
+
+class ResultCache:
+
+    def __init__(self, max_bytes=64 * 2**20, ttl=300):
+        """Constructor
+
+        :param max_bytes: The number of bytes the cached results may take at
+                    most, the least recently used ones being evicted first.
+                    Nothing is cached if 0.
+        :type max_bytes: int
+        :param ttl: The number of seconds a result stays cached, forever if
+                    None.
+        :type ttl: float
+        """
+
+        self.__max_bytes = max_bytes
+
+        self.__ttl = ttl
+
+        """The expiry time and pickled result of each entry, least recently
+        used first."""
+        self.__entries = OrderedDict()
+
+        self.__bytes = 0
+
+        self.__hits = 0
+
+        self.__misses = 0
+
+        self.__lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        """Whether this cache caches anything."""
+
+        return self.__max_bytes > 0
+
+    @staticmethod
+    def key(text, actions, options=None):
+        """Gathers the key a result is cached under.
+
+        :param text: The text the actions are applied to.
+        :type text: str
+        :param actions: The actions applied to the text.
+        :type actions: list
+        :param options: The options the request set for the actions, by
+                    name.
+        :type options: dict
+        :return: The key, None if the result can't be cached.
+        :rtype: tuple
+        """
+
+        if not isinstance(text, str):
+
+            return None
+
+        return (
+            hashlib.sha256(text.encode('utf-8')).hexdigest(),
+            tuple(action.name for action in actions),
+            json.dumps(options or {}, sort_keys=True)
+        )
+
+    def get(self, key):
+        """Gets the result cached under the given key.
+
+        :param key: The key the result is cached under.
+        :type key: tuple
+        :return: A copy of the result, None if there is none.
+        :rtype: *
+        """
+
+        entry = None
+
+        with self.__lock:
+
+            if key in self.__entries:
+
+                entry = self.__entries[key]
+
+                if entry[0] is not None and entry[0] <= time.monotonic():
+
+                    self.__remove(key)
+
+                    entry = None
+
+                else:
+
+                    self.__entries.move_to_end(key)
+
+            if entry is not None:
+
+                self.__hits += 1
+
+            else:
+
+                self.__misses += 1
+
+        # Unpickled for every hit, so callers may change their copy.
+        return pickle.loads(entry[1]) if entry is not None else None
+
+    def put(self, key, result):
+        """Caches the given result under the given key, evicting the least
+        recently used results to make room for it.
+
+        :param key: The key to cache the result under, not cached if None.
+        :type key: tuple
+        :param result: The result to cache.
+        :type result: *
+        """
+
+        if key is None or not self.enabled:
+
+            return
+
+        pickled_result = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+
+        if len(pickled_result) > self.__max_bytes:
+
+            logging.debug('Result too large to cache.')
+
+            return
+
+        expiry = None
+
+        if self.__ttl is not None:
+
+            expiry = time.monotonic() + self.__ttl
+
+        with self.__lock:
+
+            if key in self.__entries:
+
+                self.__remove(key)
+
+            while self.__bytes + len(pickled_result) > self.__max_bytes:
+
+                self.__remove(next(iter(self.__entries)))
+
+            self.__entries[key] = (expiry, pickled_result)
+
+            self.__bytes += len(pickled_result)
+
+    def stats(self):
+        """Gathers statistics about this cache.
+
+        :return: The number of hits, misses, entries and bytes cached, and
+                    the maximum number of bytes.
+        :rtype: dict
+        """
+
+        with self.__lock:
+
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'entries': len(self.__entries),
+                'bytes': self.__bytes,
+                'max_bytes': self.__max_bytes
+            }
+
+    def __remove(self, key):
+        """Removes the entry cached under the given key, the lock being held.
+
+        :param key: The key of the entry.
+        :type key: tuple
+        """
+
+        expiry, pickled_result = self.__entries.pop(key)
+
+        self.__bytes -= len(pickled_result)
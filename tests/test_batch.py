@@ -0,0 +1,256 @@
+"""Tests batch requests, where the text is a list of items."""
+import json
+
+from nalapi.nalapi import nalapi
+from nalapi.action.abstract_action import AbstractAction
+from nalapi.action.execution_context import ExecutionContext
+from tests.wsgi_client import call_app
+
+
+class TestBatch:
+
+    TEXTS = [
+        'Check back tomorrow; I will see if the book has arrived.',
+        'A purple pig and a green donkey flew a kite in the middle of the ' +
+        'night and ended up sunburnt. She always speaks to him in a loud ' +
+        'voice.',
+        'I am never at home on Sundays.'
+    ]
+
+    def test_items_keep_order_and_status(self):
+        """Tests that batch items spread across worker processes come back
+        in order, each with its own status."""
+
+        app = nalapi(processes=2, inline_threshold=40)
+
+        try:
+
+            status, body = call_app(app, 'sntmnt', {nalapi.TEXT: self.TEXTS})
+
+        finally:
+
+            app.close()
+
+        assert status.startswith('200')
+
+        content = json.loads(body)
+
+        assert [item[nalapi.ORIGINAL] for item in content] == self.TEXTS
+
+        for item in content:
+
+            assert item[nalapi.STATUS] == ExecutionContext.OK
+
+    def test_failed_item_is_reported(self):
+        """Tests that an item failing doesn't hide the others' results."""
+
+        app = nalapi()
+
+        # Only a text can be extracted words from.
+        status, body = call_app(
+            app,
+            'word/freq',
+            {nalapi.TEXT: self.TEXTS + [42]})
+
+        assert status.startswith(str(nalapi.MULTI_STATUS))
+
+        content = json.loads(body)
+
+        for item in content[:-1]:
+
+            assert item[nalapi.STATUS] == ExecutionContext.OK
+
+        assert content[-1][nalapi.STATUS] == ExecutionContext.CONFLICT
+
+        assert content[-1][AbstractAction.HISTORY] == [
+            ['word', AbstractAction.FAILURE],
+            ['freq', AbstractAction.FAILURE]
+        ]
+
+    def test_columns(self):
+        """Tests that the pos results of each item are laid out in columns
+        when asked, and the results of other actions left as they are."""
+
+        app = nalapi()
+
+        payload = {nalapi.TEXT: self.TEXTS, nalapi.COLUMNS: True}
+
+        pairs = json.loads(call_app(app, 'pos', {nalapi.TEXT: self.TEXTS})[1])
+
+        columns = json.loads(call_app(app, 'pos', payload)[1])
+
+        for item_pairs, item_columns in zip(pairs, columns):
+
+            result = item_columns[AbstractAction.RESULT]
+
+            assert [
+                [token, result['tag_names'][tag]]
+                for token, tag in zip(result['tokens'], result['tags'])
+            ] == item_pairs[AbstractAction.RESULT]
+
+            assert item_columns[nalapi.ORIGINAL] == item_pairs[nalapi.ORIGINAL]
+
+        # The cached pairs were left as they were.
+        assert json.loads(
+            call_app(app, 'pos', {nalapi.TEXT: self.TEXTS})[1]) == pairs
+
+        assert json.loads(call_app(app, 'word', payload)[1]) == json.loads(
+            call_app(app, 'word', {nalapi.TEXT: self.TEXTS})[1])
+
+    def test_fields(self):
+        """Tests that only the fields asked for are returned, for each item
+        and for a single text, and that unknown fields are refused."""
+
+        app = nalapi()
+
+        status, body = call_app(
+            app,
+            'word/freq',
+            {nalapi.TEXT: self.TEXTS, nalapi.FIELDS: [AbstractAction.RESULT]})
+
+        assert status.startswith('200')
+
+        for item in json.loads(body):
+
+            assert set(item) == {AbstractAction.RESULT, nalapi.STATUS}
+
+        status, body = call_app(
+            app,
+            'word/freq',
+            {
+                nalapi.TEXT: self.TEXTS[0],
+                nalapi.FIELDS: [AbstractAction.HISTORY, nalapi.ORIGINAL]
+            })
+
+        assert json.loads(body) == {
+            AbstractAction.HISTORY: [
+                ['word', AbstractAction.SUCCESS],
+                ['freq', AbstractAction.SUCCESS]
+            ],
+            nalapi.ORIGINAL: self.TEXTS[0]
+        }
+
+        status, body = call_app(
+            app,
+            'chains',
+            {
+                nalapi.TEXT: self.TEXTS[0],
+                nalapi.CHAINS: ['word', 'snt'],
+                nalapi.FIELDS: [AbstractAction.RESULT]
+            })
+
+        assert set(json.loads(body)) == {nalapi.CHAINS}
+
+        status, body = call_app(
+            app,
+            'word',
+            {nalapi.TEXT: self.TEXTS, nalapi.FIELDS: ['text']})
+
+        assert status.startswith(str(nalapi.BAD_REQUEST))
+
+    def test_aggregate(self, monkeypatch):
+        """Tests that the results of every item are reduced into a single
+        one, the same inline or across worker processes and chunks."""
+
+        monkeypatch.setattr(nalapi, 'AGGREGATE_CHUNK_SIZE', 2)
+
+        fresh_app = nalapi(cache_size=0)
+
+        expected = {
+            'word/freq': {},
+            'word/unq': [],
+            'pos/cnsl': {}
+        }
+
+        for path in expected:
+
+            body = call_app(
+                fresh_app,
+                path,
+                {nalapi.TEXT: self.TEXTS, 'counts': True})[1]
+
+            for item in json.loads(body):
+
+                result = item[AbstractAction.RESULT]
+
+                if path == 'word/freq':
+
+                    for word, count in result.items():
+
+                        expected[path][word] = (
+                            expected[path].get(word, 0) + count)
+
+                elif path == 'word/unq':
+
+                    expected[path] += [
+                        word for word in result
+                        if word not in expected[path]]
+
+                else:
+
+                    for word, tags in result.items():
+
+                        for tag, count in tags.items():
+
+                            expected[path].setdefault(word, {})[tag] = (
+                                expected[path].get(word, {}).get(tag, 0) +
+                                count)
+
+        for app in [nalapi(), nalapi(processes=2, inline_threshold=0)]:
+
+            try:
+
+                for path, result in expected.items():
+
+                    status, body = call_app(
+                        app,
+                        path,
+                        {
+                            nalapi.TEXT: self.TEXTS,
+                            nalapi.AGGREGATE: True,
+                            'counts': True
+                        })
+
+                    assert status.startswith('200')
+
+                    content = json.loads(body)
+
+                    assert content[AbstractAction.RESULT] == result
+
+                    assert content[nalapi.FAILED] == []
+
+                status, body = call_app(
+                    app,
+                    'word/freq',
+                    {
+                        nalapi.TEXT: self.TEXTS + [42],
+                        nalapi.AGGREGATE: True,
+                        'k': 3
+                    })
+
+                assert status.startswith(str(nalapi.MULTI_STATUS))
+
+                content = json.loads(body)
+
+                assert content[AbstractAction.RESULT] == dict(
+                    sorted(
+                        expected['word/freq'].items(),
+                        key=lambda item: item[1],
+                        reverse=True)[:3])
+
+                assert content[nalapi.FAILED] == [len(self.TEXTS)]
+
+            finally:
+
+                app.close()
+
+    def test_aggregate_needs_reducible_action(self):
+        """Tests that only chains ending in freq, unq or cnsl can have their
+        results aggregated."""
+
+        status, body = call_app(
+            nalapi(),
+            'word/pos',
+            {nalapi.TEXT: self.TEXTS, nalapi.AGGREGATE: True})
+
+        assert status.startswith('400')
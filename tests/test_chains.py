@@ -0,0 +1,158 @@
+"""Tests requests applying several chains of actions to the same text."""
+import json
+
+from nalapi.nalapi import nalapi
+from nalapi.action.execution_context import ExecutionContext
+from nalapi.action.word_extraction import WordExtraction
+from nalapi.action.word_pos_tagging import WordPosTagging
+from nalapi.action.frequency_calculation import FrequencyCalculation
+from nalapi.action.unique_filtering import UniqueFiltering
+from nalapi.action.sentiment_calculation import SentimentCalculation
+from nalapi.executor import apply_actions
+from nalapi.executor import apply_chains
+from tests.wsgi_client import call_app
+
+
+class CountingWordExtraction(WordExtraction):
+
+    def __init__(self):
+        """Constructor"""
+
+        super().__init__()
+
+        self.applied = 0
+
+    def apply(self, content, context=None):
+        """Counts the times this action is applied, before applying it."""
+
+        self.applied += 1
+
+        return super().apply(content, context)
+
+
+class TestChains:
+
+    TEXT = (
+        'Check back tomorrow; I will see if the book has arrived. A purple ' +
+        'pig and a green donkey flew a kite in the middle of the night and ' +
+        'ended up sunburnt. I love eating toasted cheese and tuna sandwiches.')
+
+    PATHS = [
+        'word/pos/ne/freq',
+        'word/pos/phrs/unq',
+        'pos/cnsl',
+        'snt/sntmnt'
+    ]
+
+    def test_shared_prefix_applied_once(self):
+        """Tests that each chain produces what it produces on its own, while
+        the actions they start with are applied once."""
+
+        word_extraction = CountingWordExtraction()
+
+        word_pos_tagging = WordPosTagging()
+
+        frequency_calculation = FrequencyCalculation()
+
+        chains = [
+            [word_extraction, word_pos_tagging, frequency_calculation],
+            [word_extraction, word_pos_tagging, UniqueFiltering()],
+            [word_extraction, frequency_calculation],
+            [SentimentCalculation(), frequency_calculation]
+        ]
+
+        expected = [apply_actions(self.TEXT, chain) for chain in chains]
+
+        word_extraction.applied = 0
+
+        results = apply_chains(self.TEXT, chains)
+
+        assert word_extraction.applied == 1
+
+        for (content, context), (expected_content, expected_context) in zip(
+                results, expected):
+
+            assert content == expected_content
+
+            assert context.history == expected_context.history
+
+            assert context.status == expected_context.status
+
+    def test_chains_match_separate_requests(self):
+        """Tests that the content of each chain is the one a separate request
+        gets, keyed by the chain."""
+
+        for app in [nalapi(), nalapi(processes=2, inline_threshold=0)]:
+
+            try:
+
+                status, body = call_app(
+                    app,
+                    'chains',
+                    {nalapi.TEXT: self.TEXT, nalapi.CHAINS: self.PATHS})
+
+                assert status.startswith('200')
+
+                content = json.loads(body)
+
+                assert content[nalapi.ORIGINAL] == self.TEXT
+
+                for path in self.PATHS:
+
+                    chain_status, chain_body = call_app(
+                        app, path, {nalapi.TEXT: self.TEXT})
+
+                    expected = json.loads(chain_body)
+
+                    expected.pop(nalapi.ORIGINAL)
+
+                    expected[nalapi.STATUS] = int(chain_status.split()[0])
+
+                    assert content[nalapi.CHAINS][path] == expected
+
+            finally:
+
+                app.close()
+
+    def test_batch(self):
+        """Tests that each item of a batch gets its chains and status."""
+
+        app = nalapi()
+
+        status, body = call_app(
+            app,
+            'chains',
+            {
+                nalapi.TEXT: [self.TEXT, 'I am never at home on Sundays.'],
+                nalapi.CHAINS: self.PATHS[:2]
+            })
+
+        assert status.startswith('200')
+
+        content = json.loads(body)
+
+        assert [item[nalapi.ORIGINAL] for item in content] == [
+            self.TEXT, 'I am never at home on Sundays.']
+
+        assert all(
+            item[nalapi.STATUS] == ExecutionContext.OK
+            for item in content)
+
+    def test_invalid_chains(self):
+        """Tests that a request listing an invalid chain is rejected."""
+
+        app = nalapi()
+
+        for chains in [
+                ['word/pos', 'word/nope'],
+                ['word/pos', 'sntmnt/freq'],
+                [],
+                'word/pos',
+                None]:
+
+            status, body = call_app(
+                app,
+                'chains',
+                {nalapi.TEXT: self.TEXT, nalapi.CHAINS: chains})
+
+            assert status.startswith('400')
@@ -0,0 +1,71 @@
+"""Concurrency tests for nalapi."""
+from concurrent.futures import ThreadPoolExecutor
+import sys
+
+from nalapi.nalapi import nalapi
+from tests.wsgi_client import call_app
+
+
+class TestConcurrency:
+
+    SENTENCES = [
+        'Check back tomorrow; I will see if the book has arrived.',
+        'A purple pig and a green donkey flew a kite in the middle of the ' +
+        'night and ended up sunburnt.',
+        'She always speaks to him in a loud voice.',
+        'She works two jobs to make ends meet; at least, that was her ' +
+        'reason for not having time to join us.',
+        'My Mum tries to be cool by saying that she likes all the same ' +
+        'things that I do.',
+        'I am never at home on Sundays.',
+        'If the Easter Bunny and the Tooth Fairy had babies would they take ' +
+        'your teeth and leave chocolate for you?',
+        'I am counting my calories, yet I really want dessert.'
+    ]
+
+    PATHS = [
+        'snt',
+        'word/freq',
+        'pos/cnsl/rev',
+        'ne/unq',
+        'phrs/freq',
+        'snt/sntmnt',
+        # Rejected on purpose, alongside the requests that aren't.
+        'snt/word/cnsl/rev'
+    ]
+
+    def test_concurrent_matches_serial(self):
+        """Tests that serving requests concurrently produces the same
+        responses as serving them one after the other."""
+
+        # Without caches, or the serial pass would answer every concurrent
+        # request and no action would run concurrently.
+        app = nalapi(cache_size=0, stage_cache_size=0)
+
+        calls = [
+            (path, {nalapi.TEXT: ' '.join(self.SENTENCES[index:])})
+            for index in range(len(self.SENTENCES))
+            for path in self.PATHS
+        ] * 4
+
+        serial = [call_app(app, path, payload) for path, payload in calls]
+
+        # Switching threads as often as possible surfaces races that would
+        # otherwise only show under production load.
+        switch_interval = sys.getswitchinterval()
+
+        sys.setswitchinterval(1e-6)
+
+        try:
+
+            with ThreadPoolExecutor(max_workers=16) as executor:
+
+                concurrent = list(executor.map(
+                    lambda call: call_app(app, *call),
+                    calls))
+
+        finally:
+
+            sys.setswitchinterval(switch_interval)
+
+        assert concurrent == serial
@@ -1,5 +1,7 @@
 from action.abstract_action import AbstractAction
 from nalapi.action.consolidation import Consolidation
+from nalapi.action.execution_context import ExecutionContext
+from nalapi.action.token_stream import TokenStream
 
 
 class TestConsolidation:
@@ -37,6 +39,46 @@ class TestConsolidation:
 
         assert isinstance(consolidated_nes[AbstractAction.RESULT], dict)
 
+    def test_apply_with_counts(self):
+        """Tests that values are grouped in the order they first appear, the
+        keys with the most values first, and counted if asked."""
+
+        tagged_words = {
+            AbstractAction.ACTION: 'WordPosTagging',
+            AbstractAction.RESULT: [
+                ('c', 'Y'), ('a', 'X'), ('b', 'Y'), ('a', 'Z'), ('a', 'X'),
+                ('b', 'W'), ('b', 'Y')],
+            AbstractAction.HISTORY: [['word', 'success']]}
+
+        consolidated = Consolidation().apply(tagged_words)
+
+        assert list(consolidated[AbstractAction.RESULT].items()) == [
+            ('a', ['X', 'Z']), ('b', ['Y', 'W']), ('c', ['Y'])]
+
+        consolidated = Consolidation().apply(
+            tagged_words,
+            ExecutionContext({Consolidation.COUNTS: True}))
+
+        assert consolidated[AbstractAction.RESULT] == {
+            'a': {'X': 2, 'Z': 1}, 'b': {'Y': 2, 'W': 1}, 'c': {'Y': 1}}
+
+    def test_columns(self):
+        """Tests that groups are laid out a row per value, with counts if
+        counted."""
+
+        action = Consolidation()
+
+        columns = action.columns({'a': ['X', 'Z'], 'b': ['X']})
+
+        assert columns == {
+            TokenStream.TOKENS: ['a', 'a', 'b'],
+            TokenStream.TAGS: [0, 1, 0],
+            TokenStream.TAG_NAMES: ['X', 'Z']}
+
+        columns = action.columns({'a': {'X': 2, 'Z': 1}, 'b': {'X': 1}})
+
+        assert columns[Consolidation.COUNTS] == [2, 1, 1]
+
     def test_was_produced_by_action(self):
         """Tests the Consolidation produced method."""
 
@@ -3,6 +3,7 @@ from nalapi.action.content_reversal import ContentReversal
 from nalapi.action.word_extraction import WordExtraction
 from nalapi.action.word_pos_tagging import WordPosTagging
 from nalapi.action.consolidation import Consolidation
+from nalapi.action.execution_context import ExecutionContext
 
 
 class TestContentReversal:
@@ -37,6 +38,32 @@ class TestContentReversal:
 
         assert len(reversed_content[AbstractAction.RESULT]) == 25
 
+    def test_apply_with_counts(self):
+        """Tests that values are reversed in the order they first appear,
+        those found under the most keys first, and keep their counts."""
+
+        tagged_words = {
+            AbstractAction.ACTION: 'WordPosTagging',
+            AbstractAction.RESULT: [
+                ('c', 'Y'), ('a', 'X'), ('b', 'Y'), ('a', 'Z'), ('a', 'X'),
+                ('b', 'W'), ('b', 'Y')],
+            AbstractAction.HISTORY: [['word', 'success']]}
+
+        reversed_content = ContentReversal().apply(
+            Consolidation().apply(tagged_words))
+
+        assert list(reversed_content[AbstractAction.RESULT].items()) == [
+            ('Y', ['b', 'c']), ('X', ['a']), ('Z', ['a']), ('W', ['b'])]
+
+        reversed_content = ContentReversal().apply(
+            Consolidation().apply(
+                tagged_words,
+                ExecutionContext({Consolidation.COUNTS: True})))
+
+        assert reversed_content[AbstractAction.RESULT] == {
+            'Y': {'b': 2, 'c': 1}, 'X': {'a': 2}, 'Z': {'a': 1},
+            'W': {'b': 1}}
+
     def test_was_produced_by_action(self):
         """Tests the ContentReversal produced method."""
 
@@ -0,0 +1,182 @@
+"""Tests the executors applying chains of actions."""
+import multiprocessing
+
+from nalapi.action.abstract_action import AbstractAction
+from nalapi.action.execution_context import ExecutionContext
+from nalapi.action.sentence_extraction import SentenceExtraction
+from nalapi.action.word_extraction import WordExtraction
+from nalapi.action.word_pos_tagging import WordPosTagging
+from nalapi.action.named_entity_extraction import NamedEntityExtraction
+from nalapi.action.frequency_calculation import FrequencyCalculation
+from nalapi.action.sentiment_calculation import SentimentCalculation
+from nalapi.executor import InlineExecutor
+from nalapi.executor import PoolExecutor
+
+
+class TestExecutor:
+
+    TEXT = (
+        'Check back tomorrow; I will see if the book has arrived.' +
+        ' A purple pig and a green donkey flew a kite in the middle of the ' +
+        'night and ended up sunburnt. She always speaks to him in a loud ' +
+        'voice. She works two jobs to make ends meet; at least, that was ' +
+        'her reason for not having time to join us. My Mum tries to be cool ' +
+        'by saying that she likes all the same things that I do. I am never ' +
+        'at home on Sundays. If the Easter Bunny and the Tooth Fairy had ' +
+        'babies would they take your teeth and leave chocolate for you? I ' +
+        'am counting my calories, yet I really want dessert. I love eating ' +
+        'toasted cheese and tuna sandwiches. Sometimes, all you need to do ' +
+        ' is completely make an ass of yourself and laugh it off to realise ' +
+        'that life isn’t so bad after all.')
+
+    CHAINS = [
+        ['word', 'freq'],
+        ['word', 'pos'],
+        ['word', 'pos', 'ne', 'freq'],
+        ['sntmnt'],
+        # Fails, the failure must come back from the worker as well.
+        ['sntmnt', 'freq']
+    ]
+
+    def gather_actions(self):
+        """Gathers the actions the chains are made of.
+
+        :return: The actions.
+        :rtype: list
+        """
+
+        return [
+            SentenceExtraction(),
+            WordExtraction(),
+            WordPosTagging(),
+            NamedEntityExtraction(),
+            FrequencyCalculation(),
+            SentimentCalculation()
+        ]
+
+    def test_pool_matches_inline(self):
+        """Tests that applying chains in worker processes produces the same
+        content and status as applying them inline, including across a
+        replacement of the worker processes."""
+
+        all_actions = self.gather_actions()
+
+        inline_executor = InlineExecutor()
+
+        pool_executor = PoolExecutor(
+            all_actions,
+            processes=2,
+            max_tasks_per_child=1,
+            inline_threshold=0)
+
+        try:
+
+            pool_executor.start()
+
+            for chain in self.CHAINS:
+
+                actions = [
+                    action
+                    for name in chain
+                    for action in all_actions
+                    if action.name == name
+                ]
+
+                inline_content, inline_context = inline_executor.run(
+                    self.TEXT, actions)
+
+                pool_content, pool_context = pool_executor.run(
+                    self.TEXT, actions)
+
+                assert pool_content == inline_content
+
+                assert pool_context.status == inline_context.status
+
+                assert pool_context.history == inline_context.history
+
+                assert pool_context.status != ExecutionContext.ERROR
+
+        finally:
+
+            pool_executor.close()
+
+        assert not multiprocessing.active_children()
+
+    def test_start_forks_workers(self):
+        """Tests that starting the executor forks every worker process,
+        rather than leaving it to the first request."""
+
+        pool_executor = PoolExecutor(self.gather_actions(), processes=2)
+
+        try:
+
+            pool_executor.start()
+
+            assert len(multiprocessing.active_children()) == 2
+
+        finally:
+
+            pool_executor.close()
+
+    def test_short_text_stays_inline(self):
+        """Tests that texts under the inline threshold never start the
+        worker processes."""
+
+        all_actions = self.gather_actions()
+
+        pool_executor = PoolExecutor(all_actions, inline_threshold=100)
+
+        content, context = pool_executor.run('Short text.', all_actions[4:5])
+
+        assert context.history == [['freq', AbstractAction.FAILURE]]
+
+        assert not pool_executor.started
+
+        assert not multiprocessing.active_children()
+
+    def test_sharded_matches_inline(self):
+        """Tests that splitting a long text into shards of sentences
+        produces the same content and history as applying the chain to the
+        whole text."""
+
+        all_actions = self.gather_actions()
+
+        inline_executor = InlineExecutor()
+
+        pool_executor = PoolExecutor(
+            all_actions,
+            processes=2,
+            inline_threshold=0,
+            shard_size=100)
+
+        try:
+
+            for chain in [
+                    ['snt'],
+                    ['snt', 'word'],
+                    ['snt', 'word', 'pos'],
+                    ['word', 'freq'],
+                    ['word', 'pos']]:
+
+                actions = [
+                    action
+                    for name in chain
+                    for action in all_actions
+                    if action.name == name
+                ]
+
+                inline_content, inline_context = inline_executor.run(
+                    self.TEXT, actions)
+
+                pool_content, pool_context = pool_executor.run(
+                    self.TEXT, actions)
+
+                assert pool_content == inline_content
+
+                assert pool_context.status == ExecutionContext.OK
+
+                assert pool_context.history == inline_context.history
+
+        finally:
+
+            pool_executor.close()
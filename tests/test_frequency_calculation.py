@@ -1,5 +1,7 @@
 from nalapi.action.abstract_action import AbstractAction
+from nalapi.action.execution_context import ExecutionContext
 from nalapi.action.frequency_calculation import FrequencyCalculation
+from nalapi.action.sentence_extraction import SentenceExtraction
 from nalapi.action.word_extraction import WordExtraction
 
 
@@ -34,6 +36,96 @@ class TestFrequencyCalculation:
 
         assert isinstance(freqs[AbstractAction.RESULT], dict)
 
+    def apply(self, content, **options):
+        """Applies FrequencyCalculation to the given content with the given
+        options.
+
+        :param content: The content to calculate frequencies for.
+        :type content: dict
+        :return: The frequencies, None if the action failed.
+        :rtype: dict
+        """
+
+        context = ExecutionContext(options)
+
+        freqs = FrequencyCalculation().apply(content, context)
+
+        if not context.succeeded():
+
+            return None
+
+        return freqs[AbstractAction.RESULT]
+
+    def test_apply_top_k(self):
+        """Tests that the top k frequencies are the first k of them all."""
+
+        words = WordExtraction().apply(self.TEXT)
+
+        freqs = self.apply(words)
+
+        assert self.apply(words, k=5) == dict(list(freqs.items())[:5])
+
+        assert self.apply(words, k=0) is None
+
+        assert self.apply(words, k='5') is None
+
+    def test_apply_normalized(self):
+        """Tests that words can be lowercased and stopwords left out."""
+
+        words = WordExtraction().apply('The cat and the hat. THE END.')
+
+        assert self.apply(words, lowercase=True, k=1) == {'the': 3}
+
+        assert self.apply(words, stopwords=['the', 'and', '.']) == {
+            'cat': 1, 'hat': 1, 'END': 1}
+
+        assert self.apply(words, stopwords='the') is None
+
+    def test_apply_ngrams(self):
+        """Tests that n-grams are counted over words, never across
+        sentences when the words were given for each sentence."""
+
+        text = 'I like green eggs. I like green ham.'
+
+        freqs = self.apply(WordExtraction().apply(text), ngrams=2, k=2)
+
+        assert freqs == {'I like': 2, 'like green': 2}
+
+        freqs = self.apply(
+            WordExtraction().apply(SentenceExtraction().apply(text)),
+            ngrams=3)
+
+        assert '. I like' not in freqs
+
+        assert freqs['I like green'] == 2
+
+        assert self.apply(
+            {
+                AbstractAction.ACTION: 'PhraseExtraction',
+                AbstractAction.RESULT: ['green eggs'],
+                AbstractAction.HISTORY: []
+            },
+            ngrams=2) is None
+
+    def test_apply_approximate(self):
+        """Tests that approximate frequencies keep the most frequent words
+        within the given number of counters."""
+
+        words = WordExtraction().apply(self.TEXT)
+
+        freqs = self.apply(words, approximate=20)
+
+        assert len(freqs) == 20
+
+        for word, count in self.apply(words).items():
+
+            # Words seen more than total / counters times are always kept.
+            if count > len(words[AbstractAction.RESULT]) / 20:
+
+                assert freqs[word] >= count
+
+        assert self.apply(words, approximate=-1) is None
+
     def test_was_produced_by_action(self):
         """Tests the FrequencyCalculation produced method."""
 
@@ -431,25 +431,16 @@ class Testnalapi:
             assert outcome == AbstractAction.SUCCESS
 
     def test_history_failure(self):
-        """Tests a failed result history."""
+        """Tests that a chain whose actions can't follow each other is
+        rejected before any of them is applied."""
 
-        endpoints = ['snt', 'word', 'cnsl', 'rev']
+        url = self.BASE_URL + 'snt/word/cnsl/rev'
 
-        history = self.__history_test(endpoints, 409)
-
-        for action, outcome in history:
-
-            # /snt & /word
-            if action in endpoints[0:2]:
-
-                # Test should have succeeded.
-                assert outcome == AbstractAction.SUCCESS
-
-            # /cnsl & /rev
-            else:
+        response = requests.get(url,
+                                json={
+                                    nalapi.TEXT: self.TEXT})
 
-                # Action should have failed.
-                assert outcome == AbstractAction.FAILURE
+        assert response.status_code == 400
 
     def __history_test(self, endpoints, expected_status_code):
         """Performs the overlapping tests in 
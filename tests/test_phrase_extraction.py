@@ -1,5 +1,7 @@
 from nalapi.action.abstract_action import AbstractAction
+from nalapi.action.execution_context import ExecutionContext
 from nalapi.action.phrase_extraction import PhraseExtraction
+from nalapi.action.phrase_extraction import compile_grammar
 from nalapi.action.word_extraction import WordExtraction
 from nalapi.action.word_pos_tagging import WordPosTagging
 
@@ -40,6 +42,46 @@ class TestPhraseExtraction:
 
         assert isinstance(phrases[AbstractAction.RESULT][0], str)
 
+    def test_apply_with_grammar(self):
+        """Tests the PhraseExtraction apply method with a grammar chosen by
+        name, and with a grammar supplied by the request."""
+
+        tagged_words = {
+            AbstractAction.ACTION: WordPosTagging.__name__,
+            AbstractAction.RESULT: [
+                ('The', 'DT'), ('purple', 'JJ'), ('pig', 'NN'),
+                ('flew', 'VBD'), ('a', 'DT'), ('green', 'JJ'),
+                ('kite', 'NN'), ('.', '.')
+            ],
+            AbstractAction.HISTORY: []
+        }
+
+        for grammar in ['np', 'NP: {<DT>?<JJ>*<NN>}']:
+
+            context = ExecutionContext({PhraseExtraction.GRAMMAR: grammar})
+
+            phrases = PhraseExtraction().apply(tagged_words, context)
+
+            assert phrases[AbstractAction.RESULT] == [
+                'The purple pig',
+                'a green kite'
+            ]
+
+            assert context.succeeded()
+
+        context = ExecutionContext({PhraseExtraction.GRAMMAR: 'NP: {<DT'})
+
+        PhraseExtraction().apply(tagged_words, context)
+
+        assert not context.succeeded()
+
+    def test_grammar_is_compiled_once(self):
+        """Tests that a grammar is compiled once, however often it is used."""
+
+        grammar = 'VP: {<VB.*><DT>?<NN>}'
+
+        assert compile_grammar(grammar) is compile_grammar(grammar)
+
     def test_was_produced_by_action(self):
         """Tests the PhraseExtraction produced method."""
 
@@ -0,0 +1,106 @@
+"""Tests compiling url paths into pipelines of actions."""
+import pytest
+
+from nalapi.nalapi import nalapi
+from nalapi.action.sentence_extraction import SentenceExtraction
+from nalapi.action.word_extraction import WordExtraction
+from nalapi.action.word_pos_tagging import WordPosTagging
+from nalapi.action.named_entity_extraction import NamedEntityExtraction
+from nalapi.action.consolidation import Consolidation
+from nalapi.action.content_reversal import ContentReversal
+from nalapi.action.sentiment_calculation import SentimentCalculation
+from nalapi.pipeline import InvalidPipeline
+from nalapi.pipeline import PipelineCompiler
+from tests.wsgi_client import call_app
+
+
+class TestPipeline:
+
+    def gather_compiler(self):
+        """Gathers a compiler for a few actions.
+
+        :return: The compiler.
+        :rtype: PipelineCompiler
+        """
+
+        return PipelineCompiler(
+            [
+                SentenceExtraction(),
+                WordExtraction(),
+                WordPosTagging(),
+                NamedEntityExtraction(),
+                Consolidation(),
+                ContentReversal(),
+                SentimentCalculation()
+            ],
+            {'pos': 'word/pos'})
+
+    def test_compile(self):
+        """Tests that valid url paths compile, shortcuts expanded, and are
+        compiled once."""
+
+        compiler = self.gather_compiler()
+
+        pipeline = compiler.compile('pos/ne/cnsl/rev')
+
+        assert [action.name for action in pipeline.actions] == [
+            'word', 'pos', 'ne', 'cnsl', 'rev']
+
+        assert compiler.compile('pos/ne/cnsl/rev') is pipeline
+
+        assert [
+            action.name
+            for action
+            in compiler.compile('snt/sntmnt').actions
+        ] == ['snt', 'sntmnt']
+
+    def test_invalid(self):
+        """Tests that url paths naming no action, or actions which don't
+        accept what precedes them, are rejected."""
+
+        compiler = self.gather_compiler()
+
+        for url in ['word/nope', 'word/ne', 'snt/word/cnsl', 'rev', '']:
+
+            with pytest.raises(InvalidPipeline):
+
+                compiler.compile(url)
+
+    def test_rejected_before_processing(self):
+        """Tests that a request for an invalid chain is answered with a 400,
+        naming the action at fault."""
+
+        status, body = call_app(
+            nalapi(),
+            'word/ne',
+            {nalapi.TEXT: 'I am never at home on Sundays.'})
+
+        assert status.startswith('400')
+
+        assert 'ne takes tagged_words, not words.' in body
+
+    def test_only_enabled_actions(self):
+        """Tests that only the enabled actions are served, and unknown ones
+        can't be enabled."""
+
+        app = nalapi(actions=['snt', 'word'])
+
+        status, body = call_app(
+            app,
+            'snt/word',
+            {nalapi.TEXT: 'I am never at home on Sundays.'})
+
+        assert status.startswith('200')
+
+        status, body = call_app(
+            app,
+            'pos',
+            {nalapi.TEXT: 'I am never at home on Sundays.'})
+
+        assert status.startswith('400')
+
+        assert app.warm_up()
+
+        with pytest.raises(ValueError):
+
+            nalapi(actions=['snt', 'nope'])
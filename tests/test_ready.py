@@ -0,0 +1,22 @@
+"""Tests warming nalapi up before it reports being ready."""
+from nalapi.nalapi import nalapi
+from tests.wsgi_client import call_app
+
+
+class TestReady:
+
+    def test_ready_once_warmed_up(self):
+        """Tests that /ready answers 503 until nalapi is warmed up, 200
+        after."""
+
+        app = nalapi()
+
+        status, body = call_app(app, 'ready', {})
+
+        assert status.startswith(str(nalapi.SERVICE_UNAVAILABLE))
+
+        assert app.warm_up()
+
+        status, body = call_app(app, 'ready', {})
+
+        assert status.startswith('200')
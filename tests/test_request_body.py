@@ -0,0 +1,150 @@
+"""Tests reading request bodies, compressed or not, within a size limit."""
+import gzip
+import io
+import json
+import zlib
+
+import pytest
+
+from nalapi.nalapi import nalapi
+from nalapi.request_body import InvalidBody
+from nalapi.request_body import gather_decompressor
+from nalapi.request_body import read_body
+from nalapi.request_body import read_lines
+from tests.wsgi_client import open_app
+
+
+class TestRequestBody:
+
+    TEXT = 'Check back tomorrow; I will see if the book has arrived. ' * 2000
+
+    def read(self, body, encoding=None, max_size=2**20, length=True):
+        """Reads the given body, as sent.
+
+        :param body: The body sent.
+        :type body: bytes
+        :param encoding: The Content-Encoding of the body.
+        :type encoding: str
+        :param max_size: The number of bytes the body may take at most.
+        :type max_size: int
+        :param length: Whether the length of the body is given.
+        :type length: bool
+        :return: The body read.
+        :rtype: bytes
+        """
+
+        with read_body(
+                io.BytesIO(body),
+                len(body) if length else None,
+                encoding,
+                max_size,
+                memory_size=1024) as read:
+
+            return read.read()
+
+    def test_read(self):
+        """Tests that bodies come back decompressed, whether their length is
+        given or not."""
+
+        data = self.TEXT.encode('utf-8')
+
+        assert self.read(data) == data
+
+        assert self.read(data, length=False) == data
+
+        assert self.read(gzip.compress(data), 'gzip') == data
+
+        assert self.read(zlib.compress(data), 'Deflate') == data
+
+    def test_limits(self):
+        """Tests that bodies too large, sent or decompressed, invalid, or
+        in an unknown encoding are refused."""
+
+        data = self.TEXT.encode('utf-8')
+
+        for body, encoding, max_size, status in [
+            (data, None, len(data) - 1, 413),
+            (gzip.compress(data), 'gzip', len(data) - 1, 413),
+            (gzip.compress(data)[:-20], 'gzip', len(data), 400),
+            (data, 'gzip', len(data), 400),
+            (data, 'br', len(data), 415)
+        ]:
+
+            with pytest.raises(InvalidBody) as e:
+
+                self.read(body, encoding, max_size)
+
+            assert e.value.status == status
+
+    def test_read_lines(self):
+        """Tests that lines come back decompressed, whether they span the
+        chunks read or not, those too large being refused on their own."""
+
+        lines = [b'short', self.TEXT.encode('utf-8') * 2, b'', b'last']
+
+        data = b'\n'.join(lines)
+
+        for body, encoding in [(data, None), (gzip.compress(data), 'gzip')]:
+
+            read = list(read_lines(
+                io.BytesIO(body),
+                len(body),
+                gather_decompressor(encoding)))
+
+            assert read == lines
+
+            read = list(read_lines(
+                io.BytesIO(body),
+                None,
+                gather_decompressor(encoding),
+                max_line_size=1024))
+
+            assert read[0] == lines[0]
+
+            assert read[1].status == 413
+
+            assert read[2:] == lines[2:]
+
+    def test_app(self):
+        """Tests that a large text is taken as json, compressed json or
+        plain text alike."""
+
+        app = nalapi()
+
+        data = self.TEXT.encode('utf-8')
+
+        payload = json.dumps({nalapi.TEXT: self.TEXT}).encode('utf-8')
+
+        responses = [
+            open_app(app, 'snt', body, content_type, environ_updates=updates)
+            for body, content_type, updates in [
+                (payload, nalapi.JSON, None),
+                (
+                    gzip.compress(payload),
+                    nalapi.JSON,
+                    {'HTTP_CONTENT_ENCODING': 'gzip'}
+                ),
+                (data, nalapi.PLAIN_TEXT + '; charset=utf-8', None)
+            ]
+        ]
+
+        for status, headers, chunks in responses:
+
+            assert status.startswith('200')
+
+        bodies = [b''.join(chunks) for status, headers, chunks in responses]
+
+        assert bodies[1] == bodies[0]
+
+        assert bodies[2] == bodies[0]
+
+    def test_app_limit(self):
+        """Tests that a body over the size set is answered with a 413."""
+
+        status, headers, chunks = open_app(
+            nalapi(max_body_size=1024),
+            'snt',
+            self.TEXT.encode('utf-8'),
+            nalapi.PLAIN_TEXT)
+
+        assert status.startswith('413')
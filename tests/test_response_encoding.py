@@ -0,0 +1,119 @@
+"""Tests encoding responses in the format requests accept."""
+import gzip
+import json
+
+import pytest
+
+from nalapi.nalapi import nalapi
+from nalapi.response_encoding import JSON
+from nalapi.response_encoding import MSGPACK
+from nalapi.response_encoding import accepts_gzip
+from nalapi.response_encoding import negotiate
+from tests.wsgi_client import open_app
+
+
+class TestResponseEncoding:
+
+    TEXT = 'Check back tomorrow; I will see if the book has arrived. ' * 50
+
+    def call(self, app, payload, headers=None):
+        """Calls the pos action of the given app.
+
+        :param app: The app to call.
+        :type app: nalapi
+        :param payload: The json payload to send.
+        :type payload: dict
+        :param headers: The wsgi environ entries of any headers to send.
+        :type headers: dict
+        :return: The response status, headers and body.
+        :rtype: str, dict, bytes
+        """
+
+        status, response_headers, chunks = open_app(
+            app,
+            'pos',
+            json.dumps(payload).encode('utf-8'),
+            environ_updates=headers)
+
+        return status, response_headers, b''.join(chunks)
+
+    def test_negotiate(self):
+        """Tests that json is chosen unless another format is preferred and
+        available, and that gzip is only used when accepted."""
+
+        assert negotiate(None) == JSON
+
+        assert negotiate('text/html, */*;q=0.1') == JSON
+
+        assert negotiate('application/msgpack;q=0, application/json') == JSON
+
+        assert accepts_gzip('deflate, gzip;q=0.5')
+
+        assert not accepts_gzip('gzip;q=0, identity')
+
+        assert not accepts_gzip(None)
+
+    def test_compact_and_pretty(self):
+        """Tests that json is compact unless pretty is asked for, the
+        content being the same either way."""
+
+        app = nalapi(compress_size=None)
+
+        status, headers, compact = self.call(app, {nalapi.TEXT: self.TEXT})
+
+        status, headers, pretty = self.call(
+            app,
+            {nalapi.TEXT: self.TEXT, nalapi.PRETTY: True})
+
+        assert headers[nalapi.CONTENT_TYPE] == JSON
+
+        assert b'\n' not in compact
+
+        assert len(pretty) > len(compact)
+
+        assert json.loads(pretty) == json.loads(compact)
+
+    def test_gzip(self):
+        """Tests that responses are compressed only when large enough and
+        accepted."""
+
+        app = nalapi(compress_size=1024)
+
+        status, headers, body = self.call(app, {nalapi.TEXT: self.TEXT})
+
+        assert nalapi.CONTENT_ENCODING not in headers
+
+        status, headers, compressed_body = self.call(
+            app,
+            {nalapi.TEXT: self.TEXT},
+            {'HTTP_ACCEPT_ENCODING': 'gzip, deflate'})
+
+        assert headers[nalapi.CONTENT_ENCODING] == 'gzip'
+
+        assert gzip.decompress(compressed_body) == body
+
+        status, headers, small_body = self.call(
+            app,
+            {nalapi.TEXT: 'Hi.'},
+            {'HTTP_ACCEPT_ENCODING': 'gzip, deflate'})
+
+        assert nalapi.CONTENT_ENCODING not in headers
+
+    def test_msgpack(self):
+        """Tests that MessagePack is returned when accepted, with the same
+        content as json."""
+
+        msgpack = pytest.importorskip('msgpack')
+
+        app = nalapi(compress_size=None)
+
+        status, headers, body = self.call(app, {nalapi.TEXT: self.TEXT})
+
+        status, headers, packed = self.call(
+            app,
+            {nalapi.TEXT: self.TEXT},
+            {'HTTP_ACCEPT': MSGPACK})
+
+        assert headers[nalapi.CONTENT_TYPE] == MSGPACK
+
+        assert msgpack.unpackb(packed) == json.loads(body)
@@ -0,0 +1,147 @@
+"""Tests the cache of results for repeated payloads."""
+import json
+import time
+
+from nalapi.nalapi import nalapi
+from nalapi.action.word_extraction import WordExtraction
+from nalapi.action.unique_filtering import UniqueFiltering
+from nalapi.result_cache import ResultCache
+from tests.wsgi_client import call_app
+
+
+class TestResultCache:
+
+    TEXT = 'She always speaks to him in a loud voice. She works two jobs.'
+
+    def test_hit_returns_a_copy(self):
+        """Tests that a cached result comes back equal, but as a copy the
+        caller may change."""
+
+        actions = [WordExtraction(), UniqueFiltering()]
+
+        result_cache = ResultCache()
+
+        key = ResultCache.key(self.TEXT, actions)
+
+        assert result_cache.get(key) is None
+
+        result_cache.put(key, {'result': ['She', 'always']})
+
+        result = result_cache.get(key)
+
+        assert result == {'result': ['She', 'always']}
+
+        result['result'].append('speaks')
+
+        assert result_cache.get(key) == {'result': ['She', 'always']}
+
+        assert result_cache.stats()['hits'] == 2
+
+        assert result_cache.stats()['misses'] == 1
+
+    def test_key_depends_on_chain_and_options(self):
+        """Tests that the same text gets a key per chain and options."""
+
+        actions = [WordExtraction(), UniqueFiltering()]
+
+        keys = {
+            ResultCache.key(self.TEXT, actions),
+            ResultCache.key(self.TEXT, actions[:1]),
+            ResultCache.key(self.TEXT, actions, {'grammar': 'np'}),
+            ResultCache.key(self.TEXT + ' ', actions)
+        }
+
+        assert len(keys) == 4
+
+        assert ResultCache.key(['not', 'a', 'text'], actions) is None
+
+    def test_bounded_in_bytes(self):
+        """Tests that the least recently used results are evicted to stay
+        within the size limit."""
+
+        result_cache = ResultCache(max_bytes=2000)
+
+        for index in range(10):
+
+            result_cache.put(('key', index), 'x' * 400)
+
+            assert result_cache.stats()['bytes'] <= 2000
+
+        assert result_cache.get(('key', 0)) is None
+
+        assert result_cache.get(('key', 9)) == 'x' * 400
+
+        result_cache.put(('too large',), 'x' * 4000)
+
+        assert result_cache.get(('too large',)) is None
+
+    def test_expires(self):
+        """Tests that results are no longer returned once expired."""
+
+        result_cache = ResultCache(ttl=0.01)
+
+        result_cache.put(('key',), 'result')
+
+        time.sleep(0.02)
+
+        assert result_cache.get(('key',)) is None
+
+        assert result_cache.stats()['entries'] == 0
+
+    def test_cached_response_matches_fresh(self):
+        """Tests that a response served from the cache is byte for byte the
+        one served fresh, and counted as a hit."""
+
+        fresh_app = nalapi(cache_size=0)
+
+        app = nalapi()
+
+        for path in ['word/unq', 'pos/cnsl', 'pos/cnsl/rev', 'sntmnt']:
+
+            for payload in [
+                    {nalapi.TEXT: self.TEXT},
+                    {nalapi.TEXT: [self.TEXT, self.TEXT]}]:
+
+                fresh = call_app(fresh_app, path, payload)
+
+                assert call_app(app, path, payload) == fresh
+
+                assert call_app(app, path, payload) == fresh
+
+        stats = json.loads(call_app(app, 'cache', {})[1])['results']
+
+        # The first item of each batch is cached by the single text call.
+        assert stats['misses'] == 4
+
+        assert stats['hits'] == 20
+
+    def test_chains_resume_from_memoized_stages(self):
+        """Tests that chains sharing a prefix with an earlier chain on the
+        same text resume from its memoized stage, and respond as if they
+        didn't."""
+
+        fresh_app = nalapi(cache_size=0, stage_cache_size=0)
+
+        for app in [nalapi(), nalapi(processes=2, inline_threshold=0)]:
+
+            try:
+
+                for path in ['ne', 'phrs', 'pos/cnsl', 'word/freq']:
+
+                    payload = {nalapi.TEXT: self.TEXT, 'grammar': 'np'}
+
+                    assert (
+                        call_app(app, path, payload) ==
+                        call_app(fresh_app, path, payload))
+
+                stats = json.loads(call_app(app, 'cache', {})[1])['stages']
+
+                # phrs and pos/cnsl resume from the pos tags ne memoized,
+                # word/freq from its words.
+                assert stats['hits'] == 3
+
+                assert stats['entries'] == 2
+
+            finally:
+
+                app.close()
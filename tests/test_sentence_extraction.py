@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+
 from nalapi.action.abstract_action import AbstractAction
 from nalapi.action.sentence_extraction import SentenceExtraction
 
@@ -27,7 +29,7 @@ class TestSentenceExtraction:
 
         assert None not in sentences[AbstractAction.RESULT]
 
-        assert isinstance(sentences[AbstractAction.RESULT], list)
+        assert isinstance(sentences[AbstractAction.RESULT], Sequence)
 
         assert len(sentences[AbstractAction.RESULT]) > 0
 
@@ -29,7 +29,29 @@ class TestSentimentCalculation:
 
         assert None not in sentiment
 
-        assert len(sentiment[AbstractAction.RESULT]) > 0
+        assert isinstance(sentiment[AbstractAction.RESULT], dict)
+
+        sentence_scores = sentiment[AbstractAction.RESULT][
+            SentimentCalculation.SENTENCES]
+
+        assert len(sentence_scores) == 10
+
+        assert all(len(scores) == 4 for scores in sentence_scores)
+
+        document_scores = sentiment[AbstractAction.RESULT][
+            SentimentCalculation.DOCUMENT]
+
+        assert len(document_scores) == 4
+
+        assert (
+            min(scores['compound'] for scores in sentence_scores) <=
+            document_scores['compound'] <=
+            max(scores['compound'] for scores in sentence_scores))
+
+    def test_apply_to_text(self):
+        """Tests the SentimentCalculation apply method on a plain text."""
+
+        sentiment = SentimentCalculation().apply(self.TEXT)
 
         assert len(sentiment[AbstractAction.RESULT]) == 4
 
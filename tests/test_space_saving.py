@@ -0,0 +1,53 @@
+"""Tests action.SpaceSaving"""
+from collections import Counter
+import random
+
+from nalapi.action.space_saving import SpaceSaving
+
+
+class TestSpaceSaving:
+
+    def test_exact_within_capacity(self):
+        """Tests that counts are exact while there are fewer items than
+        counters, in the order Counter gives them."""
+
+        items = list('abracadabra')
+
+        space_saving = SpaceSaving(10)
+
+        space_saving.update(items)
+
+        assert space_saving.most_common() == Counter(items).most_common()
+
+        assert space_saving.most_common(2) == [('a', 5), ('b', 2)]
+
+    def test_heavy_hitters(self):
+        """Tests that items seen more than total / capacity times are kept,
+        their counts overestimated by at most that much."""
+
+        generator = random.Random(0)
+
+        items = [
+            generator.choice(['x', 'y', 'z'])
+            if generator.random() < 0.3
+            else str(generator.randrange(10000))
+            for index
+            in range(20000)
+        ]
+
+        space_saving = SpaceSaving(50)
+
+        space_saving.update(items)
+
+        counts = dict(space_saving.most_common())
+
+        assert len(counts) == 50
+
+        for item, count in Counter(items).items():
+
+            if count > len(items) / 50:
+
+                assert count <= counts[item] <= count + len(items) / 50
+
+        assert sorted(space_saving.most_common(3)) == [
+            ('x', counts['x']), ('y', counts['y']), ('z', counts['z'])]
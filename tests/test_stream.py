@@ -0,0 +1,177 @@
+"""Tests streamed batches, a json document per line in and out."""
+import gzip
+import io
+import json
+
+from nalapi.nalapi import nalapi
+from nalapi.action.execution_context import ExecutionContext
+from tests.wsgi_client import call_app
+from tests.wsgi_client import open_app
+
+
+class LineInput(io.BytesIO):
+    """A wsgi input handing out a line at a time, as a client sending each
+    document as it has it would, remembering how much was read."""
+
+    def read(self, size=-1):
+        """Reads the next line, at most the given number of bytes of it.
+
+        :param size: The number of bytes to read at most.
+        :type size: int
+        :return: The bytes read.
+        :rtype: bytes
+        """
+
+        return self.readline(size)
+
+
+class TestStream:
+
+    TEXTS = [
+        'Check back tomorrow; I will see if the book has arrived.',
+        'A purple pig and a green donkey flew a kite in the middle of the ' +
+        'night and ended up sunburnt.',
+        'I am never at home on Sundays.'
+    ]
+
+    def gather_body(self, documents):
+        """Gathers a body holding the given documents, one per line.
+
+        :param documents: The documents.
+        :type documents: list
+        :return: The body.
+        :rtype: bytes
+        """
+
+        return '\n'.join(
+            document if isinstance(document, str) else json.dumps(document)
+            for document
+            in documents
+        ).encode('utf-8')
+
+    def test_results_match_batch(self):
+        """Tests that each document gets the result line a batch call gives
+        its text, in order, written as it comes."""
+
+        documents = [{nalapi.TEXT: text, 'k': 2} for text in self.TEXTS]
+
+        for app in [nalapi(), nalapi(processes=2, inline_threshold=0)]:
+
+            try:
+
+                batch = json.loads(call_app(
+                    app,
+                    'word/freq',
+                    {nalapi.TEXT: self.TEXTS, 'k': 2})[1])
+
+                status, headers, chunks = open_app(
+                    app,
+                    'stream/word/freq',
+                    self.gather_body(documents),
+                    content_type=nalapi.NDJSON,
+                    method='POST')
+
+                assert status.startswith('200')
+
+                assert headers[nalapi.CONTENT_TYPE] == nalapi.NDJSON
+
+                # Each line is written on its own, as it comes.
+                lines = [json.loads(chunk) for chunk in chunks]
+
+                assert lines == batch
+
+            finally:
+
+                app.close()
+
+    def test_invalid_lines_are_reported(self):
+        """Tests that a line without a text gets an error line of its own,
+        without stopping the others."""
+
+        status, headers, chunks = open_app(
+            nalapi(),
+            'stream/word',
+            self.gather_body([
+                json.dumps(self.TEXTS[0]),
+                '{"no": "text"}',
+                '',
+                'not json',
+                {nalapi.TEXT: self.TEXTS[1]}
+            ]))
+
+        lines = [json.loads(line) for line in b''.join(chunks).splitlines()]
+
+        assert [line[nalapi.STATUS] for line in lines] == [
+            ExecutionContext.OK,
+            nalapi.BAD_REQUEST,
+            nalapi.BAD_REQUEST,
+            ExecutionContext.OK
+        ]
+
+        assert lines[3][nalapi.ORIGINAL] == self.TEXTS[1]
+
+    def test_invalid_chain(self):
+        """Tests that an invalid chain is refused before any line is
+        read."""
+
+        status, headers, chunks = open_app(
+            nalapi(),
+            'stream/word/nope',
+            self.gather_body([self.TEXTS[0]]))
+
+        assert status.startswith('400')
+
+    def test_lines_are_read_as_they_come(self):
+        """Tests that a document is answered before the lines after it are
+        read, compressed or not."""
+
+        body = self.gather_body([{nalapi.TEXT: text} for text in self.TEXTS])
+
+        for sent, encoding in [(body, None), (gzip.compress(body), 'gzip')]:
+
+            stream = LineInput(sent)
+
+            status, headers, chunks = open_app(
+                nalapi(),
+                'stream/word',
+                sent,
+                environ_updates={
+                    'wsgi.input': stream,
+                    'HTTP_CONTENT_ENCODING': encoding or ''
+                })
+
+            chunks = iter(chunks)
+
+            line = json.loads(next(chunks))
+
+            assert line[nalapi.ORIGINAL] == self.TEXTS[0]
+
+            if encoding is None:
+
+                assert stream.tell() < len(sent)
+
+            assert len(list(chunks)) == len(self.TEXTS) - 1
+
+    def test_line_limit(self):
+        """Tests that the max body size limits each line of a stream, not
+        the stream, a longer line getting a 413 line of its own."""
+
+        documents = [{nalapi.TEXT: text} for text in self.TEXTS[:1] * 10]
+
+        documents.insert(5, {nalapi.TEXT: self.TEXTS[1] * 10})
+
+        body = self.gather_body(documents)
+
+        status, headers, chunks = open_app(
+            nalapi(max_body_size=200),
+            'stream/word',
+            body)
+
+        assert status.startswith('200')
+
+        assert len(body) > 200
+
+        lines = [json.loads(line) for line in b''.join(chunks).splitlines()]
+
+        assert [line[nalapi.STATUS] for line in lines] == (
+            [ExecutionContext.OK] * 5 + [413] + [ExecutionContext.OK] * 5)
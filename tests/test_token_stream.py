@@ -0,0 +1,122 @@
+"""Tests action.TokenStream"""
+import pickle
+
+from nalapi.action.token_stream import TokenStream
+
+
+class TestTokenStream:
+
+    TEXT = 'He said "no way" and left. They can\'t stay.'
+
+    TOKENS = [
+        'He', 'said', '``', 'no', 'way', "''", 'and', 'left', '.',
+        'They', 'ca', "n't", 'stay', '.'
+    ]
+
+    def test_align(self):
+        """Tests that tokens are found at their offsets in the text, and
+        come back as they were given."""
+
+        tokens = TokenStream.align(self.TEXT, self.TOKENS)
+
+        assert list(tokens) == self.TOKENS
+
+        assert len(tokens) == len(self.TOKENS)
+
+        assert tokens[2] == '``'
+
+        assert tokens[-1] == '.'
+
+        assert tokens.spans()[:3] == [(0, 2), (3, 7), (8, 9)]
+
+        assert tokens == self.TOKENS
+
+    def test_align_missing_token(self):
+        """Tests that a token not found near the previous one is left where
+        that one ended, without shifting the tokens after it."""
+
+        text = 'a b ' + 'w ' * 100 + 'zz'
+
+        tokens = TokenStream.align(text, ['a', 'zz', 'b'])
+
+        assert list(tokens) == ['a', 'zz', 'b']
+
+        assert tokens.spans() == [(0, 1), (1, 1), (2, 3)]
+
+    def test_slice_and_concatenate(self):
+        """Tests that slices still point into the text, and concatenate back
+        into the whole stream."""
+
+        tokens = TokenStream.align(self.TEXT, self.TOKENS)
+
+        first, second = tokens[:9], tokens[9:]
+
+        assert first.text is self.TEXT
+
+        assert list(second) == self.TOKENS[9:]
+
+        assert TokenStream.concatenate([first, second]) == tokens
+
+        assert TokenStream.concatenate([]) == []
+
+    def test_tag(self):
+        """Tests that tagged tokens come back as (token, tag) tuples, and
+        keep their tags when concatenated."""
+
+        tokens = TokenStream.align(self.TEXT, self.TOKENS)
+
+        tags = ['PRP' if token.istitle() else 'NN' for token in self.TOKENS]
+
+        tagged = tokens.tag(tags)
+
+        assert tagged.tagged
+
+        assert list(tagged) == list(zip(self.TOKENS, tags))
+
+        assert TokenStream.concatenate([tagged[:5], tagged[5:]]) == tagged
+
+    def test_columns(self):
+        """Tests that tokens are laid out in a list per field, tags as
+        indexes into the tag names."""
+
+        tokens = TokenStream.align(self.TEXT, self.TOKENS)
+
+        assert tokens.columns() == {TokenStream.TOKENS: self.TOKENS}
+
+        tags = ['PRP' if token.istitle() else 'NN' for token in self.TOKENS]
+
+        columns = tokens.tag(tags).columns(offsets=True)
+
+        assert columns[TokenStream.TOKENS] == self.TOKENS
+
+        assert [
+            columns[TokenStream.TAG_NAMES][index]
+            for index in columns[TokenStream.TAGS]
+        ] == tags
+
+        assert list(zip(
+            columns[TokenStream.STARTS],
+            columns[TokenStream.ENDS])) == tokens.spans()
+
+    def test_rebase(self):
+        """Tests that tokens found in a part of a text can point into the
+        whole text instead."""
+
+        offset = len('Hello there. ')
+
+        text = 'Hello there. ' + self.TEXT
+
+        tokens = TokenStream.align(self.TEXT, self.TOKENS).rebase(text, offset)
+
+        assert tokens.text is text
+
+        assert list(tokens) == self.TOKENS
+
+        assert tokens.spans()[0] == (offset, offset + 2)
+
+    def test_pickle(self):
+        """Tests that tokens come back the same from another process."""
+
+        tokens = TokenStream.align(self.TEXT, self.TOKENS).tag(self.TOKENS)
+
+        assert pickle.loads(pickle.dumps(tokens)) == tokens
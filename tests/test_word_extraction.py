@@ -1,4 +1,7 @@
+from collections.abc import Sequence
+
 from nalapi.action.abstract_action import AbstractAction
+from nalapi.action.sentence_extraction import SentenceExtraction
 from nalapi.action.word_extraction import WordExtraction
 
 
@@ -31,13 +34,32 @@ class TestWordExtraction:
 
         assert 167 == len(words[AbstractAction.RESULT])
 
-        assert isinstance(words[AbstractAction.RESULT], list)
+        assert isinstance(words[AbstractAction.RESULT], Sequence)
 
         assert isinstance(words[AbstractAction.RESULT][0], str)
 
         assert len(
             [word for word in words[AbstractAction.RESULT] if ' ' in word]) == 0
 
+    def test_apply_to_sentences(self):
+        """Tests that the words of extracted sentences are kept together for
+        each sentence, and are the words of the whole text."""
+
+        sentences = SentenceExtraction().apply(self.TEXT)
+
+        words = WordExtraction().apply(sentences)
+
+        assert len(words[AbstractAction.RESULT]) == len(
+            sentences[AbstractAction.RESULT])
+
+        assert all(
+            isinstance(sentence, Sequence)
+            for sentence
+            in words[AbstractAction.RESULT])
+
+        assert WordExtraction.flatten(words[AbstractAction.RESULT]) == (
+            WordExtraction().apply(self.TEXT)[AbstractAction.RESULT])
+
     def test_was_produced_by_action(self):
         """Tests the WordExtraction produced method."""
 
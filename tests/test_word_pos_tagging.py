@@ -1,5 +1,9 @@
 """Tests action.WordPosTagging"""
+from collections.abc import Sequence
+
 from nalapi.action.abstract_action import AbstractAction
+from nalapi.action.sentence_extraction import SentenceExtraction
+from nalapi.action.token_stream import TokenStream
 from nalapi.action.word_pos_tagging import WordPosTagging
 from nalapi.action.word_extraction import WordExtraction
 
@@ -33,12 +37,62 @@ class TestWordPosTagging:
 
         assert len(tagged_words[AbstractAction.RESULT]) == 167
 
-        assert isinstance(tagged_words[AbstractAction.RESULT], list)
+        assert isinstance(tagged_words[AbstractAction.RESULT], Sequence)
 
         assert isinstance(tagged_words[AbstractAction.RESULT][0], tuple)
 
         assert isinstance(tagged_words[AbstractAction.RESULT][0][0], str)
 
+    def test_apply_to_sentences(self):
+        """Tests that words given for each sentence are tagged for each
+        sentence, as the words of the whole text are."""
+
+        words = WordExtraction().apply(SentenceExtraction().apply(self.TEXT))
+
+        tagged_words = WordPosTagging().apply(words)
+
+        assert [
+            len(sentence)
+            for sentence
+            in tagged_words[AbstractAction.RESULT]
+        ] == [len(sentence) for sentence in words[AbstractAction.RESULT]]
+
+        assert WordPosTagging.flatten(tagged_words[AbstractAction.RESULT]) == (
+            WordPosTagging().apply(
+                WordExtraction().apply(self.TEXT))[AbstractAction.RESULT])
+
+    def test_columns(self):
+        """Tests that tagged words are laid out in columns, with the index
+        of each word's sentence when tagged for each sentence."""
+
+        action = WordPosTagging()
+
+        tagged_words = action.apply(
+            WordExtraction().apply(self.TEXT))[AbstractAction.RESULT]
+
+        columns = action.columns(tagged_words, offsets=True)
+
+        assert list(zip(
+            columns[TokenStream.TOKENS],
+            [columns[TokenStream.TAG_NAMES][tag]
+                for tag in columns[TokenStream.TAGS]]
+        )) == list(tagged_words)
+
+        assert len(columns[TokenStream.STARTS]) == len(tagged_words)
+
+        tagged_sentences = action.apply(WordExtraction().apply(
+            SentenceExtraction().apply(self.TEXT)))[AbstractAction.RESULT]
+
+        columns = action.columns(tagged_sentences)
+
+        assert TokenStream.STARTS not in columns
+
+        assert columns[WordPosTagging.SENTENCES] == [
+            index
+            for index, sentence in enumerate(tagged_sentences)
+            for tagged_word in sentence
+        ]
+
     def test_was_produced_by_action(self):
         """Tests the WordPosTagging produced action."""
 
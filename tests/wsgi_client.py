@@ -0,0 +1,82 @@
+"""Calls nalapi in-process, the way a wsgi server would."""
+import io
+import json
+from wsgiref.util import setup_testing_defaults
+
+
+def call_app(app, path, payload):
+    """Calls the given app in-process, the way a wsgi server would.
+
+    :param app: The app to call.
+    :type app: nalapi
+    :param path: The url path to call, e.g. 'word/pos'.
+    :type path: str
+    :param payload: The json payload to send.
+    :type payload: dict
+    :return: The response status and body.
+    :rtype: str, str
+    """
+
+    status, headers, chunks = open_app(
+        app,
+        path,
+        json.dumps(payload).encode('utf-8'))
+
+    return status, b''.join(chunks).decode('utf-8')
+
+
+def open_app(
+        app,
+        path,
+        body,
+        content_type='application/json',
+        method='GET',
+        environ_updates=None):
+    """Calls the given app in-process, the way a wsgi server would, leaving
+    the response body to be read as the app produces it.
+
+    :param app: The app to call.
+    :type app: nalapi
+    :param path: The url path to call, e.g. 'word/pos'.
+    :type path: str
+    :param body: The body to send.
+    :type body: bytes
+    :param content_type: The content type of the body.
+    :type content_type: str
+    :param method: The http method to call with.
+    :type method: str
+    :param environ_updates: Any other wsgi environ entries to set, e.g.
+                headers.
+    :type environ_updates: dict
+    :return: The response status, headers, and the iterable of the chunks
+                of its body.
+    :rtype: str, dict, iterable
+    """
+
+    environ = {}
+
+    setup_testing_defaults(environ)
+
+    environ.update({
+        'REQUEST_METHOD': method,
+        'PATH_INFO': '/' + path,
+        'CONTENT_TYPE': content_type,
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body)
+    })
+
+    environ.update(environ_updates or {})
+
+    statuses = []
+
+    response_headers = {}
+
+    def start_response(status, headers, exc_info=None):
+
+        statuses.append(status)
+
+        response_headers.update(headers)
+
+    chunks = app(environ, start_response)
+
+    return statuses[0], response_headers, chunks